@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark of the log diff engines on generated console logs
+
+Compares, for the same two console logs:
+    - `difflib.ndiff()` with `SequenceMatcher.quick_ratio()` (the former `build diff --logs` engine)
+    - `line_diff.diff_hunks()` (hashed lines, patience and linear space Myers diff, in windows)
+
+The second log is a copy of the first with a number of lines changed, removed, and added,
+and some blocks of 100 changed lines, like two runs of the same build. `difflib.ndiff()` is only run up to `--ndiff-max-lines`
+lines, as it does not finish in reasonable time on large logs.
+
+Usage:
+    python dev_things/benchmarks/log_diff.py --lines 200000 --changes 500
+"""
+
+import argparse
+import difflib
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import yojenkins.yo_jenkins  # noqa: E402,F401  (Loads the packages in the order they import each other)
+from yojenkins.utility import line_diff  # noqa: E402
+
+
+def generate_logs(lines: int, changes: int, seed: int = 1):
+    """Two console logs of about `lines` lines, differing in about `changes` places"""
+    rnd = random.Random(seed)
+    steps = ['Compiling', 'Downloading', 'Running test', 'Copying', 'Linking']
+    log_1 = [
+        f'[INFO] {rnd.choice(steps)} module_{rnd.randint(0, lines // 10)} ({rnd.randint(1, 999)} ms)'
+        for _ in range(lines)
+    ]
+    log_2 = list(log_1)
+    for _ in range(changes):
+        index = rnd.randrange(len(log_2))
+        change = rnd.random()
+        if change < 0.1:
+            # Block of lines with changed timings, ie. a test suite run
+            for block_index in range(index, min(index + 100, len(log_2))):
+                log_2[block_index] = log_2[block_index].replace('ms)', 'ms, retried)')
+        elif change < 0.4:
+            log_2[index] = log_2[index].replace('ms', 'seconds')
+        elif change < 0.7:
+            del log_2[index]
+        else:
+            log_2.insert(index, f'[WARNING] Retrying connection {rnd.randint(0, 9)}')
+    return log_1, log_2
+
+
+def run_ndiff(log_1, log_2):
+    changed = sum(1 for line in difflib.ndiff(log_1, log_2) if line[0] in '-+')
+    difflib.SequenceMatcher(None, log_1, log_2).quick_ratio()
+    return changed
+
+
+def run_line_diff(log_1, log_2):
+    return sum(
+        len(lines_1) + len(lines_2) for tag, lines_1, lines_2 in line_diff.diff_hunks(log_1, log_2) if tag != 'equal')
+
+
+def measure(name, function, log_1, log_2):
+    start = perf_counter()
+    changed = function(log_1, log_2)
+    elapsed = perf_counter() - start
+
+    # Separate run for memory, tracing slows down the run
+    tracemalloc.start()
+    function(log_1, log_2)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f'{name:<12} {elapsed:>9.2f}s  {peak / 1024 / 1024:>9.1f} MB peak  {changed:>8} changed lines')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=200000, help='Number of lines of each log')
+    parser.add_argument('--changes', type=int, default=500, help='Number of changes between the logs')
+    parser.add_argument('--ndiff-max-lines', type=int, default=20000, help='Largest log size to run ndiff on')
+    args = parser.parse_args()
+
+    for lines in sorted({min(args.lines, 5000), min(args.lines, args.ndiff_max_lines), args.lines}):
+        changes = max(args.changes * lines // args.lines, 1)
+        log_1, log_2 = generate_logs(lines, changes)
+        print(f'\n{lines} lines, {changes} changes')
+        if lines <= args.ndiff_max_lines:
+            measure('ndiff', run_ndiff, log_1, log_2)
+        else:
+            print(f'{"ndiff":<12} skipped (over --ndiff-max-lines)')
+        measure('line_diff', run_line_diff, log_1, log_2)
+
+
+if __name__ == '__main__':
+    main()
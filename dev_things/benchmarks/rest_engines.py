@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark of the REST request engines against a local stub server
+
+Compares, for the same set of bulk GET requests:
+    - `Rest.request()` one after the other (sequential)
+    - `Rest.request_many()` with the default `FuturesSession` thread pool engine
+    - `Rest.request_many()` with the asyncio engine (`Rest.async_enable()`, needs `aiohttp`)
+
+The stub server answers every request with a small Jenkins-like JSON object after a fixed
+delay, simulating server latency.
+
+Usage:
+    python dev_things/benchmarks/rest_engines.py --requests 500 --latency 0.05 --concurrency 64
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from time import perf_counter, sleep
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from yojenkins.yo_jenkins.rest import Rest  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Jenkins-like JSON responses after a fixed delay"""
+    latency = 0.05
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        sleep(self.latency)
+        body = json.dumps({'_class': 'hudson.model.FreeStyleBuild', 'url': self.path, 'result': 'SUCCESS'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_engine(name: str, rest: Rest, targets: list, concurrency: int) -> None:
+    start_time = perf_counter()
+    if concurrency:
+        results = list(rest.request_many(targets, max_concurrent=concurrency))
+        successes = sum(1 for result in results if result[3])
+    else:
+        successes = sum(1 for target in targets if rest.request(target, 'get')[2])
+    elapsed = perf_counter() - start_time
+    print(f'{name:<28} {len(targets):>6} requests  {successes:>6} ok  '
+          f'{elapsed:>8.3f} s  {len(targets) / elapsed:>9.1f} req/s')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the yojenkins REST request engines')
+    parser.add_argument('--requests', type=int, default=500, help='Number of requests')
+    parser.add_argument('--latency', type=float, default=0.05, help='Stub server delay per request (seconds)')
+    parser.add_argument('--concurrency', type=int, default=64, help='Maximum requests in flight for bulk engines')
+    parser.add_argument('--sequential', action='store_true', help='Also run the sequential baseline')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    StubHandler.latency = args.latency
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    targets = [f'job/benchmark/{number}/api/json' for number in range(args.requests)]
+    print(f'Stub server: {server_url} (Latency: {args.latency} s, Concurrency: {args.concurrency})')
+
+    if args.sequential:
+        run_engine('sequential request()', Rest('user', 'token', server_url), targets, 0)
+
+    run_engine('request_many() futures', Rest('user', 'token', server_url), targets, args.concurrency)
+
+    rest_async = Rest('user', 'token', server_url)
+    rest_async.async_enable(max_connections=args.concurrency)
+    if rest_async.async_rest:
+        run_engine('request_many() asyncio', rest_async, targets, args.concurrency)
+    else:
+        print('request_many() asyncio      skipped, "aiohttp" not installed (pip install yojenkins[async])')
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
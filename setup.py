@@ -78,7 +78,8 @@ setuptools.setup(
     packages=setuptools.find_packages(),
     install_requires=get_requirements(),
     extras_require={
-        'sound': ['simpleaudio; sys_platform != "win32"']
+        'sound': ['simpleaudio; sys_platform != "win32"'],
+        'async': ['aiohttp']
     },
     include_package_data=True,
     long_description=read('README.md'),
@@ -2,12 +2,13 @@
 
 import logging
 import sys
+from typing import Tuple
 
 import click
 
 from yojenkins.cli import cli_utility as cu
 from yojenkins.cli.cli_utility import log_to_history
-from yojenkins.utility.utility import is_complete_build_url, wait_for_build_and_follow_logs
+from yojenkins.utility.utility import is_complete_build_url, print2, wait_for_build_and_follow_logs
 from yojenkins.yo_jenkins.status import Status
 
 # Getting the logger reference
@@ -34,18 +35,66 @@ def _verify_build_url_get_job_format(build_url: str, job: str) -> bool:
     return valid_url_format
 
 
+def _info_many(yj_obj: object, job: str, build_range: str, urls_file: str, workers: int) -> None:
+    """Fetching build information of many builds, output as JSON lines as received
+
+    Args:
+        yj_obj:      YoJenkins object
+        job:         The job the builds are under (With build range)
+        build_range: Range of build numbers within the job
+        urls_file:   File with one build URL per line
+        workers:     Maximum number of builds requested at once
+    """
+    if urls_file:
+        with click.open_file(urls_file, 'r') as open_file:
+            build_urls = [line.strip() for line in open_file if line.strip() and not line.startswith('#')]
+    else:
+        first_number, last_number = cu.parse_build_range(build_range)
+        if cu.is_full_url(job):
+            build_urls = yj_obj.build.range_urls(job_url=job, first_number=first_number, last_number=last_number)
+        else:
+            build_urls = yj_obj.build.range_urls(job_name=job, first_number=first_number, last_number=last_number)
+
+    failed_urls = []
+
+    def successful_builds():
+        for build_url, build_info in yj_obj.build.info_many(build_urls, max_concurrent=workers):
+            if not build_info:
+                failed_urls.append(build_url)
+                continue
+            yield build_info
+
+    builds_count = cu.standard_out_stream(successful_builds())
+    logger.debug(f'Received build info for {builds_count} of {len(build_urls)} builds')
+    if failed_urls:
+        for build_url in failed_urls:
+            click.secho(f'Failed to get build info: {build_url}', fg='bright_red', bold=True, err=True)
+        sys.exit(1)
+
+
 @log_to_history
-def info(profile: str, token: str, job: str, number: int, url: str, latest: bool, **kwargs) -> None:
+def info(profile: str, token: str, job: str, number: int, url: str, latest: bool, build_range: str, urls_file: str,
+         workers: int, **kwargs) -> None:
     """Fetching build information
 
     Args:
-        profile: The profile/account to use
-        token:   API Token for Jenkins server
-        job:     The job this build is under
-        number:  The build number to get info on
-        url:     The build url to get info on
-        latest:  Option to get the latest build
+        profile:     The profile/account to use
+        token:       API Token for Jenkins server
+        job:         The job this build is under
+        number:      The build number to get info on
+        url:         The build url to get info on
+        latest:      Option to get the latest build
+        build_range: Range of build numbers to get info on, output as JSON lines
+        urls_file:   File of build urls to get info on, output as JSON lines
+        workers:     Maximum number of builds requested at once for a build range or urls file
     """
+    if build_range or urls_file:
+        if build_range and not job:
+            click.secho('INPUT ERROR: A build range needs a job. See --help', fg='bright_red', bold=True)
+            sys.exit(1)
+        _info_many(cu.config_yo_jenkins(profile, token), job, build_range, urls_file, workers)
+        return
+
     if url is None and job and is_complete_build_url(job):
         url, job = job, None
     elif job and not number and not latest:
@@ -206,8 +255,9 @@ def stages(profile: str, token: str, opt_list: bool, job: str, number: int, url:
 
 
 @log_to_history
-def logs(profile: str, token: str, job: str, number: int, url: str, latest: bool, tail: float, download_dir: str,
-         follow: bool) -> None:
+def logs(profile: str, token: str, job: str, number: int, url: Tuple[str], latest: bool, tail: float,
+         download_dir: str, follow: bool, running: bool, by_stage: bool, archive: bool, workers: int,
+         from_console: bool) -> None:
     """Get build logs
 
     Args:
@@ -215,15 +265,44 @@ def logs(profile: str, token: str, job: str, number: int, url: str, latest: bool
         token:   API Token for Jenkins server
         job: The job this build is under
         number: The build number to get info on
-        url: The build url to get info on
+        url: The build url(s) to get info on
         latest: Option to get the latest build
         tail: Option to get the last N lines of the log
         download_dir: Option to download the log to a directory
         follow: Option to follow the log
+        running: Option to follow the logs of all running builds of the job
+        by_stage: Option to download one log file per stage
+        archive: Option to download the stage log files into one archive file
+        workers: Maximum number of stage and step logs requested at once
+        from_console: Option to split the stage logs out of one download of the console log
     """
-    if url is None and job and is_complete_build_url(job):
-        url, job = job, None
-    elif job and not number and not latest:
+    build_urls = list(url)
+    if not build_urls and job and is_complete_build_url(job):
+        build_urls, job = [job], None
+
+    if running or len(build_urls) > 1:
+        if not follow:
+            click.secho('INPUT ERROR: Multiple builds and --running can only be used with --follow. See --help',
+                        fg='bright_red',
+                        bold=True)
+            sys.exit(1)
+        if running and not job:
+            click.secho('INPUT ERROR: For --running, specify the job. See --help', fg='bright_red', bold=True)
+            sys.exit(1)
+        yj_obj = cu.config_yo_jenkins(profile, token)
+        if running:
+            if cu.is_full_url(job):
+                build_urls += yj_obj.job.build_running_list(job_url=job)
+            else:
+                build_urls += yj_obj.job.build_running_list(job_name=job)
+        if not build_urls:
+            print2('No running builds found', color='yellow')
+            sys.exit(1)
+        yj_obj.build.logs_follow_many(build_urls)
+        return
+
+    url = build_urls[0] if build_urls else None
+    if not url and job and not number and not latest:
         click.echo(
             click.style('INPUT ERROR: For job, either specify --number or --latest. See --help',
                         fg='bright_red',
@@ -232,6 +311,28 @@ def logs(profile: str, token: str, job: str, number: int, url: str, latest: bool
 
     yj_obj = cu.config_yo_jenkins(profile, token)
 
+    if by_stage:
+        if not download_dir:
+            click.secho('INPUT ERROR: For --by-stage, specify --download-dir. See --help', fg='bright_red', bold=True)
+            sys.exit(1)
+        export_args = {
+            'download_dir': download_dir,
+            'build_url': url,
+            'build_number': number,
+            'latest': latest,
+            'archive': archive,
+            'max_workers': workers,
+            'from_console': from_console
+        }
+        if _verify_build_url_get_job_format(build_url=url, job=job):
+            saved_paths = yj_obj.stage.logs_export(job_url=job, **export_args)
+        else:
+            saved_paths = yj_obj.stage.logs_export(job_name=job, **export_args)
+        for saved_path in saved_paths:
+            click.echo(saved_path)
+        click.secho('success', fg='bright_green', bold=True)
+        return
+
     if _verify_build_url_get_job_format(build_url=url, job=job):
         yj_obj.build.logs(build_url=url,
                           job_url=job,
@@ -282,7 +383,8 @@ def browser(profile: str, token: str, job: str, number: int, url: str, latest: b
 
 
 @log_to_history
-def monitor(profile: str, token: str, job: str, number: int, url: str, latest: bool, sound: bool) -> None:
+def monitor(profile: str, token: str, job: str, number: int, url: str, latest: bool, sound: bool, headless: bool,
+            filepath: str) -> None:
     """Start monitor UI
 
     Args:
@@ -293,6 +395,8 @@ def monitor(profile: str, token: str, job: str, number: int, url: str, latest: b
         url: The build url to get info on
         latest: Option to get the latest build
         sound: Option to play a sound when the build status changes
+        headless: Option to write status change events as JSON lines instead of the UI
+        filepath: File to append the headless events to, standard out if not specified
     """
     if url is None and job and is_complete_build_url(job):
         url, job = job, None
@@ -305,10 +409,17 @@ def monitor(profile: str, token: str, job: str, number: int, url: str, latest: b
 
     yj_obj = cu.config_yo_jenkins(profile, token)
 
+    monitor_args = {
+        'build_number': number,
+        'latest': latest,
+        'sound': sound,
+        'headless': headless,
+        'output_file': filepath
+    }
     if _verify_build_url_get_job_format(build_url=url, job=job):
-        yj_obj.build.monitor(build_url=url, job_url=job, build_number=number, latest=latest, sound=sound)
+        yj_obj.build.monitor(build_url=url, job_url=job, **monitor_args)
     else:
-        yj_obj.build.monitor(build_url=url, job_name=job, build_number=number, latest=latest, sound=sound)
+        yj_obj.build.monitor(build_url=url, job_name=job, **monitor_args)
 
 
 @log_to_history
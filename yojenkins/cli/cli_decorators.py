@@ -110,3 +110,28 @@ def list(decorated_function: Callable) -> Callable:
         return decorated_function(*args, **kwargs)
 
     return wrapper
+
+
+def item_index(decorated_function: Callable) -> Callable:
+    """click module options for using the local item index
+
+    Details: This function is a convenience function to use to add click options
+
+    Args:
+        decorated_function : Function that is decorated
+
+    Returns:
+        Decorated function
+    """
+
+    @click.option('--index-ttl',
+                  type=click.IntRange(0),
+                  default=None,
+                  required=False,
+                  metavar='SECONDS',
+                  help='Use local item index, re-fetching folders indexed longer ago than this')
+    @functools.wraps(decorated_function)
+    def wrapper(*args, **kwargs):
+        return decorated_function(*args, **kwargs)
+
+    return wrapper
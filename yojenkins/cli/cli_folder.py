@@ -3,6 +3,7 @@
 import json
 import logging
 import sys
+from typing import Tuple
 
 import click
 import xmltodict
@@ -32,13 +33,31 @@ def info(profile: str, token: str, folder: str, **kwargs) -> None:
 
 @log_to_history
 def search(profile: str, token: str, search_pattern: str, search_folder: str, depth: int, fullname: bool,
-           opt_list: bool, **kwargs) -> None:
+           opt_list: bool, stream: bool, index_ttl: int, **kwargs) -> None:
     """Search folders by REGEX pattern
 
     Args:
         TODO
     """
     yj_obj = cu.config_yo_jenkins(profile, token)
+    if index_ttl is not None:
+        yj_obj.item_index_enable(ttl=index_ttl)
+    if stream:
+        if cu.is_full_url(search_folder):
+            data_items = yj_obj.folder.search_iter(search_pattern=search_pattern,
+                                                   folder_url=search_folder,
+                                                   folder_depth=depth,
+                                                   fullname=fullname)
+        else:
+            data_items = yj_obj.folder.search_iter(search_pattern=search_pattern,
+                                                   folder_name=search_folder,
+                                                   folder_depth=depth,
+                                                   fullname=fullname)
+        if not cu.standard_out_stream(data_items, item_key='url' if opt_list else ''):
+            print2("No folders found", color="yellow")
+            sys.exit(1)
+        return
+
     if cu.is_full_url(search_folder):
         data, data_list = yj_obj.folder.search(search_pattern=search_pattern,
                                                folder_url=search_folder,
@@ -105,13 +124,15 @@ def views(profile: str, token: str, folder: str, opt_list: int, **kwargs) -> Non
 
 
 @log_to_history
-def items(profile: str, token: str, folder: str, opt_list: int, **kwargs) -> None:
+def items(profile: str, token: str, folder: str, opt_list: int, index_ttl: int, **kwargs) -> None:
     """List all items in folder
 
     Args:
         TODO
     """
     yj_obj = cu.config_yo_jenkins(profile, token)
+    if index_ttl is not None:
+        yj_obj.item_index_enable(ttl=index_ttl)
     if cu.is_full_url(folder):
         data, data_list = yj_obj.folder.item_list(folder_url=folder)
     else:
@@ -163,6 +184,59 @@ def config(profile: str, token: str, opt_pretty: bool, opt_yaml: bool, opt_xml:
     cu.standard_out(data, opt_pretty, opt_yaml, opt_xml, opt_toml)
 
 
+@log_to_history
+def config_drift(profile: str, token: str, folder: str, depth: int, min_group: int, threshold: float,
+                 ignore_element: Tuple[str], workers: int, index_ttl: int, **kwargs) -> None:
+    """Group the jobs in a folder by normalized configuration, diffing the jobs that drifted
+
+    Args:
+        profile:        The profile/account to use
+        token:          API Token for Jenkins server
+        folder:         The folder name or URL
+        depth:          Number of sub-folder levels to look through
+        min_group:      Least number of jobs sharing a config for it to be a template
+        threshold:      Similarity to a template from which on a config is drifted from it
+        ignore_element: Tags of config elements left out of the comparison
+        workers:        Maximum number of job configs requested at once
+        index_ttl:      Time to live of the local item index in seconds, None to not use it
+    """
+    yj_obj = cu.config_yo_jenkins(profile, token)
+    if index_ttl is not None:
+        yj_obj.item_index_enable(ttl=index_ttl)
+    drift_args = {
+        'folder_depth': depth,
+        'min_group_size': min_group,
+        'threshold': threshold,
+        'ignore_elements': ignore_element,
+        'max_workers': workers
+    }
+    if cu.is_full_url(folder):
+        data = yj_obj.job.config_drift(folder_url=folder, **drift_args)
+    else:
+        data = yj_obj.job.config_drift(folder_name=folder, **drift_args)
+    if not data:
+        print2("No job configurations found", color="yellow")
+        sys.exit(1)
+    cu.standard_out(data, **kwargs)
+
+
+@log_to_history
+def monitor(profile: str, token: str, folder: str, sound: bool) -> None:
+    """Start the monitor UI of all jobs within a folder
+
+    Args:
+        profile: The profile/account to use
+        token:   API Token for Jenkins server
+        folder:  The folder name or URL
+        sound:   Enable sound effects
+    """
+    yj_obj = cu.config_yo_jenkins(profile, token)
+    if cu.is_full_url(folder):
+        yj_obj.folder.monitor(folder_url=folder, sound=sound)
+    else:
+        yj_obj.folder.monitor(folder_name=folder, sound=sound)
+
+
 @log_to_history
 def create(profile: str, token: str, name: str, folder: str, type: str, config_file: str,
            config_is_json: bool) -> None:
@@ -3,6 +3,7 @@
 import json
 import logging
 import sys
+from typing import Tuple
 
 import click
 import xmltodict
@@ -32,13 +33,31 @@ def info(profile: str, token: str, job: str, **kwargs) -> None:
 
 @log_to_history
 def search(profile: str, token: str, search_pattern: str, search_folder: str, depth: int, fullname: bool,
-           opt_list: bool, **kwargs) -> None:
+           opt_list: bool, stream: bool, index_ttl: int, **kwargs) -> None:
     """TODO Docstring
 
     Args:
         TODO
     """
     yj_obj = cu.config_yo_jenkins(profile, token)
+    if index_ttl is not None:
+        yj_obj.item_index_enable(ttl=index_ttl)
+    if stream:
+        if cu.is_full_url(search_folder):
+            data_items = yj_obj.job.search_iter(search_pattern=search_pattern,
+                                                folder_url=search_folder,
+                                                folder_depth=depth,
+                                                fullname=fullname)
+        else:
+            data_items = yj_obj.job.search_iter(search_pattern=search_pattern,
+                                                folder_name=search_folder,
+                                                folder_depth=depth,
+                                                fullname=fullname)
+        if not cu.standard_out_stream(data_items, item_key='url' if opt_list else ''):
+            print2("No jobs found", color="yellow")
+            sys.exit(1)
+        return
+
     if cu.is_full_url(search_folder):
         data, data_list = yj_obj.job.search(search_pattern=search_pattern,
                                             folder_url=search_folder,
@@ -72,6 +91,180 @@ def build_list(profile: str, token: str, opt_list: bool, job: str, **kwargs) ->
     cu.standard_out(data, **kwargs)
 
 
+@log_to_history
+def build_history(profile: str, token: str, opt_list: bool, job: str, number: int, stream: bool, **kwargs) -> None:
+    """Get the build history of a job
+
+    Args:
+        profile:  The profile/account to use
+        token:    API Token for Jenkins server
+        opt_list: Option to only output the build URLs
+        job:      The job name or URL
+        number:   Number of most recent builds (0 for all builds)
+        stream:   Option to output each build as one line of JSON as soon as received
+    """
+    yj_obj = cu.config_yo_jenkins(profile, token)
+    if cu.is_full_url(job):
+        data_items = yj_obj.job.build_history(job_url=job, max_builds=number)
+    else:
+        data_items = yj_obj.job.build_history(job_name=job, max_builds=number)
+
+    if stream:
+        if not cu.standard_out_stream(data_items, item_key='url' if opt_list else ''):
+            print2("No builds found", color="yellow")
+            sys.exit(1)
+        return
+
+    data = [build_info['url'] for build_info in data_items] if opt_list else list(data_items)
+    if not data:
+        print2("No builds found", color="yellow")
+        sys.exit(1)
+    cu.standard_out(data, **kwargs)
+
+
+@log_to_history
+def build_stats(profile: str, token: str, job: str, number: int, window: int, threshold: float, search: bool,
+                search_folder: str, depth: int, fullname: bool, stream: bool, index_ttl: int, **kwargs) -> None:
+    """Get the build duration and result statistics of a job, or of every job matching a search
+
+    Args:
+        profile:       The profile/account to use
+        token:         API Token for Jenkins server
+        job:           The job name or URL, or the search pattern with search
+        number:        Number of most recent builds used (0 for all builds)
+        window:        Number of builds for moving average and regression detection
+        threshold:     Fraction of slowdown counted as a regression
+        search:        Option to use the job as a REGEX search pattern
+        search_folder: Folder within which to search
+        depth:         Search depth from the search folder
+        fullname:      Option to search the entire job path name
+        stream:        Option to output the stats of each job as one line of JSON as soon as done
+        index_ttl:     Use the local item index for the search, with this TTL in seconds
+    """
+    yj_obj = cu.config_yo_jenkins(profile, token)
+
+    if not search:
+        if cu.is_full_url(job):
+            job_stats = yj_obj.job.build_stats(job_url=job, max_builds=number)
+        else:
+            job_stats = yj_obj.job.build_stats(job_name=job, max_builds=number)
+        cu.standard_out(job_stats.summary(window=window, threshold=threshold), **kwargs)
+        return
+
+    if index_ttl is not None:
+        yj_obj.item_index_enable(ttl=index_ttl)
+    if cu.is_full_url(search_folder):
+        matches = yj_obj.job.search_iter(search_pattern=job,
+                                         folder_url=search_folder,
+                                         folder_depth=depth,
+                                         fullname=fullname)
+    else:
+        matches = yj_obj.job.search_iter(search_pattern=job,
+                                         folder_name=search_folder,
+                                         folder_depth=depth,
+                                         fullname=fullname)
+    job_urls = [match['url'] for match in matches]
+    jobs_stats = yj_obj.job.build_stats_many(job_urls, max_builds=number)
+    data_items = (job_stats.summary(window=window, threshold=threshold) for job_stats in jobs_stats)
+
+    if stream:
+        if not cu.standard_out_stream(data_items):
+            print2("No jobs found", color="yellow")
+            sys.exit(1)
+        return
+
+    data = sorted(data_items, key=lambda job_summary: job_summary['jobUrl'])
+    if not data:
+        print2("No jobs found", color="yellow")
+        sys.exit(1)
+    cu.standard_out(data, **kwargs)
+
+
+@log_to_history
+def logs_search(profile: str, token: str, job: str, search_patterns: Tuple[str], number: int, build_range: str,
+                context: int, ignore_case: bool, workers: int, opt_list: bool) -> None:
+    """Search the console logs of a job's builds
+
+    Args:
+        profile:         The profile/account to use
+        token:           API Token for Jenkins server
+        job:             The job name or URL
+        search_patterns: REGEX patterns to search for
+        number:          Number of most recent builds to search (0 for all builds)
+        build_range:     Range of build numbers to search
+        context:         Number of log lines before and after each match to include
+        ignore_case:     Option to match patterns regardless of case
+        workers:         Maximum number of build logs searched at once
+        opt_list:        Option to only output the URL of each build with a match, once
+    """
+    first_number, last_number = cu.parse_build_range(build_range) if build_range else (0, 0)
+    yj_obj = cu.config_yo_jenkins(profile, token)
+    search_args = {
+        'max_builds': number,
+        'first_number': first_number,
+        'last_number': last_number,
+        'context_lines': context,
+        'ignore_case': ignore_case,
+        'max_workers': workers
+    }
+    if cu.is_full_url(job):
+        matches = yj_obj.job.logs_search(search_patterns, job_url=job, **search_args)
+    else:
+        matches = yj_obj.job.logs_search(search_patterns, job_name=job, **search_args)
+
+    def first_match_per_build(matches):
+        build_urls = set()
+        for match in matches:
+            if match['buildUrl'] not in build_urls:
+                build_urls.add(match['buildUrl'])
+                yield match
+
+    if opt_list:
+        matches = first_match_per_build(matches)
+    if not cu.standard_out_stream(matches, item_key='buildUrl' if opt_list else ''):
+        print2("No matches found", color="yellow")
+        sys.exit(1)
+
+
+@log_to_history
+def failure_clusters(profile: str, token: str, job: str, number: int, build_range: str, result: Tuple[str],
+                     tail_lines: int, log_lines: int, threshold: float, workers: int, **kwargs) -> None:
+    """Group the failed builds of a job by the error signature of their logs
+
+    Args:
+        profile:     The profile/account to use
+        token:       API Token for Jenkins server
+        job:         The job name or URL
+        number:      Number of most recent builds to check (0 for all builds)
+        build_range: Range of build numbers to check
+        result:      Build results counted as failed
+        tail_lines:  Number of last error lines of each log used as the failure signature
+        log_lines:   Number of last log lines of each build requested
+        threshold:   Similarity of error signatures from which on builds are grouped
+        workers:     Maximum number of build logs requested at once
+    """
+    first_number, last_number = cu.parse_build_range(build_range) if build_range else (0, 0)
+    yj_obj = cu.config_yo_jenkins(profile, token)
+    cluster_args = {
+        'max_builds': number,
+        'first_number': first_number,
+        'last_number': last_number,
+        'results': result,
+        'tail_lines': tail_lines,
+        'log_lines': log_lines,
+        'threshold': threshold,
+        'max_workers': workers
+    }
+    if cu.is_full_url(job):
+        data = yj_obj.job.failure_clusters(job_url=job, **cluster_args)
+    else:
+        data = yj_obj.job.failure_clusters(job_name=job, **cluster_args)
+    if not data:
+        print2("No failed builds found", color="yellow")
+        sys.exit(1)
+    cu.standard_out(data, **kwargs)
+
+
 @log_to_history
 def build_next(profile: str, token: str, job: str) -> None:
     """Get last build number for a job
@@ -297,17 +490,22 @@ def wipe(profile: str, token: str, job: str) -> None:
 
 
 @log_to_history
-def monitor(profile: str, token: str, job: str, sound: bool) -> None:
-    """TODO Docstring
+def monitor(profile: str, token: str, job: str, sound: bool, headless: bool, filepath: str) -> None:
+    """Start monitor UI
 
     Args:
-        TODO
+        profile:  The profile/account to use
+        token:    API Token for Jenkins server
+        job:      The job name or URL
+        sound:    Option to play a sound when a build status changes
+        headless: Option to write build change events as JSON lines instead of the UI
+        filepath: File to append the headless events to, standard out if not specified
     """
     yj_obj = cu.config_yo_jenkins(profile, token)
     if cu.is_full_url(job):
-        yj_obj.job.monitor(job_url=job, sound=sound)
+        yj_obj.job.monitor(job_url=job, sound=sound, headless=headless, output_file=filepath)
     else:
-        yj_obj.job.monitor(job_name=job, sound=sound)
+        yj_obj.job.monitor(job_name=job, sound=sound, headless=headless, output_file=filepath)
 
 
 @log_to_history
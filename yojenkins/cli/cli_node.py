@@ -37,7 +37,7 @@ def list(profile: str, token: str, opt_list: bool, depth: int, **kwargs) -> None
         TODO
     """
     yj_obj = cu.config_yo_jenkins(profile, token)
-    data, data_list = yj_obj.node.list(depth)
+    data, data_list = yj_obj.node.list(depth, list_only=opt_list)
     data = data_list if opt_list else data
     cu.standard_out(data, **kwargs)
 
@@ -41,7 +41,7 @@ def people(profile: str, token: str, opt_list: bool, **kwargs) -> None:
     Args:
         TODO
     """
-    data, data_list = cu.config_yo_jenkins(profile, token).server.people()
+    data, data_list = cu.config_yo_jenkins(profile, token).server.people(list_only=opt_list)
     data = data_list if opt_list else data
     cu.standard_out(data, **kwargs)
 
@@ -72,7 +72,7 @@ def plugins(profile: str, token: str, opt_list: bool, **kwargs) -> None:
     Args:
         TODO
     """
-    data, data_list = cu.config_yo_jenkins(profile, token).server.plugin_list()
+    data, data_list = cu.config_yo_jenkins(profile, token).server.plugin_list(list_only=opt_list)
     data = data_list if opt_list else data
     cu.standard_out(data, **kwargs)
 
@@ -131,8 +131,8 @@ def steps(profile: str, token: str, opt_list: bool, name: str, job: str, number:
 
 
 @log_to_history
-def logs(profile: str, token: str, name: str, job: str, number: int, url: str, latest: bool,
-         download_dir: bool) -> None:
+def logs(profile: str, token: str, name: str, job: str, number: int, url: str, latest: bool, download_dir: bool,
+         workers: int, from_console: bool) -> None:
     """TODO Docstring
 
     Details: TODO
@@ -159,11 +159,15 @@ def logs(profile: str, token: str, name: str, job: str, number: int, url: str, l
                           job_url=job,
                           build_number=number,
                           latest=latest,
-                          download_dir=download_dir)
+                          download_dir=download_dir,
+                          max_workers=workers,
+                          from_console=from_console)
     else:
         yj_obj.stage.logs(stage_name=name,
                           build_url=url,
                           job_name=job,
                           build_number=number,
                           latest=latest,
-                          download_dir=download_dir)
+                          download_dir=download_dir,
+                          max_workers=workers,
+                          from_console=from_console)
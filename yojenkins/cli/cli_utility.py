@@ -9,7 +9,7 @@ from datetime import datetime
 from inspect import getfullargspec
 from pathlib import Path
 from shlex import quote
-from typing import Callable, Dict, List, Union
+from typing import Callable, Dict, Iterable, List, Tuple, Union
 
 import click
 import toml
@@ -33,6 +33,9 @@ HISTORY_FILE_NAME = 'history.jsonl'
 COMMAND_HISTORY_FORMAT = 'jsonl'
 DEFAULT_PROFILE_NAME = 'default'
 MAX_PROFILE_HISTORY_LENGTH = 1000
+RESPONSE_CACHE_ENV_VAR = 'YOJENKINS_RESPONSE_CACHE'
+BUILD_CACHE_ENV_VAR = 'YOJENKINS_BUILD_CACHE'
+REST_ENGINE_ENV_VAR = 'YOJENKINS_REST_ENGINE'
 
 CLI_CMD_PATH = sys.argv[0]
 CLI_CMD_ARGS = ' '.join([quote(arg) for arg in sys.argv[1:]])
@@ -108,7 +111,26 @@ def config_yo_jenkins(profile: str, token: str) -> YoJenkins:
         click.secho('Failed authentication', fg='bright_red', bold=True)
         sys.exit(1)
 
-    return YoJenkins(auth)
+    # Keep the response cache on disk across commands if requested
+    if os.getenv(RESPONSE_CACHE_ENV_VAR, '').lower() in ['1', 'true', 'yes']:
+        logger.debug(f'Environmental variable {RESPONSE_CACHE_ENV_VAR} set. Using persistent response cache')
+        auth.get_rest().cache_enable(persist=True)
+
+    # Use the asyncio engine for bulk requests if requested
+    if os.getenv(REST_ENGINE_ENV_VAR, '').lower() == 'async':
+        logger.debug(f'Environmental variable {REST_ENGINE_ENV_VAR} set. Using async engine for bulk requests')
+        auth.get_rest().async_enable()
+
+    yj_obj = YoJenkins(auth)
+
+    # Keep finished builds on disk across commands if requested, clearing them first with "clear"
+    build_cache_env = os.getenv(BUILD_CACHE_ENV_VAR, '').lower()
+    if build_cache_env in ['1', 'true', 'yes', 'clear']:
+        logger.debug(f'Environmental variable {BUILD_CACHE_ENV_VAR} set to "{build_cache_env}". '
+                     'Using persistent build cache')
+        yj_obj.build.cache_enable(persist=True, clear=build_cache_env == 'clear')
+
+    return yj_obj
 
 
 def standard_out(data: Union[Dict, List],
@@ -161,6 +183,44 @@ def standard_out(data: Union[Dict, List],
             print2(json.dumps(data))
 
 
+def standard_out_stream(data_items: Iterable[Dict], item_key: str = '') -> int:
+    """Outputting each data item to the console as soon as it is available.
+    Each item is output as one line of JSON, or as only one of its values.
+
+    Args:
+        data_items : Iterable of data items (ie. a generator of search matches)
+        item_key   : If specified, only output this value of each item (ie. `url`)
+
+    Returns:
+        Number of items output
+    """
+    logger.debug('Outputting JSON lines format as items are received ...')
+    items_count = 0
+    for data_item in data_items:
+        print2(data_item.get(item_key, '') if item_key else json.dumps(data_item))
+        items_count += 1
+    return items_count
+
+
+def parse_build_range(build_range: str) -> Tuple[int, int]:
+    """Parse a build number range option
+
+    Args:
+        build_range: Build number range in `FIRST:LAST` format. Either side may be left out
+
+    Returns:
+        Tuple of first and last build number (0 if not specified)
+    """
+    try:
+        first_number, last_number = [int(number) if number.strip() else 0 for number in build_range.split(':')]
+    except ValueError:
+        click.secho(f'INPUT ERROR: Build range "{build_range}" not formatted as FIRST:LAST (ie. 10:20)',
+                    fg='bright_red',
+                    bold=True)
+        sys.exit(1)
+    return max(first_number, 1), last_number
+
+
 def is_full_url(url: str) -> bool:
     """Check if the provided url is a full and valide URL
 
@@ -17,11 +17,30 @@ from yojenkins.utility.utility import translate_kwargs
 @click.option('-n', '--number', type=int, required=False, help='Build number')
 @click.option('-u', '--url', type=str, required=False, help='Flexible build URL (No job info needed)')
 @click.option('--latest', type=bool, required=False, is_flag=True, help='Latest build (Replaces --number)')
+@click.option('--range',
+              'build_range',
+              type=str,
+              required=False,
+              metavar='FIRST:LAST',
+              help='Range of build numbers of the job (ie. 10:20, 10:, :20)')
+@click.option('--urls-file',
+              type=click.Path(file_okay=True, dir_okay=False, allow_dash=True),
+              required=False,
+              help='File with one build URL per line ("-" for stdin)')
+@click.option('--workers',
+              type=click.IntRange(1),
+              default=16,
+              show_default=True,
+              required=False,
+              help='Maximum number of builds requested at once for --range and --urls-file')
 @click.pass_context
 def info(ctx, debug, **kwargs):
-    """Build information"""
+    """Build information
+
+    With --range or --urls-file, each build is output as one line of JSON as soon as it is received
+    """
     set_debug_log_level(debug)
-    if kwargs.get("job") or kwargs.get("url"):
+    if kwargs.get("job") or kwargs.get("url") or kwargs.get("urls_file"):
         cli_build.info(**translate_kwargs(kwargs))
     else:
         click.echo(ctx.get_help())
@@ -104,7 +123,12 @@ def stages(ctx, debug, **kwargs):
 @cli_decorators.profile
 @click.argument('job', nargs=1, type=str, required=False)
 @click.option('-n', '--number', type=int, required=False, help='Build number')
-@click.option('-u', '--url', type=str, required=False, help='Flexible build URL (No job info needed)')
+@click.option('-u',
+              '--url',
+              type=str,
+              required=False,
+              multiple=True,
+              help='Flexible build URL (No job info needed). Repeat to follow many builds')
 @click.option('--latest', type=str, required=False, is_flag=True, help='Latest build (Replaces --number)')
 @click.option('--tail', type=float, required=False, help='Last of logs. If < 1 then %, else number of lines')
 @click.option('-dd',
@@ -119,6 +143,36 @@ def stages(ctx, debug, **kwargs):
               required=False,
               is_flag=True,
               help='Follow/Stream the logs as they are generated')
+@click.option('--running',
+              default=False,
+              type=bool,
+              required=False,
+              is_flag=True,
+              help='With --follow, follow all running builds of the job')
+@click.option('--by-stage',
+              default=False,
+              type=bool,
+              required=False,
+              is_flag=True,
+              help='With --download-dir, save one log file per pipeline stage')
+@click.option('--archive',
+              default=False,
+              type=bool,
+              required=False,
+              is_flag=True,
+              help='With --by-stage, save all stage log files into one .tar.gz file')
+@click.option('--workers',
+              type=click.IntRange(1),
+              default=8,
+              show_default=True,
+              required=False,
+              help='Maximum number of stage and step logs requested at once for --by-stage')
+@click.option('--from-console',
+              default=False,
+              type=bool,
+              required=False,
+              is_flag=True,
+              help='With --by-stage, split the stage logs out of one download of the build console log')
 @click.pass_context
 def logs(ctx, debug, **kwargs):
     """Get build logs
@@ -131,6 +185,9 @@ def logs(ctx, debug, **kwargs):
     - yojenkins build logs "myFolder/myJob" --latest --tail 0.1
     - yojenkins build logs "myFolder/myJob" --number 2 --follow
     - yojenkins build logs "myFolder/myJob" --latest -dd .
+    - yojenkins build logs "myFolder/myJob" --latest -dd . --by-stage --archive
+    - yojenkins build logs "myFolder/myJob" --running --follow
+    - yojenkins build logs -u <BUILD URL 1> -u <BUILD URL 2> --follow
 
     """
     set_debug_log_level(debug)
@@ -166,9 +223,31 @@ def browser(ctx, debug, **kwargs):
 @click.option('-u', '--url', type=str, required=False, help='Flexible build URL (No job info needed)')
 @click.option('--latest', type=str, required=False, is_flag=True, help='Latest build (Replaces --number)')
 @click.option('-s', '--sound', type=bool, required=False, is_flag=True, help='Enable sound effects')
+@click.option('--headless',
+              type=bool,
+              default=False,
+              required=False,
+              is_flag=True,
+              help='No UI, write status change events as JSON lines')
+@click.option('--filepath',
+              type=click.Path(file_okay=True, dir_okay=False),
+              default='',
+              required=False,
+              help='File to append headless events to [default: standard out]')
 @click.pass_context
 def monitor(ctx, debug, **kwargs):
-    """Start monitor UI"""
+    """Start monitor UI
+
+    With --headless, no UI is shown. Instead each change of the server status, build status,
+    or stage status is written as one JSON object per line. The headless monitor stops once
+    the build is finished.
+
+    EXAMPLES:
+
+    \b
+    - yojenkins build monitor myFolder/myJob --latest
+    - yojenkins build monitor myFolder/myJob --latest --headless --filepath events.jsonl
+    """
     # TODO: Pass a list of build numbers
     set_debug_log_level(debug)
     if kwargs.get("job") or kwargs.get("url"):
@@ -34,6 +34,13 @@ def info(debug, **kwargs):
               required=False,
               is_flag=True,
               help='Search entire folder path name')
+@click.option('--stream',
+              type=bool,
+              default=False,
+              required=False,
+              is_flag=True,
+              help='Output each match as soon as it is found, one per line')
+@cli_decorators.item_index
 @cli_decorators.list
 def search(debug, **kwargs):
     """Search folders by REGEX pattern"""
@@ -82,6 +89,7 @@ def views(debug, **kwargs):
 @cli_decorators.format_output
 @cli_decorators.profile
 @click.argument('folder', nargs=1, type=str, required=True)
+@cli_decorators.item_index
 @cli_decorators.list
 def items(debug, **kwargs):
     """List all items in folder"""
@@ -121,6 +129,80 @@ def config(debug, **kwargs):
     cli_folder.config(**translate_kwargs(kwargs))
 
 
+@folder.command(short_help='\tFind jobs with drifted configuration')
+@cli_decorators.debug
+@cli_decorators.format_output
+@cli_decorators.profile
+@click.argument('folder', nargs=1, type=str, required=True)
+@click.option('-d', '--depth', type=int, default=4, required=False, help='Number of sub-folder levels to look through')
+@click.option('--min-group',
+              type=click.IntRange(1),
+              default=2,
+              show_default=True,
+              required=False,
+              help='Least number of jobs sharing a config for it to be a template')
+@click.option('--threshold',
+              type=click.FloatRange(0, 1),
+              default=0.8,
+              show_default=True,
+              required=False,
+              help='Similarity (0 to 1) to a template from which on a config is drifted from it')
+@click.option('--ignore-element',
+              type=str,
+              default=('description', 'displayName'),
+              show_default=True,
+              multiple=True,
+              required=False,
+              help='Config element tag left out of the comparison [Can use multiple times]')
+@click.option('--workers',
+              type=click.IntRange(1),
+              default=16,
+              show_default=True,
+              required=False,
+              help='Maximum number of job configs requested at once')
+@cli_decorators.item_index
+def config_drift(debug, **kwargs):
+    """Find jobs with drifted configuration
+
+    The configurations of all jobs in the folder and its sub-folders are normalized and grouped
+    by fingerprint. Configurations shared by many jobs, and not similar to a larger template,
+    are templates. Every other job at least --threshold similar to a template is shown with its
+    differences to the most similar template. Jobs not similar enough to any template are listed
+    in a last group, without differences.
+
+    Whitespace, attribute order, plugin versions, and the job name do not count as differences.
+
+    EXAMPLES:
+
+    \b
+    - yojenkins folder config-drift "myFolder" --depth 2
+    - yojenkins folder config-drift "myFolder" --min-group 5 --ignore-element disabled --yaml
+    """
+    set_debug_log_level(debug)
+    cli_folder.config_drift(**translate_kwargs(kwargs))
+
+
+@folder.command(short_help='\tStart monitor UI')
+@cli_decorators.debug
+@cli_decorators.profile
+@click.argument('folder', nargs=1, type=str, required=True)
+@click.option('-s', '--sound', type=bool, required=False, is_flag=True, help='Enable sound effects')
+def monitor(debug, **kwargs):
+    """Start monitor UI
+
+    All jobs of the folder are shown with the status of their last build and their position
+    in the build queue. Use the arrow and page keys to scroll through the jobs.
+
+    EXAMPLES:
+
+    \b
+    - yojenkins folder monitor "myFolder"
+    - yojenkins folder monitor https://localhost:8080/job/myFolder/ --sound
+    """
+    set_debug_log_level(debug)
+    cli_folder.monitor(**translate_kwargs(kwargs))
+
+
 @folder.command(short_help='\tCreate an item [folder, view, job]')
 @cli_decorators.debug
 @cli_decorators.profile
@@ -34,6 +34,13 @@ def info(debug, **kwargs):
               required=False,
               is_flag=True,
               help='Search entire job path name')
+@click.option('--stream',
+              type=bool,
+              default=False,
+              required=False,
+              is_flag=True,
+              help='Output each match as soon as it is found, one per line')
+@cli_decorators.item_index
 @cli_decorators.list
 def search(debug, **kwargs):
     """Search jobs by REGEX pattern"""
@@ -53,6 +60,199 @@ def list(debug, **kwargs):
     cli_job.build_list(**translate_kwargs(kwargs))
 
 
+@job.command(short_help='\tBuild history for job')
+@cli_decorators.debug
+@cli_decorators.format_output
+@cli_decorators.profile
+@click.argument('job', nargs=1, type=str, required=True)
+@click.option('-n',
+              '--number',
+              type=click.IntRange(0),
+              default=0,
+              required=False,
+              help='Number of most recent builds. Default all builds')
+@click.option('--stream',
+              type=bool,
+              default=False,
+              required=False,
+              is_flag=True,
+              help='Output each build as soon as it is received, one per line')
+@cli_decorators.list
+def history(debug, **kwargs):
+    """Build history for job (number, result, timestamp, duration, url)"""
+    set_debug_log_level(debug)
+    cli_job.build_history(**translate_kwargs(kwargs))
+
+
+@job.command(short_help='\tBuild duration and result statistics')
+@cli_decorators.debug
+@cli_decorators.format_output
+@cli_decorators.profile
+@click.argument('job', nargs=1, type=str, required=True)
+@click.option('-n',
+              '--number',
+              type=click.IntRange(0),
+              default=0,
+              required=False,
+              help='Number of most recent builds used. Default all builds')
+@click.option('-w',
+              '--window',
+              type=click.IntRange(1),
+              default=10,
+              show_default=True,
+              required=False,
+              help='Number of builds for moving average and regression detection')
+@click.option('--threshold',
+              type=click.FloatRange(0),
+              default=0.2,
+              show_default=True,
+              required=False,
+              help='Fraction of slowdown counted as a regression (ie. 0.2 is 20% slower)')
+@click.option('--search',
+              type=bool,
+              default=False,
+              required=False,
+              is_flag=True,
+              help='Use JOB as a REGEX search pattern and get stats of every matching job')
+@click.option('-sf', '--search-folder', type=str, default='', required=False, help='Folder within which to search')
+@click.option('-d', '--depth', type=int, default=4, required=False, help='Search depth from root directory')
+@click.option('-fn',
+              '--fullname',
+              type=bool,
+              default=False,
+              required=False,
+              is_flag=True,
+              help='Search entire job path name')
+@click.option('--stream',
+              type=bool,
+              default=False,
+              required=False,
+              is_flag=True,
+              help='With --search, output stats of each job as soon as done, one per line')
+@cli_decorators.item_index
+def stats(debug, **kwargs):
+    """Build duration and result statistics (percentiles, failure rate, regression)"""
+    set_debug_log_level(debug)
+    cli_job.build_stats(**translate_kwargs(kwargs))
+
+
+@job.command(short_help='\tSearch build logs by REGEX pattern')
+@cli_decorators.debug
+@cli_decorators.profile
+@click.argument('job', nargs=1, type=str, required=True)
+@click.argument('search_patterns', nargs=-1, type=str, required=True)
+@click.option('-n',
+              '--number',
+              type=click.IntRange(0),
+              default=0,
+              required=False,
+              help='Number of most recent builds to search. Default all builds')
+@click.option('--range',
+              'build_range',
+              type=str,
+              required=False,
+              metavar='FIRST:LAST',
+              help='Range of build numbers to search (ie. 10:20, 10:, :20)')
+@click.option('-C',
+              '--context',
+              type=click.IntRange(0),
+              default=0,
+              required=False,
+              help='Number of log lines before and after each match to include')
+@click.option('-i',
+              '--ignore-case',
+              type=bool,
+              default=False,
+              required=False,
+              is_flag=True,
+              help='Match patterns regardless of case')
+@click.option('--workers',
+              type=click.IntRange(1),
+              default=8,
+              show_default=True,
+              required=False,
+              help='Maximum number of build logs searched at once')
+@cli_decorators.list
+def logs_search(debug, **kwargs):
+    """Search build logs by REGEX pattern
+
+    Each match is output as one line of JSON as soon as found
+
+    EXAMPLES:
+
+    \b
+    - yojenkins job logs-search "myFolder/myJob" "Connection refused" --number 300
+    - yojenkins job logs-search "myFolder/myJob" "ERROR" "FATAL" --range 100:200 -C 2
+    """
+    set_debug_log_level(debug)
+    cli_job.logs_search(**translate_kwargs(kwargs))
+
+
+@job.command(short_help='\tGroup failed builds by log error signature')
+@cli_decorators.debug
+@cli_decorators.format_output
+@cli_decorators.profile
+@click.argument('job', nargs=1, type=str, required=True)
+@click.option('-n',
+              '--number',
+              type=click.IntRange(0),
+              default=0,
+              required=False,
+              help='Number of most recent builds to check. Default all builds')
+@click.option('--range',
+              'build_range',
+              type=str,
+              required=False,
+              metavar='FIRST:LAST',
+              help='Range of build numbers to check (ie. 10:20, 10:, :20)')
+@click.option('--result',
+              type=click.Choice(['FAILURE', 'UNSTABLE', 'ABORTED'], case_sensitive=False),
+              default=('FAILURE', ),
+              show_default=True,
+              multiple=True,
+              required=False,
+              help='Build result counted as failed [Can use multiple times]')
+@click.option('--tail-lines',
+              type=click.IntRange(1),
+              default=10,
+              show_default=True,
+              required=False,
+              help='Number of last error lines of each log used as the failure signature')
+@click.option('--log-lines',
+              type=click.IntRange(1),
+              default=200,
+              show_default=True,
+              required=False,
+              help='Number of last log lines of each build requested')
+@click.option('--threshold',
+              type=click.FloatRange(0, 1),
+              default=0.5,
+              show_default=True,
+              required=False,
+              help='Similarity (0 to 1) of error signatures from which on builds are grouped')
+@click.option('--workers',
+              type=click.IntRange(1),
+              default=8,
+              show_default=True,
+              required=False,
+              help='Maximum number of build logs requested at once')
+def failure_clusters(debug, **kwargs):
+    """Group failed builds by log error signature
+
+    Builds that failed with similar errors at the end of their logs are grouped together,
+    ignoring timestamps, hashes, temporary paths, long numbers, and build numbers.
+    Builds with different status, exit, or error codes are never grouped together
+
+    EXAMPLES:
+
+    \b
+    - yojenkins job failure-clusters "myFolder/myJob" --number 100
+    - yojenkins job failure-clusters "myFolder/myJob" --range 200: --result FAILURE --result UNSTABLE
+    """
+    set_debug_log_level(debug)
+    cli_job.failure_clusters(**translate_kwargs(kwargs))
+
+
 @job.command(short_help='\tGet next build number')
 @cli_decorators.debug
 @cli_decorators.profile
@@ -235,8 +435,30 @@ def wipe(debug, **kwargs):
 @cli_decorators.profile
 @click.argument('job', nargs=1, type=str, required=False)
 @click.option('-s', '--sound', type=bool, required=False, is_flag=True, help='Enable sound effects')
+@click.option('--headless',
+              type=bool,
+              default=False,
+              required=False,
+              is_flag=True,
+              help='No UI, write status change events as JSON lines')
+@click.option('--filepath',
+              type=click.Path(file_okay=True, dir_okay=False),
+              default='',
+              required=False,
+              help='File to append headless events to [default: standard out]')
 def monitor(debug, **kwargs):
-    """Start monitor UI"""
+    """Start monitor UI
+
+    With --headless, no UI is shown. Instead each change of the server status, each new
+    build, and each build status change is written as one JSON object per line, until
+    interrupted.
+
+    EXAMPLES:
+
+    \b
+    - yojenkins job monitor myFolder/myJob
+    - yojenkins job monitor myFolder/myJob --headless | jq .
+    """
     set_debug_log_level(debug)
     cli_job.monitor(**translate_kwargs(kwargs))
 
@@ -93,6 +93,18 @@ def steps(ctx, debug, **kwargs):
               required=False,
               is_flag=False,
               help='Download logs to directory')
+@click.option('--workers',
+              type=click.IntRange(1),
+              default=8,
+              show_default=True,
+              required=False,
+              help='Maximum number of step logs requested at once')
+@click.option('--from-console',
+              default=False,
+              type=bool,
+              required=False,
+              is_flag=True,
+              help='Split the step logs out of one download of the build console log')
 @click.pass_context
 def logs(ctx, debug, **kwargs):
     """Stage logs"""
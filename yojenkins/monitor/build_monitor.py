@@ -4,12 +4,13 @@ import curses
 import logging
 import os
 import sys
-import threading
+from functools import partial
 #  from pprint import pprint
-from time import perf_counter, sleep, time
+from time import time
 
 from yojenkins.monitor.monitor import Monitor
 from yojenkins.utility.utility import get_resource_path
+from yojenkins.yo_jenkins.jenkins_item_tree import JenkinsItemTree
 from yojenkins.yo_jenkins.status import Color, StageStatus, Status
 
 from . import monitor_utility as mu
@@ -40,15 +41,12 @@ class BuildMonitor(Monitor):
         self.auth = auth
         self.build = Build
 
-        # Build Info Thread
+        # Build Info
         self.build_info_data = {}
-        self.build_info_thread_interval = 0.0
-        self._build_info_thread_lock = threading.Lock()
 
-        # Build Stages Thread
+        # Build Stages
         self.build_stages_data = {}
-        self.build_stages_thread_interval = 0.0
-        self._build_stages_thread_lock = threading.Lock()
+        self.build_stages_checked = False
 
         # Aborting build flag
         self.build_abort = 0
@@ -76,10 +74,9 @@ class BuildMonitor(Monitor):
         Returns:
             True if no error, else False
         """
-        # Starting data collection threads
-        self.server_status_thread_on()
-        self.__build_info_thread_on(build_url=build_url)
-        self.__build_stages_thread_on(build_url=build_url)
+        # Starting data collection
+        self.__data_tasks_add(build_url)
+        self.scheduler.start()
 
         # Setting up basic stuff for curses and load keys
         self.basic_screen_setup(halfdelay=True)
@@ -95,15 +92,10 @@ class BuildMonitor(Monitor):
         # User key input (ASCII value)
         keystroke = 0
 
-        # Debug stuff
-        # loop_total_time = 0
-
         # Main Loop
         while True:
-            start_time = perf_counter()
-
-            # Clearing the screen at each loop iteration before constructing the frame
-            scr.clear()
+            # Take over any data changed since the last frame
+            self.monitor_data_update()
 
             ########################################################################################
 
@@ -128,6 +120,14 @@ class BuildMonitor(Monitor):
             elif keystroke in ui_keys['LOGS']:
                 self.build_logs = True
 
+            # Skip drawing the frame if nothing shown on it changed
+            sound_notify_msg_box_shown = sound_notify_msg_show or (
+                sound_notify_msg_box_timing and time() - sound_notify_msg_time < self.message_box_temp_duration)
+            if not self.frame_begin(scr, self.quit, self.build_abort, self.build_logs, self.help, sound,
+                                    sound_notify_msg_box_shown, self.scheduler.interval('build_info')):
+                keystroke = scr.getch()
+                continue
+
             ########################################################################################
 
             # Check terminal size
@@ -143,10 +143,8 @@ class BuildMonitor(Monitor):
             y_row = 1
 
             if logger.level < 20:
-                # mu.draw_text(scr, f"{loop_total_time:.4f}", y_row, center_x=True, color=self.color['grey-light'], decor=self.decor['bold'])
-                # mu.draw_text(scr, str(curses.baudrate()), y_row, center_x=True, color=self.color['grey-light'], decor=self.decor['bold'])
                 mu.draw_text(scr,
-                             str(time() - sound_notify_msg_time) + ' ' + str(sound) + ' ' + str(sound_notify_msg_show),
+                             self.frame_debug_text(),
                              y_row,
                              center_x=True,
                              color=self.color['grey-light'],
@@ -222,7 +220,7 @@ class BuildMonitor(Monitor):
                         self.build_info_data['estimatedDurationFormatted'], self.color['normal'], self.decor['normal']
                     ],
                     'Refresh': [
-                        str(self.build_info_thread_interval) + ' sec', self.color['normal'], self.decor['normal']
+                        str(self.scheduler.interval('build_info')) + ' sec', self.color['normal'], self.decor['normal']
                     ],
                     'Status': [self.build_info_data['resultText'], self.color[status_color], self.decor['bold']]
                 }
@@ -344,8 +342,8 @@ class BuildMonitor(Monitor):
 
             ########################################################################################
 
-            # Refresh the screen (scr.nourefresh + scr.doupdate)
-            scr.refresh()
+            # Update but don't write yet, written with the message boxes at the end of the frame
+            scr.noutrefresh()
 
             ########################################################################################
 
@@ -393,6 +391,7 @@ class BuildMonitor(Monitor):
                     if build_url:
                         self.server_interaction = True
                         build_number = self.build.abort(build_url=build_url)
+                        self.scheduler.refresh()
                     else:
                         # TODO: Show UI error message for missing build_url
                         pass
@@ -403,7 +402,7 @@ class BuildMonitor(Monitor):
             # Show the build logs
             if self.build_logs:
                 self.help = False
-                self.all_threads_enabled = False
+                self.all_threads_off()
                 curses.echo(True)
                 curses.nl(True)
                 curses.endwin()
@@ -420,7 +419,7 @@ class BuildMonitor(Monitor):
                 mu.draw_message_box(scr, message_lines)
                 # Quit Message confirmed (pressed twice)
                 if self.quit > 1:
-                    self.all_threads_enabled = False
+                    self.all_threads_off()
                     return True
             else:
                 halfdelay_normal = True
@@ -431,12 +430,13 @@ class BuildMonitor(Monitor):
 
             # Straight exist program
             if self.exit:
-                self.all_threads_enabled = False
+                self.all_threads_off()
                 sys.exit(0)
 
             ########################################################################################
 
-            loop_total_time = perf_counter() - start_time
+            # Write the frame to the terminal
+            self.frame_end()
 
             # Get User input
             keystroke = scr.getch()
@@ -455,138 +455,139 @@ class BuildMonitor(Monitor):
         # Disable any console output logging
         mu.logging_console(enabled=False)
 
-        return curses.wrapper(self.__monitor_draw, build_url, sound)
+        # Repeated polling of unchanged resources is answered from cache
+        self.rest.cache_enable()
 
-    ###########################################################################
-    #                      DATA COLLECTION THREADS
-    ###########################################################################
+        # Finished builds do not change, they are only requested once
+        self.build.cache_enable()
 
-    ###########################  BUILD INFO  ##################################
+        return curses.wrapper(self.__monitor_draw, build_url, sound)
 
-    def __thread_build_info(self, build_url: str, monitor_interval: float) -> None:
+    def monitor_headless(self, build_url: str, output_file: str = '') -> bool:
         """
-        Independent thread which polls build information
+        Monitor the build without UI, writing build and stage status change events as JSON lines
+
+        Details: Stops once the build is finished and its last events are written
 
         Args:
             build_url: Server URL of the build
-            monitor_interval: Seconds between polling build URL
+            output_file: Path to the file to append the events to. Default standard out
 
         Returns:
-            None
+            True, if successful, else False
         """
-        logger.debug(
-            f'Thread starting - Build info - (ID: {threading.get_ident()} - Refresh Interval: {monitor_interval}s) ...'
-        )
-
-        # Set the monitoring thread flag up
-        self.all_threads_enabled = True
-        self.build_info_thread_interval = monitor_interval
-
-        # Loop until flags disable it
-        while self.all_threads_enabled:
-            if not self.paused:
-                self.server_interaction = True
-                with self._build_info_thread_lock:
-                    self.build_info_data = self.build.info(build_url=build_url)
-
-            # Wait some time before checking again
-            start_time = time()
-            while time() - start_time <= monitor_interval:
-                sleep(0.100)
-                if not self.all_threads_enabled:
-                    break
-
-        logger.debug(f'Thread stopped - Build info - (ID: {threading.get_ident()})')
-
-    def __build_info_thread_on(self, build_url: str = '', monitor_interval: float = 7.0) -> bool:
+        # Disable any console output logging
+        mu.logging_console(enabled=False)
+
+        # Repeated polling of unchanged resources is answered from cache
+        self.rest.cache_enable()
+
+        # Finished builds do not change, they are only requested once
+        self.build.cache_enable()
+
+        self.__data_tasks_add(build_url)
+        return self.headless_run(self.__headless_events, output_file, self.__headless_finished)
+
+    ###########################################################################
+    #                      HEADLESS EVENTS
+    ###########################################################################
+
+    def __headless_events(self) -> list:
         """
-        Trigger to start independent thread that polls build information
+        Get the server, build status, and stage status change events of the latest data
 
         Args:
-            build_url: Server URL of the build
-            monitor_interval: Seconds between polling build URL
+            None
 
         Returns:
-            True if successful, else False
+            List of events
+        """
+        events = []
+        self.headless_events_server(events)
+        if self.build_info_data:
+            build_url = self.build_info_data['url']
+            self.headless_event(
+                events, f'build:{build_url}', 'build_status', {
+                    'url': build_url,
+                    'number': self.build_info_data.get('number'),
+                    'status': self.build_info_data.get('resultText'),
+                    'building': self.build_info_data.get('building'),
+                })
+            for build_stage in self.build_stages_data or []:
+                self.headless_event(events, f'stage:{build_url}:{build_stage.get("id")}', 'stage_status', {
+                    'build': build_url,
+                    'stage': build_stage.get('name'),
+                    'status': build_stage.get('status'),
+                })
+        return events
+
+    def __headless_finished(self) -> bool:
         """
-        logger.debug(f'Starting thread for build info for "{build_url}" ...')
-        try:
-            threading.Thread(target=self.__thread_build_info, args=(
-                build_url,
-                monitor_interval,
-            ), daemon=False).start()
-        except Exception as error:
-            logger.error(
-                f'Failed to start build info monitoring thread for {build_url}. Exception: {error}. Type: {type(error)}'
-            )
+        Check if the build is finished, getting its final stages once it is
+
+        Args:
+            None
 
+        Returns:
+            True if the build is finished, else False
+        """
+        if not self.build_info_data or self.build_info_data.get('building') or not self.build_info_data.get('result'):
+            return False
+        if 'build_stages' in self.scheduler.tasks:
+            self.build_stages_data = self.__build_stages_poll(self.build_info_data['url'])
         return True
 
-    ###########################  BUILD STAGES  ################################
+    ###########################################################################
+    #                      DATA COLLECTION TASKS
+    ###########################################################################
 
-    def __thread_build_stages(self, build_url: str, monitor_interval: float) -> None:
+    def __data_tasks_add(self, build_url: str) -> None:
         """
-        Independent thread that polls build stages
+        Add the data collection tasks of the build to the monitor scheduler
 
         Args:
             build_url: Server URL of the build
-            monitor_interval: Seconds between polling build URL
 
         Returns:
             None
         """
-        logger.debug(
-            f'Thread starting - Build Stages - (ID: {threading.get_ident()} - Refresh Interval: {monitor_interval}s) ...'
-        )
-
-        # Set the monitoring thread flag up
-        self.all_threads_enabled = True
-        self.build_stages_thread_interval = monitor_interval
-
-        # Check if this is a staged build
-        logger.debug(f'Checking if build is a staged build ...')
-        request_url = f"{build_url.strip('/')}/wfapi/describe"
-        return_content, _, return_success = self.rest.request(request_url, 'get', is_endpoint=False)
-        if not return_success or not return_content:
-            logger.debug('Failed to get build stages. This may not be a staged build')
-            return
-
-        # Loop until flags disable it
-        while self.all_threads_enabled:
-            if not self.paused:
-                self.server_interaction = True
-                with self._build_stages_thread_lock:
-                    self.build_stages_data = self.build.stage_list(build_url=build_url)[0]
-
-            # Wait some time before checking again
-            start_time = time()
-            while time() - start_time <= monitor_interval:
-                sleep(0.1)
-                if not self.all_threads_enabled:
-                    break
-
-        logger.debug(f'Thread stopped - Build Stages - (ID: {threading.get_ident()})')
-
-    def __build_stages_thread_on(self, build_url: str = '', monitor_interval: float = 9.0) -> bool:
+        self.server_status_task_add()
+        self.scheduler.task_add('build_info', partial(self.__build_info_poll, build_url), 7.0)
+        self.scheduler.task_add('build_stages', partial(self.__build_stages_poll, build_url), 9.0)
+
+    def __build_info_poll(self, build_url: str) -> dict:
         """
-        Trigger to start independent thread that polls build stages
+        Get the build information, run by the monitor scheduler
 
         Args:
             build_url: Server URL of the build
-            monitor_interval: Seconds between polling build URL
 
         Returns:
-            True if successful, else False
+            Build information
         """
-        logger.debug(f'Starting thread for build stages for "{build_url}" ...')
-        try:
-            threading.Thread(target=self.__thread_build_stages, args=(
-                build_url,
-                monitor_interval,
-            ), daemon=False).start()
-        except Exception as error:
-            logger.error(
-                f'Failed to start build info monitoring thread for {build_url}. Exception: {error}. Type: {type(error)}'
-            )
+        self.server_interaction = True
+        return self.build.info(build_url=build_url, tree=JenkinsItemTree.BUILD_MONITOR.value)
 
-        return True
+    def __build_stages_poll(self, build_url: str) -> list:
+        """
+        Get the build stages, run by the monitor scheduler
+
+        Details: If the build turns out to not be a staged build, the task is removed
+
+        Args:
+            build_url: Server URL of the build
+
+        Returns:
+            List of build stages
+        """
+        self.server_interaction = True
+        if not self.build_stages_checked:
+            logger.debug('Checking if build is a staged build ...')
+            request_url = f"{build_url.strip('/')}/wfapi/describe"
+            return_content, _, return_success = self.rest.request(request_url, 'get', is_endpoint=False)
+            if not return_success or not return_content:
+                logger.debug('Failed to get build stages. This may not be a staged build')
+                self.scheduler.task_remove('build_stages')
+                return {}
+            self.build_stages_checked = True
+        return self.build.stage_list(build_url=build_url)[0]
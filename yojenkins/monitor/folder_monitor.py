@@ -1,25 +1,43 @@
 """Folder monitor"""
 
-# import curses
+import curses
 import logging
+import os
+import sys
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from functools import partial
+from time import time
 
 from yojenkins.monitor.monitor import Monitor
+from yojenkins.utility.utility import get_resource_path
+from yojenkins.yo_jenkins.jenkins_item_classes import JenkinsItemClasses
+from yojenkins.yo_jenkins.jenkins_item_tree import JenkinsItemTree
+from yojenkins.yo_jenkins.status import BuildStatus, Status
+
+from . import monitor_utility as mu
 
 # Getting the logger reference
 logger = logging.getLogger()
 
 
 class FolderMonitor(Monitor):
-    """This class defines the BuildMonitor class and its function.
+    """This class defines the FolderMonitor class and its function.
+
+    The FolderMonitor class enables active monitoring of all jobs within a folder
 
-    The FolderMonitor class enables active folder monitoring
+    Details: All jobs, with their last build, are requested in one tree projected folder request,
+             and their queue positions in one tree projected queue request. Only jobs that changed
+             since the last request are processed again, and only the rows visible on screen are drawn.
     """
 
-    def __init__(self, Build) -> None:
+    def __init__(self, rest, auth, Folder) -> None:
         """Object constructor method, called at object creation
 
         Args:
-            Build: Build object
+            rest   : Rest object
+            auth   : Auth object
+            Folder : Folder object
 
         Returns:
             None
@@ -27,4 +45,496 @@ class FolderMonitor(Monitor):
         # Get attributes from super (parent) class
         super().__init__()
 
-        pass
+        self.rest = rest
+        self.auth = auth
+        self.folder = Folder
+
+        # Folder jobs and queue positions, taken over from the scheduler
+        self.folder_jobs_data = {}
+        self.queue_data = {}
+
+        # Job rows by job URL and job status counts, only updated for changed jobs
+        self.job_rows = {}
+        self.job_status_counts = Counter()
+
+        # Job results to play a sound for
+        self.sound_pending = deque(maxlen=10)
+
+        # First job row shown on screen
+        self.scroll_top = 0
+
+        # Minimum window height, job rows are scrolled
+        self.height_limit = 20
+
+        # Temporary message box on screen
+        self.message_box_temp_duration = 1  # sec
+
+        self.sound_directory = ""
+
+    ###########################################################################
+    #                         FOLDER MONITOR
+    ###########################################################################
+
+    def __monitor_draw(self, scr, folder_url: str, sound: bool = False) -> bool:
+        """
+        Draw a the FOLDER MONITOR UI on the screen
+
+        Args:
+            scr        : Handle for curses terminal screen handle
+            folder_url : Direct URL to folder
+            sound      : Enable sound effects
+        Returns:
+            True if no error, else False
+        """
+        # Starting data collection
+        self.server_status_task_add()
+        self.scheduler.task_add('folder_jobs', partial(self.__folder_jobs_poll, folder_url), 5.0)
+        self.scheduler.task_add('queue', self.__queue_poll, 5.0)
+        self.scheduler.start()
+
+        # Setting up basic stuff for curses and load keys
+        self.basic_screen_setup(halfdelay=True)
+        ui_keys = mu.load_keys()
+
+        # Sound effect related
+        self.sound_directory = get_resource_path(os.path.join('resources', 'sound'))
+        sound_notify_msg_time = 0
+        sound_notify_msg_show = False
+        sound_notify_msg_box_timing = False
+
+        # Job rows in display order, and number of job rows fitting on screen
+        job_rows = {}
+        job_urls = []
+        job_rows_visible = 1
+
+        # User key input (ASCII value)
+        keystroke = 0
+
+        # Main Loop
+        while True:
+            # Take over any data changed since the last frame
+            if self.monitor_data_update():
+                job_rows = self.folder_jobs_data.get('jobs', {})
+                job_urls = list(job_rows)
+
+            ########################################################################################
+
+            # Check user keyboard input
+            if keystroke in ui_keys['QUIT']:
+                self.quit += 1
+            elif keystroke in ui_keys['RESUME']:
+                self.quit = 0
+            elif keystroke in ui_keys['PAUSE']:
+                self.paused = not self.paused
+            elif keystroke in ui_keys['HELP']:
+                self.help = not self.help
+            elif keystroke in ui_keys['OPEN']:
+                if folder_url:
+                    self.folder.browser_open(folder_url=folder_url)
+            elif keystroke in ui_keys['SOUND']:
+                sound = not sound
+                sound_notify_msg_show = True
+            elif keystroke in ui_keys['DOWN']:
+                self.scroll_top += 1
+            elif keystroke in ui_keys['UP']:
+                self.scroll_top -= 1
+            elif keystroke in ui_keys['PAGE_DOWN']:
+                self.scroll_top += job_rows_visible
+            elif keystroke in ui_keys['PAGE_UP']:
+                self.scroll_top -= job_rows_visible
+            elif keystroke in ui_keys['HOME']:
+                self.scroll_top = 0
+            elif keystroke in ui_keys['END']:
+                self.scroll_top = len(job_urls)
+            self.scroll_top = max(min(self.scroll_top, len(job_urls) - job_rows_visible), 0)
+
+            # Play a sound for jobs that finished a build
+            if self.sound_pending and not self.playing_sound:
+                status_sound = self.status_to_sound(self.sound_pending.popleft())
+                if sound and status_sound:
+                    self.play_sound_thread_on(os.path.join(self.sound_directory, status_sound))
+
+            # Elapsed time of running builds on screen changes every second
+            running_tick = 0
+            for job_url in job_urls[self.scroll_top:self.scroll_top + job_rows_visible]:
+                if job_rows[job_url]['running']:
+                    running_tick = int(time())
+                    break
+
+            # Skip drawing the frame if nothing shown on it changed
+            sound_notify_msg_box_shown = sound_notify_msg_show or (
+                sound_notify_msg_box_timing and time() - sound_notify_msg_time < self.message_box_temp_duration)
+            if not self.frame_begin(scr, self.quit, self.help, sound, sound_notify_msg_box_shown, self.scroll_top,
+                                    running_tick):
+                keystroke = scr.getch()
+                continue
+
+            ########################################################################################
+
+            # Check terminal size
+            term_height, term_width = scr.getmaxyx()
+            self.check_terminal_size(scr)
+
+            # Paint background
+            mu.paint_background(scr, self.color['normal'])
+
+            ########################################################################################
+
+            # TOP HEADER
+            y_row = 1
+
+            if logger.level < 20:
+                mu.draw_text(scr,
+                             self.frame_debug_text(),
+                             y_row,
+                             center_x=True,
+                             color=self.color['grey-light'],
+                             decor=self.decor['bold'])
+            else:
+                mu.draw_text(scr,
+                             'FOLDER MONITOR',
+                             y_row,
+                             center_x=True,
+                             color=self.color['grey-light'],
+                             decor=self.decor['bold'])
+            if sound:
+                mu.draw_text(scr, '( fx )', 1, term_width - 8, color=self.color['grey-dark'], decor=self.decor['bold'])
+            y_row += 1
+
+            # Draw header divider
+            mu.draw_horizontal_seperator(scr, y_row, self.color['grey-dark'])
+            y_row += 2
+
+            ########################################################################################
+
+            # INFO SECTION
+            x_col = [3, 16]
+            if self.folder_jobs_data:
+                mu.draw_horizontal_header(scr, y_row, x_col[0], term_width - 5, '-', 'INFO',
+                                          self.color['normal'] | self.decor['bold'])
+                y_row += 1
+
+                job_status_counts = self.folder_jobs_data['statusCounts']
+                jobs_queued = sum(1 for job_url in self.queue_data if job_url in job_rows)
+                jobs_summary = (f'{len(job_urls)} total, '
+                                f'{job_status_counts.get(BuildStatus.RUNNING.value, 0)} running, '
+                                f'{job_status_counts.get(BuildStatus.FAILURE.value, 0)} failed, '
+                                f'{jobs_queued} queued')
+                folder_info_items = {
+                    'Folder': self.folder_jobs_data['folderFullName'],
+                    'Server': self.rest.get_server_url(),
+                    'Jobs': jobs_summary,
+                }
+                for key, value in folder_info_items.items():
+                    mu.draw_text(scr, f'{key}:', y_row, x_col[0], decor=self.decor['bold'])
+                    mu.draw_text(scr, mu.truncate_text(f'{value}', term_width - 5 - 12), y_row, x_col[1])
+                    y_row += 1
+                y_row += 1
+            else:
+                y_row += 3
+                mu.draw_text(scr,
+                             'NO DATA',
+                             y_row,
+                             center_x=True,
+                             color=self.color['normal'],
+                             decor=self.decor['bold'])
+                y_row += 2
+                mu.draw_text(scr,
+                             'ಠ_ಠ  ¯\_(⊙︿⊙)_/¯',
+                             y_row,
+                             center_x=True,
+                             color=self.color['normal'],
+                             decor=self.decor['bold'])
+            y_row += 1
+
+            ########################################################################################
+
+            # JOBS SECTION
+            if self.folder_jobs_data and job_urls:
+                # Columns from the right, the job name takes the rest
+                x_queue = term_width - 7
+                x_duration = x_queue - 10
+                x_started = x_duration - 13
+                x_build = x_started - 8
+                x_status = x_build - 11
+                x_col = [3, x_status, x_build, x_started, x_duration, x_queue]
+
+                # Only the job rows fitting on screen are drawn
+                job_rows_visible = max(term_height - 5 - (y_row + 2), 1)
+                self.scroll_top = max(min(self.scroll_top, len(job_urls) - job_rows_visible), 0)
+                scroll_bottom = min(self.scroll_top + job_rows_visible, len(job_urls))
+
+                # Header
+                header = f'JOBS ({self.scroll_top + 1}-{scroll_bottom} of {len(job_urls)})'
+                mu.draw_horizontal_header(scr, y_row, x_col[0], term_width - 5, '-', header,
+                                          self.color['normal'] | self.decor['bold'])
+                y_row += 1
+                for x, column_name in zip(x_col, ['Job', 'Status', 'Build', 'Started', 'Duration', 'Queue']):
+                    mu.draw_text(scr, column_name, y_row, x, color=self.color['grey-light'], decor=self.decor['bold'])
+                y_row += 1
+
+                for job_url in job_urls[self.scroll_top:scroll_bottom]:
+                    job_row = job_rows[job_url]
+
+                    # Running builds show their elapsed time
+                    if job_row['running']:
+                        duration = str(timedelta(seconds=int(time() - job_row['timestamp'] / 1000.0)))
+                    else:
+                        duration = job_row['duration']
+                    queue_position = self.queue_data.get(job_url)
+
+                    mu.draw_text(scr, mu.truncate_text(job_row['name'], x_col[1] - x_col[0] - 1), y_row, x_col[0])
+                    mu.draw_text(scr,
+                                 job_row['statusText'][:10],
+                                 y_row,
+                                 x_col[1],
+                                 color=self.color[job_row['color']],
+                                 decor=self.decor['bold'] if job_row['running'] else None)
+                    mu.draw_text(scr, job_row['build'], y_row, x_col[2])
+                    mu.draw_text(scr, job_row['started'], y_row, x_col[3])
+                    mu.draw_text(scr, duration[:9], y_row, x_col[4])
+                    mu.draw_text(scr, f'Q{queue_position}' if queue_position else '-', y_row, x_col[5])
+                    y_row += 1
+
+            # Divider
+            y_row = term_height - 4
+            mu.draw_horizontal_seperator(scr, y_row, self.color['grey-dark'])
+
+            ########################################################################################
+
+            # SERVER STATUS
+            y_row = term_height - 3
+            if self.server_status_data:
+                auth_status = False if 'auth' not in self.server_status_data else self.server_status_data["auth"]
+                reach_status = False if 'reachable' not in self.server_status_data else self.server_status_data[
+                    "reachable"]
+                line = f'Server Status: Reachable: {reach_status}, Authenticated: {auth_status}'
+            else:
+                line = 'Server Status: NO DATA'
+            mu.draw_text(scr, line, y_row, center_x=True, color=self.color['grey-dark'])
+
+            ########################################################################################
+
+            # User key input instructions
+            y_row = term_height - 2
+            mu.draw_text(scr, 'Press "H" for keyboard shortcuts', y_row, center_x=True, color=self.color['grey-dark'])
+
+            ########################################################################################
+
+            # Drawing the screen border, red if any job failed
+            border_color = 'grey-dark'
+            if self.folder_jobs_data and self.folder_jobs_data['statusCounts'].get(BuildStatus.FAILURE.value):
+                border_color = self.status_to_color(BuildStatus.FAILURE.value)
+            mu.draw_screen_border(scr, self.color[border_color])
+
+            ########################################################################################
+
+            # Indicate server interaction with icon
+            if self.server_interaction:
+                mu.draw_text(scr,
+                             '(R)',
+                             term_height - 2,
+                             term_width - 5,
+                             color=self.color['grey-dark'],
+                             decor=self.decor['bold'])
+            self.server_interaction = False
+
+            ########################################################################################
+
+            # Update but don't write yet, written with the message boxes at the end of the frame
+            scr.noutrefresh()
+
+            ########################################################################################
+
+            halfdelay_normal = False
+
+            # Help message box
+            if self.help:
+                curses.halfdelay(255)
+                message_lines = [
+                    'O - Open folder in web browser', 'P - Pause Monitor', 'Q - Quit Monitor',
+                    'S - Sound notification on/off', 'Up/Down - Scroll jobs', 'PgUp/PgDn - Scroll pages', ' ',
+                    'H - Keyboard shortcuts'
+                ]
+                mu.draw_message_box(scr, message_lines, 'left')
+            else:
+                halfdelay_normal = True
+
+            # Sound effect notification on/off (Toggle)
+            if sound_notify_msg_show:
+                sound_notify_msg_show = False
+                sound_notify_msg_time = time()
+                sound_notify_msg_box_timing = True
+            if sound_notify_msg_box_timing:
+                if time() - sound_notify_msg_time < self.message_box_temp_duration:
+                    state = 'ON' if sound else 'OFF'
+                    mu.draw_message_box(scr, [f'Sound notification {state}'])
+                else:
+                    sound_notify_msg_box_timing = False
+
+            # Pause message box
+            if self.paused:
+                self.help = False
+                curses.halfdelay(255)
+                message_lines = ['Monitor paused', 'Requests stopped', 'To resume press "P"']
+                mu.draw_message_box(scr, message_lines)
+            else:
+                halfdelay_normal = True
+
+            # Quit message box
+            if self.quit:
+                self.help = False
+                curses.halfdelay(255)
+                message_lines = ['Are you sure you want to quit?', 'To quit press "Q"', 'To return press "R"']
+                mu.draw_message_box(scr, message_lines)
+                # Quit Message confirmed (pressed twice)
+                if self.quit > 1:
+                    self.all_threads_off()
+                    return True
+            else:
+                halfdelay_normal = True
+
+            # Screen refresh/updating to normal
+            if halfdelay_normal:
+                curses.halfdelay(self.halfdelay_screen_refresh)
+
+            # Straight exist program
+            if self.exit:
+                self.all_threads_off()
+                sys.exit(0)
+
+            ########################################################################################
+
+            # Write the frame to the terminal
+            self.frame_end()
+
+            # Get User input
+            keystroke = scr.getch()
+
+    def monitor_start(self, folder_url: str, sound: bool = False) -> bool:
+        """
+        Curses wrapper function for drawing main menu on screen
+
+        Args:
+            folder_url: Server URL of the folder
+            sound: If True, monitor is started with sound option on
+
+        Returns:
+            True, if successful, else False
+        """
+        # Disable any console output logging
+        mu.logging_console(enabled=False)
+
+        # Repeated polling of unchanged resources is answered from cache
+        self.rest.cache_enable()
+
+        return curses.wrapper(self.__monitor_draw, folder_url, sound)
+
+    ###########################################################################
+    #                      DATA COLLECTION TASKS
+    ###########################################################################
+
+    def __folder_jobs_poll(self, folder_url: str) -> dict:
+        """
+        Get all jobs of the folder with their last build, run by the monitor scheduler
+
+        Details: Only jobs that differ from the last request are turned into new job rows and
+                 counted again. Unchanged jobs keep their job row object.
+
+        Args:
+            folder_url: Server URL of the folder
+
+        Returns:
+            Folder name, job rows by job URL, and number of jobs by status
+        """
+        self.server_interaction = True
+        folder_info = self.folder.info(folder_url=folder_url, tree=JenkinsItemTree.FOLDER_MONITOR.value)
+
+        job_rows = {}
+        jobs_changed = 0
+        for job in folder_info.get('jobs', []):
+            if job.get('_class') in JenkinsItemClasses.FOLDER.value['class_type']:
+                continue
+            job_row = self.job_rows.get(job['url'])
+            if not job_row or job_row['job'] != job:
+                job_row = self.__job_row_update(job_row, job)
+                jobs_changed += 1
+            job_rows[job['url']] = job_row
+
+        # Jobs removed from the folder
+        for job_url in self.job_rows.keys() - job_rows.keys():
+            self.job_status_counts[self.job_rows[job_url]['status']] -= 1
+            jobs_changed += 1
+
+        logger.debug(f'Folder jobs changed: {jobs_changed} of {len(job_rows)}')
+        self.job_rows = job_rows
+        return {
+            'folderFullName': folder_info.get('fullName', ''),
+            'jobs': job_rows,
+            'statusCounts': +self.job_status_counts
+        }
+
+    def __job_row_update(self, job_row_previous: dict, job: dict) -> dict:
+        """
+        Create the job row of a new or changed job, and update the job status counts
+
+        Args:
+            job_row_previous: Previous job row, None for a new job
+            job: Job information with its last build
+
+        Returns:
+            Job row
+        """
+        last_build = job.get('lastBuild') or {}
+        running = bool(last_build.get('building'))
+        if running:
+            status = BuildStatus.RUNNING.value
+        elif last_build:
+            status = last_build.get('result') or BuildStatus.UNKNOWN.value
+        else:
+            status = Status.NOT_RUN.value[1]
+
+        if job_row_previous:
+            self.job_status_counts[job_row_previous['status']] -= 1
+            # Job finished a build
+            if job_row_previous['running'] and not running:
+                self.sound_pending.append(status)
+        self.job_status_counts[status] += 1
+
+        timestamp = last_build.get('timestamp') or 0
+        return {
+            'job': job,
+            'name': job.get('name', ''),
+            'status': status,
+            'statusText': status.replace('_', ' '),
+            'color': self.status_to_color(status),
+            'running': running,
+            'build': f'#{last_build["number"]}' if last_build.get('number') else '-',
+            'timestamp': timestamp,
+            'started': datetime.fromtimestamp(timestamp / 1000.0).strftime("%m/%d %H:%M") if timestamp else '-',
+            'duration': str(timedelta(seconds=int(last_build.get('duration', 0) / 1000.0))) if last_build else '-',
+        }
+
+    def __queue_poll(self) -> dict:
+        """
+        Get the position of each queued job in the build queue, run by the monitor scheduler
+
+        Args:
+            None
+
+        Returns:
+            Queue position (starting with 1) by job URL
+        """
+        self.server_interaction = True
+        queue_info, _, success = self.rest.request('queue/api/json', 'get', tree=JenkinsItemTree.QUEUE_MONITOR.value)
+        if not success:
+            logger.debug('Failed to get the build queue, keeping the last queue positions')
+            return self.scheduler.data('queue') or {}
+
+        queue_positions = {}
+        queue_items = sorted(queue_info.get('items', []), key=lambda item: item.get('inQueueSince', 0))
+        for queue_position, queue_item in enumerate(queue_items, start=1):
+            job_url = (queue_item.get('task') or {}).get('url')
+            if job_url and job_url not in queue_positions:
+                queue_positions[job_url] = queue_position
+        return queue_positions
@@ -3,11 +3,11 @@
 import curses
 import logging
 import sys
-import threading
 from datetime import datetime
-from time import perf_counter, sleep, time
+from functools import partial
 
 from yojenkins.monitor.monitor import Monitor
+from yojenkins.yo_jenkins.jenkins_item_tree import JenkinsItemTree
 from yojenkins.yo_jenkins.status import BuildStatus
 
 from . import monitor_utility as mu
@@ -39,16 +39,12 @@ class JobMonitor(Monitor):
         self.job = Job
         self.build = Build
 
-        # Job Info Thread
+        # Job Info
         self.job_info_data = {}
-        self.job_info_thread_interval = 0.0
-        self._job_info_thread_lock = threading.Lock()
 
-        # Builds Thread
+        # Builds
         self.builds_data = []
         self.builds_data_number_of_builds = 10
-        self.builds_data_thread_interval = 0.0
-        self._build_data_thread_lock = threading.Lock()
 
         # Building a job flag
         self.job_build = 0
@@ -71,10 +67,9 @@ class JobMonitor(Monitor):
         Returns:
             True if no error, else False
         """
-        # Starting data collection threads
-        self.server_status_thread_on()
-        self.__job_info_thread_on(job_url=job_url)
-        self.__builds_data_thread_on()
+        # Starting data collection
+        self.__data_tasks_add(job_url)
+        self.scheduler.start()
 
         # Setting up basic stuff for curses and load keys
         self.basic_screen_setup(halfdelay=True)
@@ -83,15 +78,10 @@ class JobMonitor(Monitor):
         # User key input (ASCII value)
         keystroke = 0
 
-        # Debug
-        loop_total_time = 0
-
         # Main Loop
         while True:
-            start_time = perf_counter()
-
-            # Clearing the screen at each loop iteration before constructing the frame
-            scr.clear()
+            # Take over any data changed since the last frame
+            self.monitor_data_update()
 
             ########################################################################################
 
@@ -111,6 +101,11 @@ class JobMonitor(Monitor):
                 if job_url:
                     self.job.browser_open(job_url=job_url)
 
+            # Skip drawing the frame if nothing shown on it changed
+            if not self.frame_begin(scr, self.quit, self.job_build, self.help):
+                keystroke = scr.getch()
+                continue
+
             ########################################################################################
 
             # Check terminal size
@@ -126,7 +121,12 @@ class JobMonitor(Monitor):
             y_row = 1
 
             if logger.level < 20:
-                pass
+                mu.draw_text(scr,
+                             self.frame_debug_text(),
+                             y_row,
+                             center_x=True,
+                             color=self.color['grey-light'],
+                             decor=self.decor['bold'])
             else:
                 mu.draw_text(scr,
                              'JOB MONITOR',
@@ -196,20 +196,26 @@ class JobMonitor(Monitor):
                 for i, build in enumerate(self.builds_data):
                     if not build: break
 
+                    # Builds that failed to update keep their last data, greyed out
+                    stale_color = self.color['grey-dark'] if build.get('stale') else None
+
                     # Build name
                     line = build["displayName"] if "displayName" in build else build["number"]
-                    mu.draw_text(scr, f'{build["displayName"]}', y_row, x_col[0])
+                    mu.draw_text(scr, f'{line}', y_row, x_col[0], color=stale_color)
 
                     # Datetime
-                    line = datetime.fromtimestamp(build['timestamp'] / 1000.0).strftime("%m/%d - %H:%M")
-                    mu.draw_text(scr, line, y_row, x_col[1])
+                    if build.get('timestamp'):
+                        line = datetime.fromtimestamp(build['timestamp'] / 1000.0).strftime("%m/%d - %H:%M")
+                    else:
+                        line = '-'
+                    mu.draw_text(scr, line, y_row, x_col[1], color=stale_color)
 
                     # Build Run duration
-                    if build['durationFormatted'] != None:
+                    if build.get('durationFormatted') != None:
                         line = build['durationFormatted']
                     else:
-                        line = build['elapsedFormatted']
-                    mu.draw_text(scr, line, y_row, x_col[2])
+                        line = build.get('elapsedFormatted') or '-'
+                    mu.draw_text(scr, line, y_row, x_col[2], color=stale_color)
 
                     # Build Status
                     if 'resultText' in build and build['resultText'] != None:
@@ -217,7 +223,7 @@ class JobMonitor(Monitor):
                     else:
                         line = BuildStatus.UNKNOWN.value
                     status_color = self.status_to_color(line)
-                    mu.draw_text(scr, line, y_row, x_col[3], color=self.color[status_color])
+                    mu.draw_text(scr, line, y_row, x_col[3], color=stale_color or self.color[status_color])
 
                     # Return down
                     y_row += 1
@@ -268,8 +274,8 @@ class JobMonitor(Monitor):
 
             ########################################################################################
 
-            # Refresh the screen (scr.nourefresh + scr.doupdate)
-            scr.refresh()
+            # Update but don't write yet, written with the message boxes at the end of the frame
+            scr.noutrefresh()
 
             ########################################################################################
 
@@ -307,6 +313,7 @@ class JobMonitor(Monitor):
                     if job_url:
                         self.server_interaction = True
                         self.job.build_trigger(job_url=job_url)
+                        self.scheduler.refresh()
                     else:
                         pass
                     self.job_build = 0
@@ -321,7 +328,7 @@ class JobMonitor(Monitor):
                 mu.draw_message_box(scr, message_lines)
                 # Quit Message confirmed (pressed twice)
                 if self.quit > 1:
-                    self.all_threads_enabled = False
+                    self.all_threads_off()
                     return True
             else:
                 halfdelay_normal = True
@@ -332,12 +339,13 @@ class JobMonitor(Monitor):
 
             # Straight exist program
             if self.exit:
-                self.all_threads_enabled = False
+                self.all_threads_off()
                 sys.exit(0)
 
             ########################################################################################
 
-            loop_total_time = perf_counter() - start_time
+            # Write the frame to the terminal
+            self.frame_end()
 
             # Get User input
             keystroke = scr.getch()
@@ -356,168 +364,139 @@ class JobMonitor(Monitor):
         # Disable any console output logging
         mu.logging_console(enabled=False)
 
-        return curses.wrapper(self.__monitor_draw, job_url, sound)
+        # Repeated polling of unchanged resources is answered from cache
+        self.rest.cache_enable()
 
-    ###########################################################################
-    #                      DATA COLLECTION THREADS
-    ###########################################################################
+        # Finished builds do not change, they are only requested once
+        self.build.cache_enable()
 
-    #############################  JOB INFO  ##################################
+        return curses.wrapper(self.__monitor_draw, job_url, sound)
 
-    def __thread_job_info(self, job_url: str, monitor_interval: float) -> None:
+    def monitor_headless(self, job_url: str, output_file: str = '') -> bool:
         """
-        Independent thread which polls job information
+        Monitor the job without UI, writing new build and build status change events as JSON lines
 
         Args:
             job_url: Server URL of the job
-            monitor_interval: Seconds between polling job URL
+            output_file: Path to the file to append the events to. Default standard out
 
         Returns:
-            None
+            True, if successful, else False
         """
-        logger.debug(
-            f'Thread starting - Job info - (ID: {threading.get_ident()} - Refresh Interval: {monitor_interval}s) ...')
-
-        # Set the monitoring thread flag up
-        self.all_threads_enabled = True
-        self.job_info_thread_interval = monitor_interval
-
-        # Loop until flags disable it
-        while self.all_threads_enabled:
-            if not self.paused:
-                self.server_interaction = True
-                with self._job_info_thread_lock:
-                    self.job_info_data = self.job.info(job_url=job_url)
-
-            # Wait some time before checking again
-            start_time = time()
-            while time() - start_time <= monitor_interval:
-                sleep(0.100)
-                if not self.all_threads_enabled:
-                    break
-
-        logger.debug(f'Thread stopped - Job info - (ID: {threading.get_ident()})')
-
-    def __job_info_thread_on(self, job_url: str = '', monitor_interval: float = 5.0) -> bool:
+        # Disable any console output logging
+        mu.logging_console(enabled=False)
+
+        # Repeated polling of unchanged resources is answered from cache
+        self.rest.cache_enable()
+
+        # Finished builds do not change, they are only requested once
+        self.build.cache_enable()
+
+        self.__data_tasks_add(job_url)
+        return self.headless_run(self.__headless_events, output_file)
+
+    ###########################################################################
+    #                      HEADLESS EVENTS
+    ###########################################################################
+
+    def __headless_events(self) -> list:
         """
-        Trigger to start independent thread that polls job information
+        Get the server, new build, and build status change events of the latest data
+
+        Details: Builds listed at the start are reported with their status, builds
+                 showing up later are reported as new builds
 
         Args:
-            job_url: Server URL of the job
-            monitor_interval: Seconds between polling build URL
+            None
 
         Returns:
-            True if successful, else False
+            List of events
         """
-        logger.debug(f'Starting thread for job info for "{job_url}" ...')
-        try:
-            threading.Thread(target=self.__thread_job_info, args=(
-                job_url,
-                monitor_interval,
-            ), daemon=False).start()
-        except Exception as error:
-            logger.error(
-                f'Failed to start job info monitoring thread for {job_url}. Exception: {error}. Type: {type(error)}')
-
-        return True
+        events = []
+        self.headless_events_server(events)
+        builds_reported = any(key.startswith('build:') for key in self.headless_snapshots)
+        for build in self.builds_data or []:
+            if not build or build.get('stale'):
+                continue
+            build_key = f'build:{build["url"]}'
+            event = 'new_build' if builds_reported and build_key not in self.headless_snapshots else 'build_status'
+            self.headless_event(
+                events, build_key, event, {
+                    'job': self.job_info_data.get('url') if self.job_info_data else None,
+                    'url': build['url'],
+                    'number': build.get('number'),
+                    'status': build.get('resultText'),
+                    'building': build.get('building'),
+                })
+        return events
 
-    ############################  BUILDS INFO  ################################
+    ###########################################################################
+    #                      DATA COLLECTION TASKS
+    ###########################################################################
 
-    def __thread_build_info(self, build_url: str, build_data_index: int) -> None:
+    def __data_tasks_add(self, job_url: str) -> None:
         """
-        Independent thread which fetches build information
+        Add the data collection tasks of the job to the monitor scheduler
+
+        Details: The builds data task uses the job information of the job info task
 
         Args:
-            build_url: Server URL of the build
-            build_data_index: Build index within the job info return
+            job_url: Server URL of the job
 
         Returns:
             None
         """
-        logger.debug(f'Thread starting - Build info (INDEX: {build_data_index}, ID: {threading.get_ident()}) ...')
-        self.server_interaction = True
-        self.builds_data[build_data_index] = self.build.info(build_url=build_url)
-        logger.debug(f'Thread stopped - Build info (INDEX: {build_data_index}, ID: {threading.get_ident()})')
+        self.server_status_task_add()
+        self.scheduler.task_add('job_info', partial(self.__job_info_poll, job_url), 5.0)
+        self.scheduler.task_add('builds', self.__builds_data_poll, 7.0)
 
-    def __thread_builds_data(self, monitor_interval: float) -> None:
+    def __job_info_poll(self, job_url: str) -> dict:
         """
-        Independent thread which polls the build data for each build listed in job
+        Get the job information with the displayed builds, run by the monitor scheduler
 
         Args:
-            monitor_interval: Seconds between polling build URL
+            job_url: Server URL of the job
 
         Returns:
-            None
+            Job information
         """
-        logger.debug(
-            f'Thread starting - Builds data - (ID: {threading.get_ident()} - Refresh Interval: {monitor_interval}s) ...'
-        )
-
-        # Set the monitoring thread flag up
-        self.all_threads_enabled = True
-        self.builds_data_thread_interval = monitor_interval
-
-        # Pre-allocate
-        self.builds_data = [None] * self.builds_data_number_of_builds
-
-        # Wait for initial batch of job info data
-        while not self.job_info_data:
-            if not self.all_threads_enabled:
-                break
-            sleep(0.100)
-
-        # Loop until flags disable it
-        while self.all_threads_enabled:
-            if not self.paused:
-                if 'builds' in self.job_info_data:
-                    # Get and store the data in each thread
-                    threads = []
-                    try:
-                        for build_data_index, build in enumerate(
-                                self.job_info_data['builds'][:self.builds_data_number_of_builds]):
-                            # build_data_index += 1
-                            thread = threading.Thread(target=self.__thread_build_info,
-                                                      args=(
-                                                          build['url'],
-                                                          build_data_index,
-                                                      ),
-                                                      daemon=False)
-                            thread.start()
-                            threads.append(thread)
-                    except Exception as error:
-                        logger.debug(f'Failure occurred when starting build data threads. Exception: {error}')
-
-                    try:
-                        for thread in threads:
-                            thread.join()
-                    except Exception as error:
-                        logger.debug(f'Failure occurred when ending build data threads. Exception: {error}')
-                else:
-                    logger.debug('No job info data. Waiting ...')
-
-            # Wait some time before checking again
-            start_time = time()
-            while time() - start_time <= monitor_interval:
-                sleep(0.100)
-                if not self.all_threads_enabled:
-                    break
-
-        logger.debug(f'Thread stopped - Builds data - (ID: {threading.get_ident()})')
-
-    def __builds_data_thread_on(self, monitor_interval: float = 7.0) -> bool:
+        self.server_interaction = True
+        job_info_tree = f'{JenkinsItemTree.JOB_MONITOR.value}{{0,{self.builds_data_number_of_builds}}}'
+        return self.job.info(job_url=job_url, tree=job_info_tree)
+
+    def __builds_data_poll(self) -> list:
         """
-        Trigger to start independent thread that polls build information within job
+        Get the build information of each build listed in the job information, run by the monitor scheduler
+
+        Details: Builds are requested on the bounded worker pool of the monitor. A build that fails
+                 to be requested keeps its last data, marked as stale.
 
         Args:
-            monitor_interval: Seconds between polling build data
+            None
 
         Returns:
-            True if successful, else False
+            List of build information, None for builds not listed
         """
-        logger.debug('Starting thread for job builds info ...')
-        try:
-            threading.Thread(target=self.__thread_builds_data, args=(monitor_interval, ), daemon=False).start()
-        except Exception as error:
-            logger.error(f'Failed to start job builds info monitoring thread. Exception: {error}. Type: {type(error)}')
+        builds_data = [None] * self.builds_data_number_of_builds
+        job_info_data = self.scheduler.data('job_info')
+        if not job_info_data or 'builds' not in job_info_data:
+            logger.debug('No job info data. Waiting ...')
+            return builds_data
 
-        return True
+        self.server_interaction = True
+        builds = job_info_data['builds'][:self.builds_data_number_of_builds]
+        builds_data_previous = {build['url']: build for build in self.scheduler.data('builds') or [] if build}
+        results = self.executor_map(partial(self.build.info, tree=JenkinsItemTree.BUILD_MONITOR.value),
+                                    [build['url'] for build in builds])
+        for build_data_index, (build, (success, build_info)) in enumerate(zip(builds, results)):
+            if success and build_info:
+                builds_data[build_data_index] = build_info
+                continue
+            build_info = builds_data_previous.get(build['url']) or {
+                'url': build['url'],
+                'number': build.get('number'),
+                'displayName': f'#{build.get("number")}'
+            }
+            builds_data[build_data_index] = {**build_info, 'stale': True}
+
+        return builds_data
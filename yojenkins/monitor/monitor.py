@@ -1,11 +1,16 @@
 """Monitor parent class"""
 
 import curses
+import json
 import logging
+import math
 import platform
 import sys
 import threading
-from time import sleep, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from time import monotonic, perf_counter, sleep
+from typing import Any, Callable, Dict, List, Tuple
 
 if platform.system() != "Windows":
     try:
@@ -18,10 +23,17 @@ else:
 from yojenkins.yo_jenkins.status import Color, Sound, Status
 
 from . import monitor_utility as mu
+from .monitor_scheduler import MonitorScheduler
 
 # Getting the logger reference
 logger = logging.getLogger()
 
+# Largest number of data requests a monitor makes at the same time
+MONITOR_EXECUTOR_MAX_WORKERS = 5
+
+# Seconds a single data request of a monitor may take before its data is treated as stale
+MONITOR_TASK_TIMEOUT = 15.0
+
 
 class Monitor:
     """Parent class for all monitor objects"""
@@ -56,15 +68,42 @@ class Monitor:
         self.help = False
 
         self.server_status_data = {}
-        self.server_status_thread_interval = 0.0
+
+        # Last snapshot of each item reported in headless mode, events are only written on change
+        self.headless_snapshots = {}
+
+        # Frames are only drawn when anything shown on them changed
+        self.data_version = 0
+        self.frame_state = None
+        self.frame_start_time = 0.0
+        self.frame_time = 0.0
+        self.frames_drawn = 0
+        self.frames_skipped = 0
 
         self.playing_sound = False
 
+        # All data polling is done by one scheduler thread
+        self.scheduler = MonitorScheduler()
+
+        # Bounded worker pool for concurrent data requests, started on first use
+        self.executor = None
+        self.executor_max_workers = MONITOR_EXECUTOR_MAX_WORKERS
+        self.executor_futures = set()
+
         self.all_threads_enabled = True
         self.paused = False
 
         self.server_interaction = False
 
+    @property
+    def paused(self) -> bool:
+        """True if the monitor stopped all server requests until resumed"""
+        return self.scheduler.paused
+
+    @paused.setter
+    def paused(self, paused: bool) -> None:
+        self.scheduler.paused = paused
+
     def __del__(self):
         """Object destructor. Called at object end of life"""
         # Just in case turn off all threads
@@ -100,6 +139,56 @@ class Monitor:
         else:
             curses.halfdelay(255)
 
+    def frame_begin(self, scr, *frame_state: Any) -> bool:
+        """Start a new frame, if anything shown on it changed since the last drawn frame
+
+        Details: Curses keeps the last frame written to the terminal. The screen is erased, not
+                 cleared, before drawing the new frame, so that on `frame_end()` curses compares the
+                 two and only writes the cells that changed. A frame is skipped if the data version,
+                 terminal size, server interaction, pause, and the passed state match the last frame.
+
+        Args:
+            scr         : Handle for curses terminal screen handle
+            frame_state : Any other monitor state shown on the frame (ie. message boxes, options)
+
+        Returns:
+            True if the frame is to be drawn, else False
+        """
+        frame_state = (self.data_version, scr.getmaxyx(), self.server_interaction, self.paused, *frame_state)
+        if frame_state == self.frame_state:
+            self.frames_skipped += 1
+            return False
+
+        self.frame_state = frame_state
+        self.frame_start_time = perf_counter()
+        scr.erase()
+        return True
+
+    def frame_end(self) -> None:
+        """Write the changed cells of the drawn frame to the terminal
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        curses.doupdate()
+        self.frames_drawn += 1
+        self.frame_time = perf_counter() - self.frame_start_time
+
+    def frame_debug_text(self) -> str:
+        """Get the frame rendering statistics shown in debug mode
+
+        Args:
+            None
+
+        Returns:
+            Text with the time of the last drawn frame, and the number of drawn and skipped frames
+        """
+        return (f'[Frame: {self.frame_time * 1000:.1f} ms, '
+                f'Drawn: {self.frames_drawn}, Skipped: {self.frames_skipped}]')
+
     def check_terminal_size(self, scr) -> None:
         """
         Checking if current terminal size is sufficient, if it is not, display warning.
@@ -124,7 +213,7 @@ class Monitor:
         ui_keys = mu.load_keys()
         while not self.terminal_size_good:
             if k in ui_keys['QUIT']:
-                self.all_threads_enabled = False
+                self.all_threads_off()
                 sys.exit(0)
 
             # Re-evaluate the screen size
@@ -144,7 +233,7 @@ class Monitor:
                 logger.debug(
                     f'Failed to render window. Window size way too small. Needed : W:{self.width_limit} x H:{self.height_limit}'
                 )
-                self.all_threads_enabled = False
+                self.all_threads_off()
                 sys.exit(1)
 
             scr.refresh()
@@ -246,8 +335,23 @@ class Monitor:
     #                         SERVER STATUS
     ###########################################################################
 
-    def __thread_server_status(self, monitor_interval: float) -> None:
-        """Independent thread that checks the Jenkins server status every time interval
+    def server_status_poll(self) -> dict:
+        """Check the Jenkins server status, run by the monitor scheduler
+
+        Details: Authentication is checked the same way as `Auth.verify()`, but a failure is
+                 reported in the status instead of being written to the console
+
+        Args:
+            None
+
+        Returns:
+            Server status with `reachable` and `auth` keys
+        """
+        self.server_interaction = True
+        return {'reachable': self.rest.is_reachable(), 'auth': self.rest.request('me/api/json', 'head')[2]}
+
+    def server_status_task_add(self, monitor_interval: float = 10.0) -> None:
+        """Add the server status check to the monitor scheduler
 
         Args:
             monitor_interval: Number of seconds between server status checks
@@ -255,47 +359,177 @@ class Monitor:
         Returns:
             None
         """
-        logger.debug(
-            f'Thread starting - Server Status - (ID: {threading.get_ident()} - Refresh Interval: {monitor_interval}s) ...'
-        )
+        self.scheduler.task_add('server_status', self.server_status_poll, monitor_interval)
 
-        # Set the monitoring thread flag up
-        self.all_threads_enabled = True
-        self.server_status_thread_interval = monitor_interval
-
-        # Loop until flags disable it
-        while self.all_threads_enabled:
-            if not self.paused:
-                # Get the build information
-                self.server_interaction = True
-                self.server_status_data['reachable'] = self.rest.is_reachable()
-                self.server_status_data['auth'] = self.auth.verify()
-
-            # Wait some time before checking again
-            start_time = time()
-            while time() - start_time <= monitor_interval:
-                sleep(0.1)
-                if not self.all_threads_enabled:
-                    break
+    ###########################################################################
+    #                         MONITOR DATA
+    ###########################################################################
 
-        logger.debug(f'Thread stopped - Server Status - (ID: {threading.get_ident()})')
+    def executor_map(self,
+                     function: Callable[[Any], Any],
+                     arguments: List[Any],
+                     timeout: float = MONITOR_TASK_TIMEOUT) -> List[Tuple[bool, Any]]:
+        """Call a function for each argument on the bounded worker pool of the monitor
 
-    def server_status_thread_on(self, monitor_interval: float = 10.0) -> bool:
-        """Start the independent thread to monitor the server status
+        Details: At most `executor_max_workers` calls run at the same time, on pool threads that are
+                 reused across calls. A call that raises (including `SystemExit` from `fail_out`) or
+                 runs longer than `timeout` seconds only fails its own result. Calls still waiting
+                 for a worker are cancelled when the monitor stops.
 
         Args:
-            monitor_interval: Number of seconds between server status checks
+            function  : Function called with one argument
+            arguments : Arguments, one per call
+            timeout   : Seconds a single call may run
+
+        Returns:
+            Tuple of success and return value (None if failed) of each call, in argument order
+        """
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=self.executor_max_workers)
+        start_times = {}
+
+        def timed_call(index: int, argument: Any) -> Any:
+            start_times[index] = monotonic()
+            return function(argument)
+
+        results = [(False, None)] * len(arguments)
+        pending = {
+            self.executor.submit(timed_call, index, argument): index
+            for index, argument in enumerate(arguments)
+        }
+        futures = list(pending)
+        self.executor_futures.update(futures)
+
+        # Calls waiting for a worker time out once all calls before them could have timed out
+        batch_deadline = monotonic() + timeout * math.ceil(len(arguments) / self.executor_max_workers)
+        while pending and self.all_threads_enabled:
+            now = monotonic()
+            deadline = min([start_times.get(index, now) + timeout for index in pending.values()] + [batch_deadline])
+            done, _ = wait(pending, timeout=min(max(deadline - now, 0), 1.0), return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    results[index] = (True, future.result())
+                except (Exception, SystemExit) as error:
+                    logger.debug(f'Monitor request failed for "{arguments[index]}". Exception: {error}')
+
+            now = monotonic()
+            for future, index in list(pending.items()):
+                if now >= batch_deadline or now >= start_times.get(index, now) + timeout:
+                    logger.debug(f'Monitor request timed out for "{arguments[index]}"')
+                    future.cancel()
+                    pending.pop(future)
+
+        for future in pending:
+            future.cancel()
+        self.executor_futures.difference_update(futures)
+        return results
+
+    def monitor_data_update(self, timeout: float = 0.0) -> bool:
+        """Take over all data changes of the monitor scheduler
+
+        Details: The data of each scheduler task is stored in the `<task name>_data` attribute
+
+        Args:
+            timeout: Seconds to wait for a first data change. Default not waiting
+
+        Returns:
+            True if any data changed, else False
+        """
+        changes = self.scheduler.changes_get(timeout=timeout)
+        for name, data in changes.items():
+            setattr(self, f'{name}_data', data)
+        if changes:
+            self.data_version += 1
+        return bool(changes)
+
+    ###########################################################################
+    #                         HEADLESS MODE
+    ###########################################################################
+
+    def headless_event(self, events: List[Dict], key: str, event: str, snapshot: Dict) -> None:
+        """Add an event for an item, if its snapshot changed since the last event for it
+
+        Args:
+            events   : List of events to add the event to
+            key      : Unique key of the reported item (ie. `build:<build url>`)
+            event    : Name of the event (ie. `build_status`)
+            snapshot : Current state of the item, only holding fields whose change is an event
+
+        Returns:
+            None
+        """
+        if self.headless_snapshots.get(key) == snapshot:
+            return
+        self.headless_snapshots[key] = snapshot
+        now = datetime.now()
+        events.append({
+            'event': event,
+            'timestamp': now.timestamp(),
+            'datetime': now.isoformat(timespec='seconds'),
+            **snapshot
+        })
+
+    def headless_events_server(self, events: List[Dict]) -> None:
+        """Add the server status event, if the server status changed
+
+        Args:
+            events : List of events to add the event to
+
+        Returns:
+            None
+        """
+        if self.server_status_data:
+            self.headless_event(
+                events, 'server', 'server_status', {
+                    'reachable': self.server_status_data.get('reachable', False),
+                    'auth': self.server_status_data.get('auth', False)
+                })
+
+    def headless_run(self,
+                     events_function: Callable[[], List[Dict]],
+                     output_file: str = '',
+                     finished_function: Callable[[], bool] = None) -> bool:
+        """Run the monitor data collection without UI, writing change events as JSON lines
+
+        Details: The same scheduler tasks as for the UI collect the data. After each data change
+                 the new events are written, one JSON object per line. Runs until interrupted, or
+                 until the monitored item is finished.
+
+        Args:
+            events_function   : Function returning the events of the latest data
+            output_file       : Path to the file to append the events to. Default standard out
+            finished_function : Function returning True once nothing can change anymore
 
         Returns:
             True if successful, else False
         """
-        logger.debug(f'Starting thread for server status ...')
         try:
-            threading.Thread(target=self.__thread_server_status, args=(monitor_interval, ), daemon=False).start()
-        except Exception as error:
-            logger.error(f'Failed to start server status monitoring thread. Exception: {error}. Type: {type(error)}')
+            output = open(output_file, 'a', encoding='utf-8') if output_file else sys.stdout
+        except OSError as error:
+            logger.error(f'Failed to open monitor event output file "{output_file}". Exception: {error}')
             return False
 
+        logger.debug(f'Starting headless monitor, writing events to: {output_file or "standard out"}')
+        self.scheduler.start()
+        try:
+            while self.all_threads_enabled:
+                if not self.monitor_data_update(timeout=1.0):
+                    continue
+                finished = finished_function() if finished_function else False
+                for event in events_function():
+                    output.write(json.dumps(event) + '\n')
+                output.flush()
+                if finished:
+                    logger.debug('Monitored item finished, stopping headless monitor')
+                    break
+        except KeyboardInterrupt:
+            logger.debug('Headless monitor interrupted')
+        finally:
+            self.all_threads_off()
+            if output_file:
+                output.close()
+
         return True
 
     ###########################################################################
@@ -315,6 +549,13 @@ class Monitor:
 
         # Set the monitoring thread flag down
         self.all_threads_enabled = False
+        self.scheduler.stop()
+
+        # Cancel the data requests waiting for a worker, running ones finish on their own
+        for future in list(self.executor_futures):
+            future.cancel()
+        if self.executor:
+            self.executor.shutdown(wait=False)
 
         return True
 
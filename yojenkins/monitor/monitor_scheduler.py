@@ -0,0 +1,274 @@
+"""Monitor scheduler class definition"""
+
+import logging
+import queue
+import threading
+from time import monotonic
+from typing import Any, Callable, Dict
+
+# Getting the logger reference
+logger = logging.getLogger()
+
+
+class MonitorScheduler:
+    """Single background thread running all polling tasks of a monitor
+
+    Details: Each task is a function returning the latest data of one monitor section. When a task
+             is due, all tasks due within `merge_ratio` of their own interval are run with it, in the
+             order they were added, so that their requests are made together in one wake-up.
+             While the data of a task does not change, its interval grows by `backoff` up to its
+             maximum interval, and drops back to the base interval on the first change. Changed data
+             is put on the `changes` queue for the UI. Stopping, pausing, resuming, and refreshing wake
+             the scheduler thread right away.
+    """
+
+    def __init__(self, merge_ratio: float = 0.25, backoff: float = 1.5) -> None:
+        """Object constructor method, called at object creation
+
+        Args:
+            merge_ratio  : Part of its interval a task is run early to join other due tasks
+            backoff      : Factor the interval of a task grows by when its data did not change
+
+        Returns:
+            None
+        """
+        self.merge_ratio = merge_ratio
+        self.backoff = max(backoff, 1.0)
+
+        self.tasks = {}
+        self.changes = queue.Queue()
+
+        self._tasks_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._paused = threading.Event()
+        self._thread = None
+
+    ###########################################################################
+    #                              TASKS
+    ###########################################################################
+
+    def task_add(self, name: str, function: Callable[[], Any], interval: float, interval_max: float = 0.0) -> None:
+        """Add a polling task, first run as soon as possible
+
+        Args:
+            name         : Name of the task, used for its data changes
+            function     : Function without arguments returning the latest data
+            interval     : Seconds between runs while the data changes
+            interval_max : Longest seconds between runs while the data does not change. Default 4 intervals
+
+        Returns:
+            None
+        """
+        logger.debug(f'Adding monitor task "{name}" (Interval: {interval}s) ...')
+        with self._tasks_lock:
+            self.tasks[name] = {
+                'function': function,
+                'interval': interval,
+                'interval_max': max(interval_max or interval * 4, interval),
+                'interval_current': interval,
+                'due': monotonic(),
+                'data': None,
+                'runs': 0,
+            }
+        self._wakeup.set()
+
+    def task_remove(self, name: str) -> None:
+        """Remove a polling task
+
+        Args:
+            name : Name of the task
+
+        Returns:
+            None
+        """
+        logger.debug(f'Removing monitor task "{name}" ...')
+        with self._tasks_lock:
+            self.tasks.pop(name, None)
+
+    def interval(self, name: str) -> float:
+        """Get the current interval of a task
+
+        Args:
+            name : Name of the task
+
+        Returns:
+            Seconds until the next run of the task after a run, 0 if there is no such task
+        """
+        task = self.tasks.get(name)
+        return round(task['interval_current'], 1) if task else 0.0
+
+    def data(self, name: str) -> Any:
+        """Get the latest data of a task
+
+        Args:
+            name : Name of the task
+
+        Returns:
+            Latest data returned by the task, None if it did not run yet
+        """
+        task = self.tasks.get(name)
+        return task['data'] if task else None
+
+    def refresh(self, name: str = '') -> None:
+        """Run tasks right away, resetting their interval
+
+        Args:
+            name : Name of the task. Default all tasks
+
+        Returns:
+            None
+        """
+        with self._tasks_lock:
+            for task_name, task in self.tasks.items():
+                if not name or task_name == name:
+                    task['due'] = monotonic()
+                    task['interval_current'] = task['interval']
+        self._wakeup.set()
+
+    def changes_get(self, timeout: float = 0.0) -> Dict[str, Any]:
+        """Get all data changes since the last call
+
+        Args:
+            timeout : Seconds to wait for a first change. Default not waiting
+
+        Returns:
+            Latest changed data of each task that changed
+        """
+        changes = {}
+        if timeout:
+            try:
+                name, data = self.changes.get(timeout=timeout)
+                changes[name] = data
+            except queue.Empty:
+                return changes
+        while True:
+            try:
+                name, data = self.changes.get_nowait()
+            except queue.Empty:
+                return changes
+            changes[name] = data
+
+    ###########################################################################
+    #                              CONTROL
+    ###########################################################################
+
+    def start(self) -> bool:
+        """Start the scheduler thread
+
+        Args:
+            None
+
+        Returns:
+            True if successful, else False
+        """
+        if self._thread and self._thread.is_alive():
+            return True
+        logger.debug('Starting monitor scheduler thread ...')
+        self._stopped.clear()
+        try:
+            self._thread = threading.Thread(target=self.__thread_schedule, daemon=True)
+            self._thread.start()
+        except Exception as error:
+            logger.error(f'Failed to start monitor scheduler thread. Exception: {error}. Type: {type(error)}')
+            return False
+        return True
+
+    def stop(self) -> None:
+        """Stop the scheduler thread, not waiting for a running task to finish
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self._stopped.set()
+        self._wakeup.set()
+
+    @property
+    def paused(self) -> bool:
+        """True if no tasks are run until resumed"""
+        return self._paused.is_set()
+
+    @paused.setter
+    def paused(self, paused: bool) -> None:
+        if paused:
+            self._paused.set()
+        else:
+            self._paused.clear()
+        self._wakeup.set()
+
+    ###########################################################################
+    #                              SCHEDULER
+    ###########################################################################
+
+    def __thread_schedule(self) -> None:
+        """Scheduler thread running the tasks when they are due
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        logger.debug(f'Thread starting - Monitor scheduler - (ID: {threading.get_ident()}) ...')
+        while True:
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            if self._paused.is_set():
+                self._wakeup.wait()
+                continue
+
+            with self._tasks_lock:
+                due_times = [task['due'] for task in self.tasks.values()]
+            if not due_times:
+                self._wakeup.wait()
+                continue
+
+            # Sleep until the next task is due, or until woken up
+            wait_time = min(due_times) - monotonic()
+            if wait_time > 0:
+                self._wakeup.wait(wait_time)
+                continue
+
+            # Run everything due now or soon together
+            with self._tasks_lock:
+                batch = [(name, task) for name, task in self.tasks.items()
+                         if task['due'] - monotonic() <= task['interval_current'] * self.merge_ratio]
+            logger.debug(f'Running monitor tasks: {", ".join(name for name, _ in batch)}')
+            for name, task in batch:
+                if self._stopped.is_set() or self._paused.is_set():
+                    break
+                self.__task_run(name, task)
+
+        logger.debug(f'Thread stopped - Monitor scheduler - (ID: {threading.get_ident()})')
+
+    def __task_run(self, name: str, task: Dict) -> None:
+        """Run one task, publish its data if it changed, and schedule its next run
+
+        Args:
+            name : Name of the task
+            task : Task to run
+
+        Returns:
+            None
+        """
+        try:
+            data = task['function']()
+            success = True
+        except (Exception, SystemExit) as error:
+            logger.debug(f'Monitor task "{name}" failed, keeping its last data. Exception: {error}')
+            data, success = task['data'], False
+
+        changed = success and (data != task['data'] or not task['runs'])
+        task['runs'] += 1
+        if changed:
+            task['data'] = data
+            task['interval_current'] = task['interval']
+            if not self._stopped.is_set():
+                self.changes.put((name, data))
+        else:
+            task['interval_current'] = min(task['interval_current'] * self.backoff, task['interval_max'])
+        task['due'] = monotonic() + task['interval_current']
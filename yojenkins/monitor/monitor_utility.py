@@ -139,11 +139,15 @@ def load_keys() -> dict:
         "ABORT": (ord('a'), ord('A')),
         "BUILD": (ord('b'), ord('B')),
         "DOWN": (curses.KEY_DOWN, ord('j')),
+        "END": (curses.KEY_END, ord('G')),
         "ENTER": (curses.KEY_ENTER, ord('\n'), ord('\r')),
         "HELP": (ord('h'), ord('H')),
+        "HOME": (curses.KEY_HOME, ord('g')),
         "LEFT": (curses.KEY_LEFT, ord('h')),
         "LOGS": (ord('l'), ord('L')),
         "OPEN": (ord('o'), ord('O')),
+        "PAGE_DOWN": (curses.KEY_NPAGE, ),
+        "PAGE_UP": (curses.KEY_PPAGE, ),
         "PAUSE": (ord('p'), ord('P')),
         "QUIT": (27, ord('q'), ord('Q')),
         "RESUME": (ord('r'), ord('R')),
@@ -384,8 +388,8 @@ def draw_message_box(scr, message_lines: list, justify: str = 'center') -> None:
         y = l + 2
         message_box.addstr(y, x, line)
 
-    # Refresh the message box
-    message_box.refresh()
+    # Update but don't write yet, written with the rest of the frame
+    message_box.noutrefresh()
 
 
 def draw_text(scr,
@@ -412,11 +416,9 @@ def draw_text(scr,
     Returns:
         None
     """
-    # Set to default color and decor if not passed
-    if not color or not decor:
-        color_preset, decor_preset = load_curses_colors_decor()
-    color = color_preset['normal'] if not color else color
-    decor = decor_preset['normal'] if not decor else decor
+    # Set to default color and decor if not passed ("normal" is the first color pair)
+    color = curses.color_pair(1) if not color else color
+    decor = curses.A_NORMAL if not decor else decor
 
     # Check for NoneType
     if text == None:
@@ -431,9 +433,6 @@ def draw_text(scr,
     # Draw
     scr.addstr(y, x, text, color | decor)
 
-    # Update but don't write yet
-    scr.noutrefresh()
-
 
 def paint_background(scr, color: int = 0) -> None:
     """
@@ -452,6 +451,3 @@ def paint_background(scr, color: int = 0) -> None:
     for start_y in range(1, term_height - 1):
         line = term_width * ' '
         scr.addstr(start_y, 1, line, color)
-
-    # Update but don't write yet
-    scr.noutrefresh()
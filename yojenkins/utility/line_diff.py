@@ -0,0 +1,319 @@
+"""Line diff of large texts."""
+
+import difflib
+import logging
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+from typing import Generator, Iterable, List, Sequence, Tuple, Union
+
+logger = logging.getLogger()
+
+# Number of lines of each text diffed at once when streaming
+DIFF_WINDOW_LINES = 100000
+
+# Largest edit distance searched for in a range without common unique lines, before giving up on it
+DIFF_MAX_COST = 2000
+
+# Similarity of two changed lines from which on a diff guide is shown (Same as `difflib.ndiff`)
+DIFF_GUIDE_RATIO = 0.75
+
+
+def line_ids(lines_1: Sequence[str], lines_2: Sequence[str]) -> Tuple[List[int], List[int]]:
+    """Replace each line by an integer ID, equal lines getting equal IDs.
+
+    Details: All further comparison is between integers instead of strings
+
+    Args:
+        lines_1: Lines of text 1
+        lines_2: Lines of text 2
+
+    Returns:
+        Line IDs of text 1 and text 2
+    """
+    ids = {}
+    ids_1 = [ids.setdefault(line, len(ids)) for line in lines_1]
+    ids_2 = [ids.setdefault(line, len(ids)) for line in lines_2]
+    return ids_1, ids_2
+
+
+def _middle_snake(ids_1: List[int], ids_2: List[int], lo_1: int, hi_1: int, lo_2: int, hi_2: int,
+                  max_cost: int) -> Union[Tuple[int, int], None]:
+    """Find where the shortest edit path of two ranges crosses its middle (Myers, linear space).
+
+    Details: The edit path is searched from the start and from the end of the ranges at the same
+             time, keeping only one row of furthest reaching points per direction.
+
+    Args:
+        ids_1:    Line IDs of text 1
+        ids_2:    Line IDs of text 2
+        lo_1:     Start of the range in text 1
+        hi_1:     End of the range in text 1
+        lo_2:     Start of the range in text 2
+        hi_2:     End of the range in text 2
+        max_cost: Largest edit distance searched for
+
+    Returns:
+        Split point (line count into range 1, line count into range 2), None if not found
+    """
+    length_1, length_2 = hi_1 - lo_1, hi_2 - lo_2
+    max_d = (length_1 + length_2 + 1) // 2
+    v_offset, v_length = max_d, 2 * max_d + 2
+    v_1, v_2 = [-1] * v_length, [-1] * v_length
+    v_1[v_offset + 1] = v_2[v_offset + 1] = 0
+    delta = length_1 - length_2
+    front = delta % 2 != 0
+    k1_start = k1_end = k2_start = k2_end = 0
+
+    for d in range(min(max_d, max_cost)):
+        # Forward path
+        for k_1 in range(-d + k1_start, d + 1 - k1_end, 2):
+            k1_offset = v_offset + k_1
+            if k_1 == -d or (k_1 != d and v_1[k1_offset - 1] < v_1[k1_offset + 1]):
+                x_1 = v_1[k1_offset + 1]
+            else:
+                x_1 = v_1[k1_offset - 1] + 1
+            y_1 = x_1 - k_1
+            while x_1 < length_1 and y_1 < length_2 and ids_1[lo_1 + x_1] == ids_2[lo_2 + y_1]:
+                x_1 += 1
+                y_1 += 1
+            v_1[k1_offset] = x_1
+            if x_1 > length_1:
+                k1_end += 2
+            elif y_1 > length_2:
+                k1_start += 2
+            elif front:
+                k2_offset = v_offset + delta - k_1
+                if 0 <= k2_offset < v_length and v_2[k2_offset] != -1:
+                    if x_1 >= length_1 - v_2[k2_offset]:
+                        return x_1, y_1
+
+        # Reverse path
+        for k_2 in range(-d + k2_start, d + 1 - k2_end, 2):
+            k2_offset = v_offset + k_2
+            if k_2 == -d or (k_2 != d and v_2[k2_offset - 1] < v_2[k2_offset + 1]):
+                x_2 = v_2[k2_offset + 1]
+            else:
+                x_2 = v_2[k2_offset - 1] + 1
+            y_2 = x_2 - k_2
+            while x_2 < length_1 and y_2 < length_2 and ids_1[hi_1 - x_2 - 1] == ids_2[hi_2 - y_2 - 1]:
+                x_2 += 1
+                y_2 += 1
+            v_2[k2_offset] = x_2
+            if x_2 > length_1:
+                k2_end += 2
+            elif y_2 > length_2:
+                k2_start += 2
+            elif not front:
+                k1_offset = v_offset + delta - k_2
+                if 0 <= k1_offset < v_length and v_1[k1_offset] != -1:
+                    x_1 = v_1[k1_offset]
+                    if x_1 >= length_1 - x_2:
+                        return x_1, v_offset + x_1 - k1_offset
+
+    return None
+
+
+def _unique_anchors(ids_1: List[int], ids_2: List[int], lo_1: int, hi_1: int, lo_2: int,
+                    hi_2: int) -> List[Tuple[int, int]]:
+    """Find the lines appearing exactly once in both ranges, in an order kept by both (patience).
+
+    Args:
+        ids_1: Line IDs of text 1
+        ids_2: Line IDs of text 2
+        lo_1:  Start of the range in text 1
+        hi_1:  End of the range in text 1
+        lo_2:  Start of the range in text 2
+        hi_2:  End of the range in text 2
+
+    Returns:
+        Line index pairs (text 1, text 2) of the anchor lines, in order
+    """
+    counts_1 = Counter(islice(ids_1, lo_1, hi_1))
+    counts_2 = Counter(islice(ids_2, lo_2, hi_2))
+    index_2 = {ids_2[index]: index for index in range(lo_2, hi_2) if counts_2[ids_2[index]] == 1}
+    pairs = [(index, index_2[ids_1[index]]) for index in range(lo_1, hi_1)
+             if counts_1[ids_1[index]] == 1 and ids_1[index] in index_2]
+    if not pairs:
+        return []
+
+    # Longest increasing run of text 2 indexes (patience sorting)
+    pile_tops, pile_indexes, previous = [], [], [None] * len(pairs)
+    for pair_index, (_, index) in enumerate(pairs):
+        pile = bisect_left(pile_tops, index)
+        if pile > 0:
+            previous[pair_index] = pile_indexes[pile - 1]
+        if pile == len(pile_tops):
+            pile_tops.append(index)
+            pile_indexes.append(pair_index)
+        else:
+            pile_tops[pile] = index
+            pile_indexes[pile] = pair_index
+
+    anchors = []
+    pair_index = pile_indexes[-1]
+    while pair_index is not None:
+        anchors.append(pairs[pair_index])
+        pair_index = previous[pair_index]
+    anchors.reverse()
+    return anchors
+
+
+def diff_matches(ids_1: List[int], ids_2: List[int], max_cost: int = DIFF_MAX_COST) -> List[Tuple[int, int, int]]:
+    """Find the matching line blocks of two line ID lists.
+
+    Details: Common start and end lines are matched first. Then lines unique to both ranges are
+             used as anchors (patience diff), and ranges without such lines are split along the
+             shortest edit path (Myers diff, linear space). A range that needs more than `max_cost`
+             edits is treated as fully changed, keeping the run time bounded for unrelated texts.
+
+    Args:
+        ids_1:    Line IDs of text 1
+        ids_2:    Line IDs of text 2
+        max_cost: Largest edit distance searched for in a range without common unique lines
+
+    Returns:
+        Matching blocks (text 1 index, text 2 index, length), in order
+    """
+    matches = []
+    ranges = [(0, len(ids_1), 0, len(ids_2))]
+    while ranges:
+        lo_1, hi_1, lo_2, hi_2 = ranges.pop()
+
+        # Common start and end lines
+        start = lo_1
+        while lo_1 < hi_1 and lo_2 < hi_2 and ids_1[lo_1] == ids_2[lo_2]:
+            lo_1 += 1
+            lo_2 += 1
+        if lo_1 > start:
+            matches.append((start, lo_2 - (lo_1 - start), lo_1 - start))
+        end = hi_1
+        while lo_1 < hi_1 and lo_2 < hi_2 and ids_1[hi_1 - 1] == ids_2[hi_2 - 1]:
+            hi_1 -= 1
+            hi_2 -= 1
+        if hi_1 < end:
+            matches.append((hi_1, hi_2, end - hi_1))
+        if lo_1 == hi_1 or lo_2 == hi_2:
+            continue
+
+        anchors = _unique_anchors(ids_1, ids_2, lo_1, hi_1, lo_2, hi_2)
+        if anchors:
+            for anchor_1, anchor_2 in anchors:
+                ranges.append((lo_1, anchor_1, lo_2, anchor_2))
+                matches.append((anchor_1, anchor_2, 1))
+                lo_1, lo_2 = anchor_1 + 1, anchor_2 + 1
+            ranges.append((lo_1, hi_1, lo_2, hi_2))
+            continue
+
+        split = _middle_snake(ids_1, ids_2, lo_1, hi_1, lo_2, hi_2, max_cost)
+        if split is None:
+            logger.debug(f'Diff range of {hi_1 - lo_1} and {hi_2 - lo_2} lines treated as fully changed')
+            continue
+        ranges.append((lo_1, lo_1 + split[0], lo_2, lo_2 + split[1]))
+        ranges.append((lo_1 + split[0], hi_1, lo_2 + split[1], hi_2))
+
+    matches.sort()
+    return matches
+
+
+def diff_opcodes(lines_1: Sequence[str],
+                 lines_2: Sequence[str],
+                 max_cost: int = DIFF_MAX_COST) -> List[Tuple[str, int, int, int, int]]:
+    """Get the changes between two lists of lines.
+
+    Args:
+        lines_1:  Lines of text 1
+        lines_2:  Lines of text 2
+        max_cost: Largest edit distance searched for in a range without common unique lines
+
+    Returns:
+        Opcodes like `difflib.SequenceMatcher.get_opcodes()`: (tag, start 1, end 1, start 2, end 2)
+    """
+    ids_1, ids_2 = line_ids(lines_1, lines_2)
+    opcodes = []
+    index_1 = index_2 = 0
+    for match_1, match_2, length in diff_matches(ids_1, ids_2, max_cost) + [(len(ids_1), len(ids_2), 0)]:
+        if index_1 < match_1 and index_2 < match_2:
+            opcodes.append(('replace', index_1, match_1, index_2, match_2))
+        elif index_1 < match_1:
+            opcodes.append(('delete', index_1, match_1, index_2, match_2))
+        elif index_2 < match_2:
+            opcodes.append(('insert', index_1, match_1, index_2, match_2))
+        if length:
+            if opcodes and opcodes[-1][0] == 'equal':
+                opcodes[-1] = ('equal', opcodes[-1][1], match_1 + length, opcodes[-1][3], match_2 + length)
+            else:
+                opcodes.append(('equal', match_1, match_1 + length, match_2, match_2 + length))
+        index_1, index_2 = match_1 + length, match_2 + length
+    return opcodes
+
+
+def diff_hunks(lines_1: Iterable[str],
+               lines_2: Iterable[str],
+               window: int = DIFF_WINDOW_LINES,
+               max_cost: int = DIFF_MAX_COST) -> Generator[Tuple[str, List[str], List[str]], None, None]:
+    """Get the changes between two texts, line by line, reading the texts in windows.
+
+    Details: Up to `window` lines of each text are diffed at once. Everything after the last
+             matching lines of a window is carried over into the next window, so memory use
+             depends on the window size, not on the size of the texts.
+
+    Args:
+        lines_1:  Lines of text 1, can be a generator
+        lines_2:  Lines of text 2, can be a generator
+        window:   Number of lines of each text diffed at once
+        max_cost: Largest edit distance searched for in a range without common unique lines
+
+    Returns:
+        Generator of hunks: (tag, lines of text 1, lines of text 2), tag as in `diff_opcodes()`
+    """
+    lines_1, lines_2 = iter(lines_1), iter(lines_2)
+    buffer_1, buffer_2 = [], []
+    while True:
+        buffer_1.extend(islice(lines_1, window - len(buffer_1)))
+        buffer_2.extend(islice(lines_2, window - len(buffer_2)))
+        final = len(buffer_1) < window and len(buffer_2) < window
+
+        opcodes = diff_opcodes(buffer_1, buffer_2, max_cost)
+        if not final:
+            # Keep the changes after the last matching lines for the next window
+            equal_indexes = [index for index, opcode in enumerate(opcodes) if opcode[0] == 'equal']
+            if equal_indexes:
+                opcodes = opcodes[:equal_indexes[-1] + 1]
+
+        for tag, start_1, end_1, start_2, end_2 in opcodes:
+            yield tag, buffer_1[start_1:end_1], buffer_2[start_2:end_2]
+        if final:
+            break
+        del buffer_1[:opcodes[-1][2]]
+        del buffer_2[:opcodes[-1][4]]
+
+
+def line_guides(line_1: str, line_2: str) -> Union[Tuple[str, str], None]:
+    """Get the guides showing where two similar lines differ, as shown by `difflib.ndiff`.
+
+    Args:
+        line_1: Changed line of text 1
+        line_2: Changed line of text 2
+
+    Returns:
+        Guide of line 1 and line 2, None if the lines are not similar enough
+    """
+    matcher = difflib.SequenceMatcher(None, line_1, line_2)
+    if matcher.real_quick_ratio() <= DIFF_GUIDE_RATIO or matcher.ratio() <= DIFF_GUIDE_RATIO:
+        return None
+
+    guide_1, guide_2 = [], []
+    for tag, start_1, end_1, start_2, end_2 in matcher.get_opcodes():
+        length_1, length_2 = end_1 - start_1, end_2 - start_2
+        if tag == 'replace':
+            guide_1.append('^' * length_1)
+            guide_2.append('^' * length_2)
+        elif tag == 'delete':
+            guide_1.append('-' * length_1)
+        elif tag == 'insert':
+            guide_2.append('+' * length_2)
+        else:
+            guide_1.append(' ' * length_1)
+            guide_2.append(' ' * length_2)
+    return ''.join(guide_1).rstrip(), ''.join(guide_2).rstrip()
@@ -1,6 +1,5 @@
 """General utility and tools."""
 
-import difflib
 import json
 import logging
 import os
@@ -11,7 +10,7 @@ import time
 import webbrowser
 from pathlib import Path
 from string import Template
-from typing import Any, Dict, List, Literal, Set, Tuple, Union
+from typing import Any, Dict, Iterable, List, Literal, Set, Tuple, Union
 from urllib.parse import urljoin, urlparse
 
 import requests
@@ -24,6 +23,7 @@ from yaspin import yaspin
 from yaspin.spinners import Spinners
 
 from yojenkins import __version__
+from yojenkins.utility import line_diff
 from yojenkins.yo_jenkins.jenkins_item_classes import JenkinsItemClasses
 
 logger = logging.getLogger()
@@ -1287,8 +1287,8 @@ def wait_for_build_and_follow_logs(yj_obj: object, queue_id: int) -> None:
 
 
 def diff_show(
-    text_1: str,
-    text_2: str,
+    text_1: Union[str, Iterable[str]],
+    text_2: Union[str, Iterable[str]],
     label_1: str,
     label_2: str,
     line_pattern: tuple,
@@ -1299,9 +1299,12 @@ def diff_show(
 ) -> None:
     """Display/Show line diffs between two specified texts.
 
+    Details: The texts can also be passed as line iterables (ie. streamed logs), in which case
+             they are diffed window by window as they are read, see `line_diff.diff_hunks()`.
+
     Args:
-        text_1:       String text 1
-        text_2:       String text 2 to compare to text 1
+        text_1:       String text 1, or its lines
+        text_2:       String text 2 to compare to text 1, or its lines
         label_1:      text_1 label/description
         label_2:      text_2 label/description
         line-pattern: Patterns to consider for diff for each line
@@ -1310,33 +1313,22 @@ def diff_show(
         diff_only:    Only show lines that are different
         diff_guide:   Show diff specifiers/guides to show where difference is on line
     """
-    text_1, text_2 = text_1.splitlines(), text_2.splitlines()
+    text_1 = text_1.splitlines() if isinstance(text_1, str) else text_1
+    text_2 = text_2.splitlines() if isinstance(text_2, str) else text_2
 
     # Ignore specified number of initial characters
     if char_ignore > 0:
         logger.debug(f"Applying {char_ignore} initial characters for each line before diff ...")
-        text_1 = [line[char_ignore:] for line in text_1]
-        text_2 = [line[char_ignore:] for line in text_2]
+        text_1 = (line[char_ignore:] for line in text_1)
+        text_2 = (line[char_ignore:] for line in text_2)
 
     # Only select REGEX line patterns to diff
     if line_pattern:
         regex_pattern = "|".join(list(line_pattern))
         logger.debug(f'Applying REGEX pattern line filter before diff "{regex_pattern}":')
-        count_1, count_2 = len(text_1), len(text_2)
-
-        text_1 = [re.findall(regex_pattern, line) for line in text_1]  # Apply regex
-        text_1 = ["".join(line) for line in filter(lambda x: x, text_1)]  # Filter
-        logger.debug(f"   - Text 1: Kept {len(text_1)} of {count_1} lines ({len(text_1)/count_1 * 100:.1f}%)")
-
-        text_2 = [re.findall(regex_pattern, line) for line in text_2]
-        text_2 = ["".join(line) for line in filter(lambda x: x, text_2)]
-        logger.debug(f"   - Text 2: Kept {len(text_2)} of {count_2} lines ({len(text_2)/count_2 * 100:.1f}%)")
-
-    # Compute the diff
-    # lines_diff = difflib.Differ().compare(text_1, text_2)
-    # lines_diff = difflib.unified_diff(text_1, text_2, fromfile="Build URL 1", tofile="Build URL 2")
-    lines_diff = difflib.ndiff(text_1, text_2)
-    diff_ratio = difflib.SequenceMatcher(None, text_1, text_2).quick_ratio() * 100
+        regex = re.compile(regex_pattern)
+        text_1 = ("".join(line) for line in (regex.findall(line) for line in text_1) if line)
+        text_2 = ("".join(line) for line in (regex.findall(line) for line in text_2) if line)
 
     logger.debug("Showing the diff of two provided text strings ...")
     logger.debug("Diff output options specified:")
@@ -1360,14 +1352,7 @@ def diff_show(
     print("")
     print("-" * 51)
 
-    for line in lines_diff:
-        if line.isspace():  # difflib sometimes returns empty strings
-            continue
-        if diff_only and line[0] not in ["-", "+", "?"]:  # Skip non-diff lines
-            continue
-        if not diff_guide and line.startswith("?"):
-            continue
-
+    def show(line: str) -> None:
         if no_color:
             color, bold = "reset", False
         elif line[0] == "+":
@@ -1384,5 +1369,41 @@ def diff_show(
 
         secho(style(f"  {line}", fg=color, bold=bold))
 
+    count_1 = count_2 = count_equal = 0
+    for tag, lines_1, lines_2 in line_diff.diff_hunks(text_1, text_2):
+        count_1 += len(lines_1)
+        count_2 += len(lines_2)
+        if tag == "equal":
+            count_equal += len(lines_1)
+            if not diff_only:
+                for line in lines_1:
+                    show(f"  {line}")
+            continue
+
+        # Guides only for the similar line pairs of a changed hunk
+        guides = [None] * min(len(lines_1), len(lines_2))
+        if diff_guide:
+            guides = [line_diff.line_guides(line_1, line_2) for line_1, line_2 in zip(lines_1, lines_2)]
+        if not any(guides):
+            for line in lines_1:
+                show(f"- {line}")
+            for line in lines_2:
+                show(f"+ {line}")
+            continue
+        for index, line_guides in enumerate(guides):
+            show(f"- {lines_1[index]}")
+            if line_guides and line_guides[0]:
+                show(f"? {line_guides[0]}")
+            show(f"+ {lines_2[index]}")
+            if line_guides and line_guides[1]:
+                show(f"? {line_guides[1]}")
+        for line in lines_1[len(guides):]:
+            show(f"- {line}")
+        for line in lines_2[len(guides):]:
+            show(f"+ {line}")
+
+    diff_ratio = 2 * count_equal / (count_1 + count_2) * 100 if count_1 + count_2 else 100
+    logger.debug(f"Diffed {count_1} lines of text 1 and {count_2} lines of text 2, {count_equal} equal lines")
+
     print("-" * 51)
     print(f"\n  Similarity: {diff_ratio:.1f}%")
@@ -2,14 +2,23 @@
 
 from .account import Account
 from .auth import Auth
+from .build_cache import BuildCache
+from .build_stats import BuildStats
+from .config_drift import ConfigDrift
 from .credential import Credential
+from .failure_clusters import FailureClusters
 from .folder import Folder
+from .item_index import ItemIndex
 from .jenkins_item_classes import JenkinsItemClasses
 from .jenkins_item_config import JenkinsItemConfig
 from .jenkins_item_template import JenkinsItemTemplate
+from .jenkins_item_tree import JenkinsItemTree
 from .job import Job
+from .log_follower import LogFollower, LogFollowerGroup
 from .node import Node
+from .response_cache import ResponseCache
 from .rest import Rest
+from .rest_async import AsyncRest
 from .server import Server
 from .stage import Stage
 from .step import Step
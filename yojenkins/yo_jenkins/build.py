@@ -1,12 +1,15 @@
 """Build class definition"""
 
+import codecs
 import difflib
 import logging
 import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from itertools import islice
-from time import sleep, time
-from typing import Dict, List, Tuple
+from time import time
+from typing import Dict, Generator, Iterable, List, Tuple
 from urllib.parse import urlencode
 
 import click
@@ -17,13 +20,21 @@ from yojenkins.monitor import BuildMonitor
 from yojenkins.utility import utility
 from yojenkins.utility.utility import diff_show, fail_out, failures_out, print2
 from yojenkins.yo_jenkins.auth import Auth
+from yojenkins.yo_jenkins.build_cache import BUILD_FINISHED_RESULTS, BuildCache
 from yojenkins.yo_jenkins.jenkins_item_classes import JenkinsItemClasses
+from yojenkins.yo_jenkins.jenkins_item_tree import JenkinsItemTree
+from yojenkins.yo_jenkins.log_follower import LogFollower, LogFollowerGroup
 from yojenkins.yo_jenkins.rest import Rest
 from yojenkins.yo_jenkins.status import BuildStatus
 
 # Getting the logger reference
 logger = logging.getLogger()
 
+# Opening and closing <span> tags of the pipeline console log HTML, with the flow node ID of the span
+PIPELINE_NODE_TAG_PATTERN = re.compile(r'<span class="pipeline-node-(?P<node>\d+)"[^>]*>|'
+                                       r'<span class="pipeline-new-node"[^>]*?nodeId="(?P<new_node>\d+)"[^>]*>|'
+                                       r'<span\b[^>]*>|</span>')
+
 
 class Build():
     """Buld class"""
@@ -42,26 +53,56 @@ class Build():
         self.auth = auth
         self.build_monitor = BuildMonitor(rest, auth, self)
 
+        # Cache of finished builds - Enabled with cache_enable()
+        self.build_cache = None
+
         self.build_logs_extension = ".log"
+        self.build_logs_chunk_bytes = 64 * 1024
+
+    def cache_enable(self, persist: bool = False, clear: bool = False) -> None:
+        """Enable the cache of finished builds for build information, stages, and log sizes
+
+        Args:
+            persist : If True, keep the cache on disk across program runs
+            clear   : If True, remove all builds kept in the cache so far
+
+        Returns:
+            None
+        """
+        if not self.build_cache:
+            logger.debug(f'Enabling build cache (Persistent: {persist})')
+            self.build_cache = BuildCache(persist=persist)
+        if clear:
+            self.build_cache.clear()
 
     def info(self,
              build_url: str = '',
              job_name: str = '',
              job_url: str = '',
              build_number: int = None,
-             latest: bool = False) -> Dict:
-        """TODO Docstring
+             latest: bool = False,
+             tree: str = '') -> Dict:
+        """Get the build information
 
         Args:
-            TODO
+            build_url    : Direct URL of the build
+            job_name     : Name of the job of the build
+            job_url      : URL of the job of the build
+            build_number : Build number within the job
+            latest       : If True, use the latest build of the job
+            tree         : Build fields to request from the server (`JenkinsItemTree`). Default all fields
 
         Returns:
-            TODO
+            Build information
         """
         if build_url:
             build_url = utility.build_url_complete(build_url)
+            if self.build_cache:
+                build_info = self.build_cache.get(build_url, f'info:{tree}')
+                if build_info:
+                    return build_info
             request_url = f"{build_url.strip('/')}/api/json"
-            build_info = self.rest.request(request_url, 'get', is_endpoint=False)[0]
+            build_info = self.rest.request(request_url, 'get', is_endpoint=False, tree=tree)[0]
             if not build_info:
                 fail_out(f'Failed to get build info for provided build url ({build_url})')
         else:
@@ -71,7 +112,10 @@ class Build():
             if job_name and not job_url:
                 job_url = utility.name_to_url(self.rest.get_server_url(), job_name)
 
-            job_info, _, success = self.rest.request(f'{job_url.strip("/")}/api/json', 'get', is_endpoint=False)
+            job_info, _, success = self.rest.request(f'{job_url.strip("/")}/api/json',
+                                                     'get',
+                                                     is_endpoint=False,
+                                                     tree=JenkinsItemTree.JOB_LAST_BUILD.value)
             if not success:
                 fail_out(f'Failed getting build info, because failed to request job info: {job_url}')
 
@@ -101,7 +145,8 @@ class Build():
             logger.debug(f'Getting build info for job "{job_info["fullName"]}, build {build_number} ...')
             build_info, _, success = self.rest.request(f'{job_url.strip("/")}/{build_number}/api/json',
                                                        'get',
-                                                       is_endpoint=False)
+                                                       is_endpoint=False,
+                                                       tree=tree)
             if not success:
                 fail_out('Failed to request build info')
 
@@ -109,7 +154,145 @@ class Build():
         if build_info['_class'] not in JenkinsItemClasses.BUILD.value['class_type']:
             fail_out(f'Build found, but failed to match build type/class. This item is "{build_info["_class"]}"')
 
-        # Add additional derived information
+        build_info = self._info_derived(build_info)
+        self._info_cache_put(build_url or build_info.get('url', ''), tree, build_info)
+        return build_info
+
+    def info_many(self,
+                  build_urls: Iterable[str],
+                  tree: str = '',
+                  max_concurrent: int = 16) -> Generator[Tuple[str, Dict], None, None]:
+        """Get the build information of many builds concurrently
+
+        Details: The builds are requested over the same session, with no more than `max_concurrent`
+                 requests in flight. Results are yielded as they arrive, not in the order of the URLs.
+
+        Args:
+            build_urls     : Iterable of direct URLs of the builds
+            tree           : Build fields to request from the server (`JenkinsItemTree`). Default all fields
+            max_concurrent : Maximum number of build requests in flight at once
+
+        Returns:
+            Generator of tuples of build URL and build information (Empty if failed)
+        """
+        if self.build_cache:
+            # Finished builds are not requested again
+            uncached_build_urls = []
+            for build_url in build_urls:
+                build_url = utility.build_url_complete(build_url) or build_url
+                build_info = self.build_cache.get(build_url, f'info:{tree}')
+                if build_info:
+                    yield build_url.strip('/') + '/', build_info
+                else:
+                    uncached_build_urls.append(build_url)
+            build_urls = uncached_build_urls
+
+        targets = (f"{(utility.build_url_complete(build_url) or build_url).strip('/')}/api/json"
+                   for build_url in build_urls)
+        responses = self.rest.request_many(targets, is_endpoint=False, tree=tree, max_concurrent=max_concurrent)
+        for target, build_info, _, success in responses:
+            build_url = target[:-len('api/json')]
+            if not success:
+                logger.debug(f'Failed to get build info: {build_url}')
+                yield build_url, {}
+                continue
+            if build_info.get('_class') not in JenkinsItemClasses.BUILD.value['class_type']:
+                logger.debug(f'Failed to match build type/class for "{build_url}": {build_info.get("_class")}')
+                yield build_url, {}
+                continue
+            build_info = self._info_derived(build_info)
+            self._info_cache_put(build_url, tree, build_info)
+            yield build_url, build_info
+
+    def range_urls(self,
+                   job_name: str = '',
+                   job_url: str = '',
+                   first_number: int = 1,
+                   last_number: int = 0,
+                   page_size: int = 100) -> List[str]:
+        """Get the build URLs of a range of build numbers within a job
+
+        Details: Only builds that still exist are included, deleted or rotated out build numbers
+                 are left out. The build numbers are requested newest first, one page at a time with
+                 an `allBuilds{start,end}` range query, until the first build number of the range.
+
+        Args:
+            job_name     : Name of the job of the builds
+            job_url      : URL of the job of the builds
+            first_number : First build number of the range
+            last_number  : Last build number of the range (Inclusive). Default latest build
+            page_size    : Number of build numbers requested at once
+
+        Returns:
+            List of build URLs
+        """
+        if not job_name and not job_url:
+            fail_out('No job name or job url provided')
+        if job_name and not job_url:
+            job_url = utility.name_to_url(self.rest.get_server_url(), job_name)
+
+        job_info, _, success = self.rest.request(f'{job_url.strip("/")}/api/json',
+                                                 'get',
+                                                 is_endpoint=False,
+                                                 tree=JenkinsItemTree.JOB_BUILD_RANGE.value)
+        if not success:
+            fail_out(f'Failed to request job info: {job_url}')
+        if job_info['_class'] not in JenkinsItemClasses.JOB.value['class_type']:
+            fail_out(f'Failed to match job type/class. The found item is "{job_info["_class"]}"')
+        if not job_info.get('lastBuild'):
+            fail_out('Failed to find previous builds. This job may not have any past builds')
+
+        first_number = max(first_number, job_info['firstBuild']['number'])
+        job_last_number = job_info['lastBuild']['number']
+        last_number = min(last_number, job_last_number) if last_number else job_last_number
+        logger.debug(f'Build range for job "{job_info["fullName"]}": {first_number} to {last_number}')
+
+        build_urls = []
+        page_start = 0
+        page_size = max(page_size, 1)
+        while True:
+            page_end = page_start + page_size
+            builds_info, _, success = self.rest.request(
+                f'{job_url.strip("/")}/api/json',
+                'get',
+                is_endpoint=False,
+                tree=f'{JenkinsItemTree.JOB_BUILD_NUMBERS.value}{{{page_start},{page_end}}}')
+            if not success:
+                fail_out(f'Failed to request builds of job: {job_url}')
+            builds_page = builds_info.get('allBuilds', [])
+            build_urls.extend(build['url'] for build in builds_page if first_number <= build['number'] <= last_number)
+            if len(builds_page) < page_end - page_start or builds_page[-1]['number'] <= first_number:
+                break
+            page_start = page_end
+        build_urls.reverse()
+        logger.debug(f'Found {len(build_urls)} existing builds in range {first_number} to {last_number}')
+
+        return build_urls
+
+    def _info_cache_put(self, build_url: str, tree: str, build_info: Dict) -> None:
+        """Store the build information in the build cache, if enabled and the build is finished
+
+        Args:
+            build_url  : Direct URL of the build
+            tree       : Build fields requested from the server
+            build_info : Build information with derived fields
+
+        Returns:
+            None
+        """
+        if self.build_cache and build_url and self.build_cache.is_finished(build_info):
+            self.build_cache.put(build_url, f'info:{tree}', build_info)
+
+    @staticmethod
+    def _info_derived(build_info: Dict) -> Dict:
+        """Add the derived fields (formatted times, result text, job/folder names) to build information
+
+        Args:
+            build_info : Build information as returned by the server
+
+        Returns:
+            Build information with derived fields
+        """
         if 'timestamp' in build_info:
             build_info['startDatetime'] = datetime.fromtimestamp(build_info['timestamp'] /
                                                                  1000.0).strftime("%A, %B %d, %Y %I:%M:%S")
@@ -183,7 +366,8 @@ class Build():
                                job_name=job_name,
                                job_url=job_url,
                                build_number=build_number,
-                               latest=latest)
+                               latest=latest,
+                               tree=JenkinsItemTree.BUILD_STATUS.value)
 
         # If nothing is returned, check if job is queued on server
         logger.debug('The specified build was not found in job')
@@ -246,7 +430,7 @@ class Build():
         else:
             logger.debug('No build URL passed. Getting build information ...')
             # Get build info request
-            build_info = self.info(build_url, job_name, job_url, build_number, latest)
+            build_info = self.info(build_url, job_name, job_url, build_number, latest, JenkinsItemTree.BUILD_URL.value)
             url = build_info['url']
 
         # Making a direct request using the passed url
@@ -285,7 +469,7 @@ class Build():
         else:
             logger.debug('No build URL passed. Getting build information ...')
             # Get build info request
-            build_info = self.info(build_url, job_name, job_url, build_number, latest)
+            build_info = self.info(build_url, job_name, job_url, build_number, latest, JenkinsItemTree.BUILD_URL.value)
             url = build_info['url']
 
         # Making a direct request using the passed url
@@ -318,9 +502,14 @@ class Build():
             logger.debug('No build URL passed. Getting build information ...')
             # Get build info request
             build_url = utility.build_url_complete(build_url)
-            build_info = self.info(build_url, job_name, job_url, build_number, latest)
+            build_info = self.info(build_url, job_name, job_url, build_number, latest, JenkinsItemTree.BUILD_URL.value)
             build_url = build_info['url']
 
+        # Stages of finished builds do not change
+        build_stage_list = self.build_cache.get(build_url, 'stages') if self.build_cache else None
+        if build_stage_list:
+            return build_stage_list, [stage['name'] for stage in build_stage_list]
+
         # Making a direct request using the passed url
         logger.debug(f'Getting build stages for: {build_url} ...')
         request_url = f"{build_url.strip('/')}/wfapi/describe"
@@ -343,6 +532,9 @@ class Build():
             stage_info['pauseDurationFormatted'] = str(timedelta(seconds=stage_info["pauseDurationMillis"] / 1000.0))
             stage_info['url'] = stage_info['_links']['self']['href']
 
+        if self.build_cache and return_content.get('status') in BUILD_FINISHED_RESULTS:
+            self.build_cache.put(build_url, 'stages', build_stage_list)
+
         # Getting only the names of the stages
         build_stage_name_list = [stage['name'] for stage in build_stage_list]
 
@@ -363,8 +555,11 @@ class Build():
         """
         # Test on build with artifacts
         build_url = utility.build_url_complete(build_url)
-        return self.info(build_url=build_url, job_name=job_name, job_url=job_url,
-                         build_number=build_number).get('artifacts')
+        return self.info(build_url=build_url,
+                         job_name=job_name,
+                         job_url=job_url,
+                         build_number=build_number,
+                         tree=JenkinsItemTree.BUILD_ARTIFACTS.value).get('artifacts')
 
     def artifact_download(self):
         """TODO Docstring
@@ -400,7 +595,11 @@ class Build():
             build_url = utility.build_url_complete(build_url)
         else:
             logger.debug('No build URL passed. Getting build information through job ...')
-            build_info = self.info(job_name=job_name, job_url=job_url, build_number=build_number, latest=latest)
+            build_info = self.info(job_name=job_name,
+                                   job_url=job_url,
+                                   build_number=build_number,
+                                   latest=latest,
+                                   tree=JenkinsItemTree.BUILD_URL.value)
             build_url = build_info['url']
 
         # FIXME: Check if this is an actual build and job/folder/etc
@@ -409,118 +608,395 @@ class Build():
 
         if download_dir:
             # Download to local file
-            auth = requests.auth.HTTPBasicAuth(self.rest.username, self.rest.api_token)
             filename = f'build-logs_{datetime.now().strftime("%m-%d-%Y_%I-%M-%S")}{self.build_logs_extension}'
             logger.debug(f'Downloading console text logs to local file "{filename}" ...')
+            response = self.rest.request_stream(request_url, is_endpoint=False)
+            if response is None:
+                fail_out('Failed to get console logs. Build may not exist or is queued')
             try:
-                with requests.get(request_url, auth=auth, stream=True, timeout=10) as open_request:
-                    open_request.raise_for_status()
-                    with open(os.path.join(download_dir, filename), 'wb') as open_file:
-                        for chunk in open_request.iter_content(chunk_size=8192):
-                            if chunk:
-                                open_file.write(chunk)
+                with response, open(os.path.join(download_dir, filename), 'wb') as open_file:
+                    for chunk in response.iter_content(chunk_size=self.build_logs_chunk_bytes):
+                        open_file.write(chunk)
                 logger.debug('Successfully download build logs to file')
-            except Exception as error:
+            except (OSError, requests.exceptions.RequestException) as error:
                 fail_out(f'Failed to download or save logs for build. Exception: {error}')
         else:
             if not follow:
                 # Show build logs in console
-                logger.debug('Fetching logs from server ...')
-                return_content, _, return_success = self.rest.request(request_url,
-                                                                      'get',
-                                                                      is_endpoint=False,
-                                                                      json_content=False)
-                if not return_success or not return_content:
-                    fail_out('Failed to get console logs. Build may not exist or is queued')
-
-                # If tail/last part of the log was specified
                 if tail:
                     logger.debug(f'--tail option specified with value of: {tail}')
-                    tail = abs(tail)
-                    logs_list = list(map(lambda num: num.strip(), return_content.splitlines()))
-                    number_of_lines = round(len(logs_list) * tail) if tail < 1 else round(tail)
-                    start_log_number = 0 if number_of_lines > len(logs_list) else len(logs_list) - number_of_lines
-                    return_content = os.linesep.join(list(islice(logs_list, start_log_number, None)))
-                    logger.debug(f'Only printing out last logs, lines {start_log_number} to {len(logs_list)} ...')
-
-                logger.debug('Printing out console text logs ...')
-                print2(return_content)
-            else:
-                # Stream the logs to console
-                log_poll_interval = 1.0
-                logger.debug(f'Following/streaming logs from server at poll interval: {log_poll_interval}s ...')
-
-                # Check if Jenkins server supports progressiveText
-                _, headers, request_success = self.rest.request(
-                    f"{build_url.strip('/')}/logText/progressiveText?start=0",
-                    'head',
-                    is_endpoint=False,
-                    json_content=False)
-
-                if request_success and "X-Text-Size" in headers:
-                    # METHOD 1: Fetch logs using progressiveText endpoint
-                    logger.debug('Jenkins server supports requesting partial byte ranges (progressiveText)')
-                    try:
-                        progressive_text_position = headers['X-Text-Size']
-                        while True:
-                            request_url = f"{build_url.strip('/')}/logText/progressiveText?start={progressive_text_position}"
-                            return_content, headers, _ = self.rest.request(request_url,
-                                                                           'get',
-                                                                           is_endpoint=False,
-                                                                           json_content=False)
-                            logger.debug(f'Request Headers: {headers}')
-                            if len(return_content) != 0:
-                                print2(return_content.strip())
-                            if 'X-More-Data' not in headers:
-                                break
-                            progressive_text_position = headers['X-Text-Size']
-                            sleep(log_poll_interval)
-                    except KeyboardInterrupt:
-                        logger.debug('Keyboard Interrupt (CTRL-C) by user. Stopping log following ...')
+                    print2(self.logs_tail(build_url, tail))
                 else:
-                    # METHOD 2: Fetch logs using log difference (Server does not support progressiveText)
-                    try:
-                        logger.debug(
-                            'Jenkins server does not support requesting partial byte ranges (progressiveText), '
-                            'MUST download entire log to get log message differences')
-                        old_dict = {}
-                        fetch_number = 1
-                        request_url = f"{build_url.strip('/')}/consoleText"
-                        while True:
-                            headers = self.rest.request(request_url, 'head', is_endpoint=False, json_content=False)[1]
-                            if 'content-length' not in headers:
-                                fail_out(f'Failed to find "content-length" key in server response headers: {headers}')
-                            content_length_sample_1 = int(headers['Content-Length'])
-                            sleep(1)
-                            headers = self.rest.request(request_url, 'head', is_endpoint=False, json_content=False)[1]
-                            content_length_sample_2 = int(headers['Content-Length'])
-
-                            content_length_diff = content_length_sample_2 - content_length_sample_1
-                            if content_length_diff:
-                                logger.debug(
-                                    f'LOG FETCH {fetch_number}: Content length difference: {content_length_diff} bytes'
-                                )
-                                return_content = self.rest.request(request_url,
-                                                                   'get',
-                                                                   is_endpoint=False,
-                                                                   json_content=False)[0]
-                                new_dict = dict.fromkeys(
-                                    list(map(lambda num: num.strip(), return_content.splitlines())))
-
-                                diff = dict.fromkeys(x for x in new_dict if x not in old_dict)
-                                diff_list = list(diff.keys())
-                                diff_text = os.linesep.join(diff_list)
-
-                                old_dict = new_dict
-                                fetch_number += 1
-
-                                print2(diff_text)
-                            else:
-                                logger.debug('No content length difference')
-                    except KeyboardInterrupt:
-                        logger.debug('Keyboard Interrupt (CTRL-C) by user. Stopping log following ...')
+                    logger.debug('Streaming console text logs from server ...')
+                    self._logs_stream(request_url)
+            else:
+                # Follow the logs as they grow, starting at the current end of the logs
+                log_size, progressive = self._logs_size(build_url)
+                log_follower = LogFollower(self.rest, build_url, offset=log_size, progressive=progressive)
+                logger.debug(f'Following logs from byte {log_size} with '
+                             f'{"progressiveText" if progressive else "Range"} requests ...')
+                try:
+                    log_follower.follow(output=lambda log_text: click.echo(log_text, nl=False))
+                except KeyboardInterrupt:
+                    logger.debug('Keyboard Interrupt (CTRL-C) by user. Stopping log following ...')
+                if log_follower.error:
+                    fail_out(f'Stopped following build logs. {log_follower.error}')
         return True
 
+    def logs_follow_many(self, build_urls: List[str], max_workers: int = 8) -> bool:
+        """Follow the logs of many builds at once, until all builds are finished
+
+        Details: Each build is followed from the current end of its logs. Lines of all builds are
+                 printed as they arrive, each with the name and number of its build in front.
+
+        Args:
+            build_urls  : Direct URLs of the builds
+            max_workers : Maximum number of logs requested at once
+
+        Returns:
+            True if all builds were followed until finished
+        """
+        build_urls = [utility.build_url_complete(build_url) or build_url for build_url in build_urls]
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            logs_sizes = list(executor.map(self._logs_size, build_urls))
+
+        followers = {}
+        for build_url, (log_size, progressive) in zip(build_urls, logs_sizes):
+            prefix = click.style(f'[{utility.url_to_name(build_url)}]', fg='bright_blue')
+            followers[prefix] = LogFollower(self.rest, build_url, offset=log_size, progressive=progressive)
+        logger.debug(f'Following logs of {len(followers)} builds with {max_workers} workers ...')
+
+        try:
+            LogFollowerGroup(followers, max_workers=max_workers).follow(output=click.echo)
+        except KeyboardInterrupt:
+            logger.debug('Keyboard Interrupt (CTRL-C) by user. Stopping log following ...')
+            return False
+
+        follow_errors = [
+            f'Stopped following logs of {utility.url_to_name(log_follower.build_url)}. {log_follower.error}'
+            for log_follower in followers.values() if log_follower.error
+        ]
+        if follow_errors:
+            failures_out(follow_errors)
+        return True
+
+    def logs_search(self,
+                    build_url: str,
+                    patterns: List[re.Pattern],
+                    context_lines: int = 0) -> Generator[Dict, None, None]:
+        """Search the build console log line by line, while it is received
+
+        Details: Only the last few lines are kept for context, so memory use does not grow with the
+                 size of the log. Each line is reported once, for the first pattern it matches.
+                 If the log can not be received to its end, the rest of it is skipped.
+
+        Args:
+            build_url     : Direct URL of the build
+            patterns      : Compiled REGEX patterns to search for
+            context_lines : Number of lines before and after a match to include
+
+        Returns:
+            Generator of matches with build, line number, line, pattern, and context lines
+        """
+        build_url = build_url.strip('/')
+        response = self.rest.request_stream(f'{build_url}/consoleText', is_endpoint=False)
+        if response is None:
+            logger.debug(f'Failed to get console logs for build: {build_url}')
+            return
+
+        build_number = int(build_url.split('/')[-1]) if build_url.split('/')[-1].isdigit() else None
+        lines_before = deque(maxlen=context_lines)
+        matches_open = []
+        try:
+            with response:
+                for line_number, line in enumerate(self._logs_lines(response), start=1):
+
+                    # Add this line as context to earlier matches
+                    for match in matches_open:
+                        match['after'].append(line)
+                    while matches_open and len(matches_open[0]['after']) >= context_lines:
+                        yield matches_open.pop(0)
+
+                    for pattern in patterns:
+                        if pattern.search(line):
+                            match = {
+                                'buildNumber': build_number,
+                                'buildUrl': f'{build_url}/',
+                                'lineNumber': line_number,
+                                'line': line,
+                                'pattern': pattern.pattern,
+                                'before': list(lines_before),
+                                'after': []
+                            }
+                            if context_lines:
+                                matches_open.append(match)
+                            else:
+                                yield match
+                            break
+                    lines_before.append(line)
+        except requests.exceptions.RequestException as error:
+            logger.debug(f'Failed to read console logs for build: {build_url}. Skipping rest of log. '
+                         f'Exception: {error}')
+            return
+        yield from matches_open
+
+    def logs_by_node(self, build_url: str, node_ids: Iterable[str] = None) -> Dict[str, List[str]]:
+        """Get the console log lines of a pipeline build, grouped by flow node
+
+        Details: Pipeline builds mark each part of the console log HTML (`progressiveHtml`) with the
+                 ID of the flow node (ie. step) that wrote it. The log is received once as a stream,
+                 and each line is stored under the flow node ID open at that line, so the logs of
+                 any stage step can be taken from one download. Lines outside of any flow node,
+                 and the `[Pipeline]` step start lines, are stored under an empty ID.
+
+        Args:
+            build_url : Direct URL of the build
+            node_ids  : Flow node IDs to keep the lines of. If not given, keep the lines of all nodes
+
+        Returns:
+            Log lines without HTML, keyed by flow node ID
+        """
+        build_url = build_url.strip('/')
+        node_ids = set(node_ids) if node_ids is not None else None
+        logger.debug(f'Getting console log of build, split by flow node: {build_url} ...')
+        response = self.rest.request_stream(f'{build_url}/logText/progressiveHtml', is_endpoint=False)
+        if response is None:
+            fail_out(f'Failed to get console log HTML of build: {build_url}')
+
+        node_logs = {}
+        # Flow node ID of each open <span>. Empty for pipeline step start markers, None for other spans
+        span_nodes = []
+        with response:
+            for line in self._logs_lines(response):
+                # The line belongs to the flow node open after the tags at the start of the line
+                line_node = None
+                text_position = 0
+                for tag in PIPELINE_NODE_TAG_PATTERN.finditer(line):
+                    if line_node is None and tag.start() > text_position:
+                        line_node = next((node for node in reversed(span_nodes) if node is not None), '')
+                    text_position = tag.end()
+                    if tag.group(0) == '</span>':
+                        if span_nodes:
+                            span_nodes.pop()
+                    elif tag.group('new_node'):
+                        span_nodes.append('')
+                    else:
+                        span_nodes.append(tag.group('node'))
+                if line_node is None:
+                    line_node = next((node for node in reversed(span_nodes) if node is not None), '')
+
+                if node_ids is not None and line_node not in node_ids:
+                    continue
+                node_logs.setdefault(line_node, []).append(utility.html_clean(line))
+
+        logger.debug(f'Console log split into {len(node_logs)} flow nodes')
+        return node_logs
+
+    def _logs_lines(self, response: requests.Response) -> Generator[str, None, None]:
+        """Split a streamed console log response into lines, while it is received
+
+        Args:
+            response : Open streamed response of the console log
+
+        Returns:
+            Generator of log lines, without line ending
+        """
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        partial_line = ''
+        for chunk in response.iter_content(chunk_size=self.build_logs_chunk_bytes):
+            *complete_lines, partial_line = (partial_line + decoder.decode(chunk)).split('\n')
+            for line in complete_lines:
+                yield line.rstrip('\r')
+        partial_line += decoder.decode(b'', final=True)
+        if partial_line:
+            yield partial_line.rstrip('\r')
+
+    def _logs_stream(self, request_url: str) -> int:
+        """Print the build console log to the console while it is received
+
+        Details: The log is decoded with an incremental decoder chunk by chunk as the chunks arrive,
+                 so output starts right away and memory use does not grow with the size of the log.
+
+        Args:
+            request_url : URL of the console log (ie. `consoleText`)
+
+        Returns:
+            Number of log bytes received
+        """
+        response = self.rest.request_stream(request_url, is_endpoint=False)
+        if response is None:
+            fail_out('Failed to get console logs. Build may not exist or is queued')
+
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        log_bytes_count = 0
+        with response:
+            try:
+                for chunk in response.iter_content(chunk_size=None):
+                    log_bytes_count += len(chunk)
+                    click.echo(decoder.decode(chunk), nl=False)
+            except requests.exceptions.RequestException as error:
+                fail_out(f'Failed to get console logs. Exception: {error}')
+        click.echo(decoder.decode(b'', final=True))
+
+        if not log_bytes_count:
+            fail_out('Failed to get console logs. Build may not exist or is queued')
+        logger.debug(f'Received {log_bytes_count} bytes of console text logs')
+        return log_bytes_count
+
+    def _logs_size(self, build_url: str) -> Tuple[int, bool]:
+        """Get the current size of the build console log
+
+        Details: The size is read from the `X-Text-Size` header of the `progressiveText` endpoint.
+                 If the server does not support it, the `Content-Length` of `consoleText` is used.
+                 Once the server reports no more log data, the size is kept in the build cache.
+
+        Args:
+            build_url : Direct URL of the build
+
+        Returns:
+            Tuple of log size in bytes (0 if unknown), and True if `progressiveText` is supported
+        """
+        log_size = self.build_cache.get(build_url, 'log_size') if self.build_cache else None
+        if log_size:
+            return log_size[0], log_size[1]
+
+        _, headers, success = self.rest.request(f"{build_url.strip('/')}/logText/progressiveText",
+                                                'head',
+                                                is_endpoint=False,
+                                                json_content=False,
+                                                params={'start': 0})
+        if success and 'X-Text-Size' in headers:
+            if self.build_cache and headers.get('X-More-Data', '').lower() != 'true':
+                self.build_cache.put(build_url, 'log_size', [int(headers['X-Text-Size']), True])
+            return int(headers['X-Text-Size']), True
+
+        _, headers, success = self.rest.request(f"{build_url.strip('/')}/consoleText",
+                                                'head',
+                                                is_endpoint=False,
+                                                json_content=False)
+        if success and 'Content-Length' in headers:
+            return int(headers['Content-Length']), False
+
+        return 0, False
+
+    def _logs_lines_count(self, build_url: str) -> int:
+        """Count the lines of the build console log, streaming the log without keeping it
+
+        Args:
+            build_url : Direct URL of the build
+
+        Returns:
+            Number of lines of the log
+        """
+        response = self.rest.request_stream(f"{build_url.strip('/')}/consoleText", is_endpoint=False)
+        if response is None:
+            fail_out('Failed to get console logs. Build may not exist or is queued')
+        lines_count = 0
+        last_byte = b'\n'
+        with response:
+            for chunk in response.iter_content(chunk_size=self.build_logs_chunk_bytes):
+                lines_count += chunk.count(b'\n')
+                last_byte = chunk[-1:] or last_byte
+        if last_byte != b'\n':
+            lines_count += 1
+        logger.debug(f'Counted {lines_count} lines in the console log')
+        return lines_count
+
+    def _logs_read(self, build_url: str, start: int, end: int, progressive: bool = True) -> bytes:
+        """Read a byte range of the build console log, without transferring what comes after it
+
+        Details: With `progressiveText`, the log is requested from the start byte and the connection
+                 is closed once the end byte is reached. Otherwise a `Range` request for `consoleText`
+                 is used, skipping the leading bytes if the server ignores the range.
+
+        Args:
+            build_url   : Direct URL of the build
+            start       : First byte to read
+            end         : Byte to stop reading at (Exclusive)
+            progressive : If True, the server supports `progressiveText`
+
+        Returns:
+            Log bytes within the range
+        """
+        skip_bytes = 0
+        if progressive:
+            response = self.rest.request_stream(f"{build_url.strip('/')}/logText/progressiveText",
+                                                is_endpoint=False,
+                                                params={'start': start})
+        else:
+            response = self.rest.request_stream(f"{build_url.strip('/')}/consoleText",
+                                                is_endpoint=False,
+                                                headers={'Range': f'bytes={start}-{end - 1}'})
+            if response is not None and response.status_code != 206:
+                logger.debug('Server does not support byte ranges. Skipping leading log bytes ...')
+                skip_bytes = start
+        if response is None:
+            fail_out('Failed to get console logs. Build may not exist or is queued')
+
+        log_bytes = bytearray()
+        with response:
+            for chunk in response.iter_content(chunk_size=self.build_logs_chunk_bytes):
+                if skip_bytes:
+                    skipped_bytes = min(skip_bytes, len(chunk))
+                    chunk, skip_bytes = chunk[skipped_bytes:], skip_bytes - skipped_bytes
+                log_bytes += chunk
+                if len(log_bytes) >= end - start:
+                    break
+        return bytes(log_bytes[:end - start])
+
+    def logs_tail(self, build_url: str, tail: float) -> str:
+        """Get the last lines of the build console log, reading the log backwards from its end
+
+        Details: Starting with the last chunk of the log, the read window doubles backwards until it
+                 holds enough lines. Only these last bytes are transferred and held in memory, no matter
+                 the size of the log. A tail below 1 is the fraction of the log lines to show, for
+                 which the lines of the whole log are counted first, without keeping the log.
+
+        Args:
+            build_url : Direct URL of the build
+            tail      : Number of last lines, or fraction of the log lines if below 1
+
+        Returns:
+            Last lines of the log
+        """
+        tail = abs(tail)
+        log_size, progressive = self._logs_size(build_url)
+        if not log_size:
+            logger.debug('Failed to get the console log size. Reading entire log, keeping only the last lines ...')
+            response = self.rest.request_stream(f"{build_url.strip('/')}/consoleText", is_endpoint=False)
+            if response is None:
+                fail_out('Failed to get console logs. Build may not exist or is queued')
+            with response:
+                response.encoding = response.encoding or 'utf-8'
+                logs_list = [line.strip() for line in response.iter_lines(decode_unicode=True)]
+            number_of_lines = round(len(logs_list) * tail) if tail < 1 else round(tail)
+            return os.linesep.join(logs_list[len(logs_list) - min(number_of_lines, len(logs_list)):])
+
+        number_of_lines = round(self._logs_lines_count(build_url) * tail) if tail < 1 else round(tail)
+
+        # Expand backwards from the end of the log until enough lines are read
+        log_segments = []
+        newlines_count = 0
+        read_end, read_bytes = log_size, self.build_logs_chunk_bytes
+        while True:
+            read_start = max(read_end - read_bytes, 0)
+            log_segment = self._logs_read(build_url, read_start, read_end, progressive)
+            log_segments.insert(0, log_segment)
+            newlines_count += log_segment.count(b'\n')
+            logger.debug(f'Read log bytes {read_start} to {read_end} of {log_size} ({newlines_count} lines)')
+            if read_start == 0 or newlines_count > number_of_lines:
+                break
+            read_end, read_bytes = read_start, read_bytes * 2
+
+        logs_list = [line.strip() for line in b''.join(log_segments).decode('utf-8', errors='replace').splitlines()]
+        if read_start > 0:
+            # First line is only partially read
+            logs_list = logs_list[1:]
+        logs_list = logs_list[len(logs_list) - min(number_of_lines, len(logs_list)):]
+        logger.debug(f'Only printing out last {len(logs_list)} lines of the logs ...')
+
+        return os.linesep.join(logs_list)
+
     def browser_open(self,
                      build_url: str = '',
                      job_name: str = '',
@@ -542,7 +1018,7 @@ class Build():
             build_url = build_url.strip('/')
         else:
             logger.debug('No build URL passed. Getting build information ...')
-            build_info = self.info(build_url, job_name, job_url, build_number, latest)
+            build_info = self.info(build_url, job_name, job_url, build_number, latest, JenkinsItemTree.BUILD_URL.value)
             build_url = build_info['url']
 
         # Open the build in browser
@@ -560,14 +1036,23 @@ class Build():
                 job_url: str = '',
                 build_number: int = None,
                 latest: bool = False,
-                sound: bool = False) -> bool:
-        """TODO Docstring
+                sound: bool = False,
+                headless: bool = False,
+                output_file: str = '') -> bool:
+        """Start the build monitor UI, or the headless build monitor
 
         Args:
-            TODO
+            build_url    : Direct URL of the build
+            job_name     : Name of the job of the build
+            job_url      : URL of the job of the build
+            build_number : Build number
+            latest       : If True, monitor the latest build of the job
+            sound        : Enable sound effects
+            headless     : If True, write status change events as JSON lines instead of showing the UI
+            output_file  : Path to the file to append the headless events to. Default standard out
 
         Returns:
-            TODO
+            True if successful, else False
         """
         if build_url:
             logger.debug(f'Build URL passed: {build_url}')
@@ -577,11 +1062,14 @@ class Build():
             url = build_url
         else:
             logger.debug('No build URL passed. Getting build information ...')
-            build_info = self.info(build_url, job_name, job_url, build_number, latest)
+            build_info = self.info(build_url, job_name, job_url, build_number, latest, JenkinsItemTree.BUILD_URL.value)
             url = build_info['url']
 
         logger.debug(f'Starting monitor for: "{url}" ...')
-        success = self.build_monitor.monitor_start(build_url=url, sound=sound)
+        if headless:
+            success = self.build_monitor.monitor_headless(build_url=url, output_file=output_file)
+        else:
+            success = self.build_monitor.monitor_start(build_url=url, sound=sound)
         if not success:
             fail_out('Failed to start build monitor')
         logger.debug('Successfully started build monitor')
@@ -604,7 +1092,8 @@ class Build():
         """
         # TODO: Pass a list of build numbers
         build_url = utility.build_url_complete(build_url)
-        build_info = self.info(build_url, job_name, job_url, build_number, latest)
+        build_info = self.info(build_url, job_name, job_url, build_number, latest,
+                               JenkinsItemTree.BUILD_PARAMETERS.value)
         if not build_url:
             logger.debug('No build URL passed. Getting build information ...')
             # Get build info request
@@ -643,7 +1132,8 @@ class Build():
             TODO
         """
         build_url = utility.build_url_complete(build_url)
-        build_info = self.info(build_url, job_name, job_url, build_number, latest)
+        build_info = self.info(build_url, job_name, job_url, build_number, latest,
+                               JenkinsItemTree.BUILD_PARAMETERS.value)
         if not build_url:
             build_url = build_info['url']
         if not job_url:
@@ -711,22 +1201,18 @@ class Build():
         logger.debug(f'    - Build 2:   {build_url_2}')
 
         if logs:
-            build_logs_1, _, success = self.rest.request(f"{build_url_1.strip('/')}/consoleText",
-                                                         'get',
-                                                         is_endpoint=False,
-                                                         json_content=False)
-            if not success:
+            # Stream both logs, so they are diffed window by window while received
+            response_1 = self.rest.request_stream(f"{build_url_1.strip('/')}/consoleText", is_endpoint=False)
+            if response_1 is None:
                 fail_out(f'Failed to fetch logs for build "{build_url_1}"')
-
-            build_logs_2, _, success = self.rest.request(f"{build_url_2.strip('/')}/consoleText",
-                                                         'get',
-                                                         is_endpoint=False,
-                                                         json_content=False)
-            if not success:
+            response_2 = self.rest.request_stream(f"{build_url_2.strip('/')}/consoleText", is_endpoint=False)
+            if response_2 is None:
+                response_1.close()
                 fail_out(f'Failed to fetch logs for build "{build_url_2}"')
 
-            diff_show(build_logs_1, build_logs_2, "---  BUILD 1", "+++  BUILD 2", line_pattern, char_ignore, no_color,
-                      diff_only, diff_guide)
+            with response_1, response_2:
+                diff_show(self._logs_lines(response_1), self._logs_lines(response_2), "---  BUILD 1", "+++  BUILD 2",
+                          line_pattern, char_ignore, no_color, diff_only, diff_guide)
         else:
             build_info_1 = self.info(build_url=build_url_1)
             build_info_2 = self.info(build_url=build_url_2)
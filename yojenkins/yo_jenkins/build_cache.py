@@ -0,0 +1,170 @@
+"""Build Cache class definition"""
+
+import copy
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from time import time
+from typing import Any, Dict
+
+from yojenkins.utility.utility import CONFIG_DIR_NAME
+from yojenkins.yo_jenkins.status import Status
+
+# Getting the logger reference
+logger = logging.getLogger()
+
+BUILD_CACHE_FILE_NAME = 'build_cache.sqlite'
+BUILD_CACHE_TTL = 7 * 24 * 60 * 60  # sec
+BUILD_CACHE_MAX_ROWS = 20000
+
+# Build and pipeline run results after which nothing about the build changes anymore
+BUILD_FINISHED_RESULTS = Status.SUCCESS.value + Status.FAILURE.value + Status.ABORTED.value + Status.UNSTABLE.value
+
+
+class BuildCache:
+    """Cache of the information of finished builds, which never changes once a build has a result
+
+    Details: Entries are keyed by build URL and kind of data (ie. build information of one tree
+             projection, stages, log size). Only data of finished builds is stored, running builds
+             are always requested. The cache is held in memory, and optionally in a file on disk
+             so it is kept across program runs. Entries on disk expire after `ttl` seconds, since
+             a deleted and recreated job reuses the URLs of its old builds, and only the most recently
+             stored `max_rows` entries are kept.
+    """
+
+    def __init__(self,
+                 persist: bool = False,
+                 cache_dir: str = '',
+                 ttl: float = BUILD_CACHE_TTL,
+                 max_rows: int = BUILD_CACHE_MAX_ROWS) -> None:
+        """Object constructor method, called at object creation
+
+        Args:
+            persist   : If True, also store the entries on disk
+            cache_dir : Directory of the cache file. Default is the yojenkins configuration directory
+            ttl       : Number of seconds an entry on disk is used for
+            max_rows  : Maximum number of entries kept on disk
+
+        Returns:
+            None
+        """
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+
+        self.connection = None
+        if persist:
+            if not cache_dir:
+                cache_dir = os.path.join(Path.home(), CONFIG_DIR_NAME)
+            os.makedirs(cache_dir, exist_ok=True)
+            self.cache_file_path = os.path.join(cache_dir, BUILD_CACHE_FILE_NAME)
+            logger.debug(f'Opening build cache "{self.cache_file_path}" ...')
+            self.connection = sqlite3.connect(self.cache_file_path, timeout=10, check_same_thread=False)
+            os.chmod(self.cache_file_path, 0o600)
+            with self.connection:
+                columns = [row[1] for row in self.connection.execute('PRAGMA table_info(builds)')]
+                if columns and 'stored' not in columns:
+                    logger.debug('Build cache file without entry times. Starting empty')
+                    self.connection.execute('DROP TABLE builds')
+                self.connection.execute('''
+                    CREATE TABLE IF NOT EXISTS builds (
+                        url TEXT, kind TEXT, data TEXT, stored REAL,
+                        PRIMARY KEY (url, kind))''')
+            self.prune()
+
+    @staticmethod
+    def is_finished(build_info: Dict) -> bool:
+        """Check if build information is of a finished build
+
+        Args:
+            build_info : Build information with at least `result`, and optionally `building`
+
+        Returns:
+            True if the build has a final result and is not building anymore, else False
+        """
+        return build_info.get('result') in BUILD_FINISHED_RESULTS and not build_info.get('building')
+
+    def get(self, build_url: str, kind: str) -> Any:
+        """Get the cached data of a finished build
+
+        Args:
+            build_url : URL of the build
+            kind      : Kind of data (ie. `info:<tree>`, `stages`, `log_size`)
+
+        Returns:
+            Copy of the cached data, None if not cached
+        """
+        key = (build_url.strip('/') + '/', kind)
+        with self._lock:
+            data = self.entries.get(key)
+            if data is None and self.connection:
+                row = self.connection.execute('SELECT data FROM builds WHERE url = ? AND kind = ? AND stored > ?',
+                                              (*key, time() - self.ttl)).fetchone()
+                if row:
+                    data = self.entries[key] = json.loads(row[0])
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        logger.debug(f'Using build cache for {kind}: {build_url}')
+        return copy.deepcopy(data)
+
+    def put(self, build_url: str, kind: str, data: Any) -> None:
+        """Store data of a finished build
+
+        Args:
+            build_url : URL of the build
+            kind      : Kind of data (ie. `info:<tree>`, `stages`, `log_size`)
+            data      : Data to store, must be JSON serializable
+
+        Returns:
+            None
+        """
+        key = (build_url.strip('/') + '/', kind)
+        with self._lock:
+            self.entries[key] = copy.deepcopy(data)
+            if self.connection:
+                with self.connection:
+                    self.connection.execute('INSERT OR REPLACE INTO builds VALUES (?, ?, ?, ?)',
+                                            (*key, json.dumps(data), time()))
+
+    def prune(self) -> None:
+        """Remove the expired entries on disk, and the oldest entries over the maximum number of entries
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if not self.connection:
+            return
+        with self._lock, self.connection:
+            expired_count = self.connection.execute('DELETE FROM builds WHERE stored <= ?',
+                                                    (time() - self.ttl, )).rowcount
+            evicted_count = self.connection.execute(
+                'DELETE FROM builds WHERE rowid NOT IN (SELECT rowid FROM builds ORDER BY stored DESC LIMIT ?)',
+                (self.max_rows, )).rowcount
+        logger.debug(f'Pruned build cache: {expired_count} expired, {evicted_count} over maximum of {self.max_rows}')
+
+    def clear(self) -> None:
+        """Remove all cached builds
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        logger.debug('Clearing build cache ...')
+        with self._lock:
+            self.entries.clear()
+            if self.connection:
+                with self.connection:
+                    self.connection.execute('DELETE FROM builds')
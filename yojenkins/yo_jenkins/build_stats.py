@@ -0,0 +1,251 @@
+"""Build Stats class definition"""
+
+import logging
+import math
+from array import array
+from typing import Dict, Iterable, List
+
+from yojenkins.yo_jenkins.status import BuildStatus
+
+# Getting the logger reference
+logger = logging.getLogger()
+
+# Result code of each build result, stored per build instead of the result text
+BUILD_RESULT_CODES = (BuildStatus.RUNNING.value, BuildStatus.SUCCESS.value, BuildStatus.UNSTABLE.value,
+                      BuildStatus.FAILURE.value, BuildStatus.ABORTED.value, 'NOT_BUILT', BuildStatus.UNKNOWN.value)
+RESULT_CODE_RUNNING = BUILD_RESULT_CODES.index(BuildStatus.RUNNING.value)
+RESULT_CODE_UNKNOWN = BUILD_RESULT_CODES.index(BuildStatus.UNKNOWN.value)
+
+
+class BuildStats:
+    """Build duration and result statistics over the build history of a job
+
+    Details: The history is stored as columns (one typed `array` each for build numbers,
+             timestamps, durations, and result codes) in build order, oldest first. This keeps
+             thousands of builds compact, and each statistic is one pass over a single column.
+    """
+
+    def __init__(self, job_url: str = '') -> None:
+        """Object constructor method, called at object creation
+
+        Args:
+            job_url : URL of the job of the builds
+
+        Returns:
+            None
+        """
+        self.job_url = job_url
+
+        self.numbers = array('q')
+        self.timestamps = array('q')
+        self.durations = array('q')
+        self.results = array('b')
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    @classmethod
+    def from_history(cls, builds: Iterable[Dict], job_url: str = '') -> 'BuildStats':
+        """Create the build statistics from past builds, as returned by `Job.build_history()`
+
+        Args:
+            builds  : Iterable of past builds, newest first
+            job_url : URL of the job of the builds
+
+        Returns:
+            BuildStats object
+        """
+        build_stats = cls(job_url=job_url)
+        for build in builds:
+            build_stats.append(build)
+
+        # Build history is newest first, store oldest first
+        for column in [build_stats.numbers, build_stats.timestamps, build_stats.durations, build_stats.results]:
+            column.reverse()
+
+        logger.debug(f'Loaded {len(build_stats)} builds into build stats for job: {job_url}')
+        return build_stats
+
+    def append(self, build: Dict) -> None:
+        """Add one build to the columns
+
+        Args:
+            build : Build with `number`, `result`, `timestamp`, and `duration`
+
+        Returns:
+            None
+        """
+        result = build.get('result')
+        result = BuildStatus.RUNNING.value if result is None else result
+        self.numbers.append(build.get('number', 0))
+        self.timestamps.append(build.get('timestamp', 0))
+        self.durations.append(build.get('duration', 0))
+        self.results.append(BUILD_RESULT_CODES.index(result) if result in BUILD_RESULT_CODES else RESULT_CODE_UNKNOWN)
+
+    def completed_durations(self) -> array:
+        """Get the durations of all builds that are not running anymore
+
+        Args:
+            None
+
+        Returns:
+            Durations in milliseconds, oldest build first
+        """
+        builds = zip(self.durations, self.results)
+        return array('q', (duration for duration, result in builds if result != RESULT_CODE_RUNNING))
+
+    @staticmethod
+    def percentiles(values: Iterable[float], percents: Iterable[float] = (50, 90, 95, 99)) -> Dict[str, float]:
+        """Get the percentiles of values, interpolating between the closest ranks
+
+        Args:
+            values   : Values to get the percentiles of
+            percents : Percentiles to get (0 to 100)
+
+        Returns:
+            Percentile values, keyed by percentile name (ie. `p90`)
+        """
+        values_sorted = sorted(values)
+        if not values_sorted:
+            return {f'p{percent:g}': None for percent in percents}
+
+        percentiles = {}
+        for percent in percents:
+            rank = (len(values_sorted) - 1) * percent / 100
+            rank_low, rank_high = math.floor(rank), math.ceil(rank)
+            percentiles[f'p{percent:g}'] = values_sorted[rank_low] + (values_sorted[rank_high] -
+                                                                      values_sorted[rank_low]) * (rank - rank_low)
+        return percentiles
+
+    @staticmethod
+    def moving_average(values: Iterable[float], window: int) -> List[float]:
+        """Get the moving average of values, using a running window sum
+
+        Args:
+            values : Values in order
+            window : Number of values averaged at each position
+
+        Returns:
+            Moving average at each position from the first full window on
+        """
+        values = list(values)
+        window = max(window, 1)
+        if len(values) < window:
+            return []
+        window_sum = sum(values[:window])
+        averages = [window_sum / window]
+        for index in range(window, len(values)):
+            window_sum += values[index] - values[index - window]
+            averages.append(window_sum / window)
+        return averages
+
+    def regression(self, window: int = 10, threshold: float = 0.2) -> Dict:
+        """Detect if recent builds take longer than the builds before them
+
+        Details: The median duration of the last `window` completed builds is compared to the median
+                 duration of all completed builds before them. If it is more than `threshold` slower,
+                 the first build of the slow period is found from the moving average of the durations.
+
+        Args:
+            window    : Number of most recent completed builds checked
+            threshold : Fraction of slowdown counted as a regression (ie. 0.2 is 20% slower)
+
+        Returns:
+            Regression details, with `detected` True if a regression is found
+        """
+        builds = zip(self.numbers, self.durations, self.results)
+        completed = [(number, duration) for number, duration, result in builds if result != RESULT_CODE_RUNNING]
+        regression = {
+            'detected': False,
+            'window': window,
+            'threshold': threshold,
+            'baselineMedianSeconds': None,
+            'recentMedianSeconds': None,
+            'changePercent': None,
+            'firstSlowBuild': None
+        }
+        if len(completed) < window * 2:
+            logger.debug(f'Not enough completed builds ({len(completed)}) to check for a regression')
+            return regression
+
+        durations = [duration for _, duration in completed]
+        baseline_median = self.percentiles(durations[:-window], [50])['p50']
+        recent_median = self.percentiles(durations[-window:], [50])['p50']
+        regression['baselineMedianSeconds'] = round(baseline_median / 1000, 3)
+        regression['recentMedianSeconds'] = round(recent_median / 1000, 3)
+        if baseline_median <= 0:
+            return regression
+
+        regression['changePercent'] = round((recent_median - baseline_median) / baseline_median * 100, 2)
+        if recent_median <= baseline_median * (1 + threshold):
+            return regression
+        regression['detected'] = True
+
+        # Moving average window from which on the average stays above the regression limit
+        duration_limit = baseline_median * (1 + threshold)
+        averages = self.moving_average(durations, window)
+        window_index = len(averages)
+        while window_index > 0 and averages[window_index - 1] > duration_limit:
+            window_index -= 1
+
+        # First build in that window slower than the limit
+        for index in range(window_index, len(durations)):
+            if durations[index] > duration_limit:
+                regression['firstSlowBuild'] = completed[index][0]
+                break
+
+        return regression
+
+    def summary(self, window: int = 10, threshold: float = 0.2) -> Dict:
+        """Get the duration and result statistics of the build history
+
+        Args:
+            window    : Number of builds used for the moving average and for regression detection
+            threshold : Fraction of slowdown counted as a regression (ie. 0.2 is 20% slower)
+
+        Returns:
+            Build statistics
+        """
+        completed_durations = self.completed_durations()
+        result_counts = {result_text: 0 for result_text in BUILD_RESULT_CODES}
+        for result in self.results:
+            result_counts[BUILD_RESULT_CODES[result]] += 1
+        completed_count = len(self) - result_counts[BuildStatus.RUNNING.value]
+
+        duration_stats = {'min': None, 'max': None, 'mean': None}
+        if completed_durations:
+            duration_stats = {
+                'min': min(completed_durations),
+                'max': max(completed_durations),
+                'mean': sum(completed_durations) / len(completed_durations)
+            }
+        duration_stats.update(self.percentiles(completed_durations))
+        duration_seconds = {
+            key: round(value / 1000, 3) if value is not None else None
+            for key, value in duration_stats.items()
+        }
+
+        failure_rate = None
+        if completed_count:
+            failure_rate = round(result_counts[BuildStatus.FAILURE.value] / completed_count, 4)
+
+        moving_average = None
+        moving_averages = self.moving_average(completed_durations, window)
+        if moving_averages:
+            moving_average = round(moving_averages[-1] / 1000, 3)
+
+        return {
+            'jobUrl': self.job_url,
+            'buildCount': len(self),
+            'completedCount': completed_count,
+            'firstBuildNumber': self.numbers[0] if self.numbers else None,
+            'lastBuildNumber': self.numbers[-1] if self.numbers else None,
+            'resultCounts': {
+                result_text: count
+                for result_text, count in result_counts.items() if count
+            },
+            'failureRate': failure_rate,
+            'durationSeconds': duration_seconds,
+            'movingAverageSeconds': moving_average,
+            'regression': self.regression(window=window, threshold=threshold)
+        }
@@ -0,0 +1,246 @@
+"""Config Drift class definition"""
+
+import hashlib
+import logging
+import re
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from yojenkins.utility import line_diff
+
+# Getting the logger reference
+logger = logging.getLogger()
+
+# Config elements that differ between jobs of the same template, not compared by default
+CONFIG_VOLATILE_ELEMENTS = ('description', 'displayName')
+
+# Config attributes that differ between jobs of the same template (plugin versions), never compared
+CONFIG_VOLATILE_ATTRIBUTES = ('plugin', )
+
+# Number of characters of the config hash used as the config fingerprint
+CONFIG_FINGERPRINT_LENGTH = 16
+
+
+class ConfigDrift:
+    """Grouping of jobs by their configuration, finding the jobs that drifted from their template
+
+    Details: Each job config.xml is reduced to canonical lines: one line per element with sorted
+             attributes, whitespace collapsed text, and without volatile elements and attributes.
+             Mentions of the job name are replaced with a placeholder. Jobs with the same canonical
+             config share a fingerprint. Fingerprints of at least `min_group_size` jobs, not similar to
+             a larger template, are templates. All other jobs are outliers. All jobs of a template share
+             the same config, and the first of them by name is shown as the template job. Configs are
+             only compared with the templates. Outliers at least `threshold` similar to a template are
+             diffed against the most similar one, all others are unmatched. The number of comparisons
+             grows with distinct configs times templates, not with jobs squared.
+    """
+
+    def __init__(self,
+                 min_group_size: int = 2,
+                 threshold: float = 0.8,
+                 ignore_elements: Iterable[str] = CONFIG_VOLATILE_ELEMENTS) -> None:
+        """Object constructor method, called at object creation
+
+        Args:
+            min_group_size  : Least number of jobs sharing a config for it to be a template
+            threshold       : Similarity (0 to 1) to a template from which on a config is an outlier of it
+            ignore_elements : Tags of config elements left out of the comparison
+
+        Returns:
+            None
+        """
+        self.min_group_size = max(min_group_size, 1)
+        self.threshold = threshold
+        self.ignore_elements = set(ignore_elements)
+
+        self.jobs = []
+        self.fingerprints = []
+        self.config_lines = {}
+        self.config_paths = {}
+        self.config_line_sets = {}
+        self.failed_jobs = []
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def canonical_lines(self, config_xml: str, job_name: str = '') -> Tuple[List[str], List[str]]:
+        """Reduce a config.xml to canonical lines
+
+        Args:
+            config_xml : Contents of the config.xml
+            job_name   : (Optional) Name of the job, replaced with a placeholder in the config
+
+        Returns:
+            Canonical lines, and the element path of each line
+        """
+        lines, paths = [], []
+        job_name_pattern = re.compile(rf'(?<![\w-]){re.escape(job_name)}(?![\w-])') if job_name else None
+
+        def add_line(line: str, depth: int, path: str) -> None:
+            if job_name_pattern:
+                line = job_name_pattern.sub('<JOB_NAME>', line)
+            lines.append(f'{"  " * depth}{line}')
+            paths.append(path)
+
+        def add_element(element: ET.Element, depth: int, parent_path: str) -> None:
+            if element.tag in self.ignore_elements:
+                return
+            path = f'{parent_path}/{element.tag}' if parent_path else element.tag
+            attributes = ''.join(f' {name}="{value}"' for name, value in sorted(element.attrib.items())
+                                 if name not in CONFIG_VOLATILE_ATTRIBUTES)
+            text_lines = [' '.join(line.split()) for line in (element.text or '').splitlines() if line.strip()]
+            children = list(element)
+            if not children and len(text_lines) < 2:
+                text = text_lines[0] if text_lines else ''
+                add_line(f'<{element.tag}{attributes}>{text}</{element.tag}>', depth, path)
+                return
+            add_line(f'<{element.tag}{attributes}>', depth, path)
+            for text_line in text_lines:
+                add_line(text_line, depth + 1, path)
+            for child in children:
+                add_element(child, depth + 1, path)
+            add_line(f'</{element.tag}>', depth, path)
+
+        add_element(ET.fromstring(config_xml.encode('utf-8')), 0, '')
+        return lines, paths
+
+    def add(self, job: Dict, config_xml: str) -> None:
+        """Add the configuration of a job
+
+        Args:
+            job        : Job with at least `url`, and optionally `name` and `fullname`
+            config_xml : Contents of the job config.xml
+
+        Returns:
+            None
+        """
+        try:
+            lines, paths = self.canonical_lines(config_xml, job.get('name', ''))
+        except ET.ParseError as error:
+            logger.debug(f'Failed to parse config of job, skipping it: {job.get("url")}. Exception: {error}')
+            self.failed_jobs.append(job)
+            return
+        fingerprint = hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()[:CONFIG_FINGERPRINT_LENGTH]
+        if fingerprint not in self.config_lines:
+            self.config_lines[fingerprint] = lines
+            self.config_paths[fingerprint] = paths
+            self.config_line_sets[fingerprint] = set(lines)
+        self.jobs.append(job)
+        self.fingerprints.append(fingerprint)
+
+    def similarity(self, fingerprint_1: str, fingerprint_2: str) -> float:
+        """Similarity of two added configs
+
+        Args:
+            fingerprint_1 : Fingerprint of the first config
+            fingerprint_2 : Fingerprint of the second config
+
+        Returns:
+            Jaccard similarity (0 to 1) of the sets of canonical lines
+        """
+        lines_1, lines_2 = self.config_line_sets[fingerprint_1], self.config_line_sets[fingerprint_2]
+        return len(lines_1 & lines_2) / max(len(lines_1 | lines_2), 1)
+
+    def diff(self, fingerprint_1: str, fingerprint_2: str) -> List[str]:
+        """Changed lines between two added configs
+
+        Args:
+            fingerprint_1 : Fingerprint of the config compared against
+            fingerprint_2 : Fingerprint of the compared config
+
+        Returns:
+            Lines of the changes, each group headed by the element path of its first line
+        """
+        lines_1, lines_2 = self.config_lines[fingerprint_1], self.config_lines[fingerprint_2]
+        paths_1, paths_2 = self.config_paths[fingerprint_1], self.config_paths[fingerprint_2]
+        diff_lines = []
+        for tag, start_1, end_1, start_2, end_2 in line_diff.diff_opcodes(lines_1, lines_2):
+            if tag == 'equal':
+                continue
+            path = paths_1[start_1] if start_1 < end_1 else paths_2[start_2]
+            diff_lines.append(f'@@ {path} @@')
+            diff_lines.extend(f'- {line}' for line in lines_1[start_1:end_1])
+            diff_lines.extend(f'+ {line}' for line in lines_2[start_2:end_2])
+        return diff_lines
+
+    def groups(self) -> List[Dict]:
+        """Group the added jobs by config fingerprint and attach the outliers to their closest template
+
+        Args:
+            None
+
+        Returns:
+            Template groups, largest first, each with its jobs and its outliers. Outliers less than
+            `threshold` similar to every template are in a last group without a fingerprint
+        """
+        fingerprint_jobs = defaultdict(list)
+        for job, fingerprint in zip(self.jobs, self.fingerprints):
+            fingerprint_jobs[fingerprint].append(job)
+
+        # Largest groups first, a group similar to a larger template is a drifted copy of it
+        templates, outliers = [], []
+        for fingerprint in sorted(fingerprint_jobs,
+                                  key=lambda fingerprint: (-len(fingerprint_jobs[fingerprint]), fingerprint)):
+            if len(fingerprint_jobs[fingerprint]) < self.min_group_size or any(
+                    self.similarity(template, fingerprint) >= self.threshold for template in templates):
+                outliers.append(fingerprint)
+            else:
+                templates.append(fingerprint)
+        logger.debug(f'Found {len(fingerprint_jobs)} distinct configs of {len(self.jobs)} jobs: '
+                     f'{len(templates)} templates, {len(outliers)} outlier configs')
+
+        groups = {
+            fingerprint: {
+                'group': None,
+                'fingerprint': fingerprint,
+                'jobCount': len(fingerprint_jobs[fingerprint]),
+                'templateJob': min(self._job_name(job) for job in fingerprint_jobs[fingerprint]),
+                'jobs': sorted(self._job_name(job) for job in fingerprint_jobs[fingerprint]),
+                'outliers': [],
+            }
+            for fingerprint in templates
+        }
+
+        unmatched = []
+        for outlier in outliers:
+            similarities = [(self.similarity(template, outlier), template) for template in templates]
+            similarity, template = max(similarities, default=(0.0, None))
+            matched = template is not None and similarity >= self.threshold
+            diff = self.diff(template, outlier) if matched else None
+            for job in fingerprint_jobs[outlier]:
+                outlier_info = {'job': self._job_name(job), 'fingerprint': outlier, 'similarity': round(similarity, 3)}
+                if not matched:
+                    unmatched.append(outlier_info)
+                    continue
+                outlier_info['diff'] = diff
+                groups[template]['outliers'].append(outlier_info)
+
+        groups = list(groups.values())
+        for group in groups:
+            group['outliers'].sort(key=lambda outlier: (-outlier['similarity'], outlier['job']))
+        if unmatched:
+            groups.append({
+                'group': None,
+                'fingerprint': None,
+                'jobCount': 0,
+                'templateJob': None,
+                'jobs': [],
+                'outliers': sorted(unmatched, key=lambda outlier: outlier['job']),
+            })
+        for group_number, group in enumerate(groups, start=1):
+            group['group'] = group_number
+
+        return groups
+
+    @staticmethod
+    def _job_name(job: Dict) -> str:
+        """Get the full name of a job, falling back to its URL
+
+        Args:
+            job : Job information
+
+        Returns:
+            Full name of the job
+        """
+        return job.get('fullname') or job.get('fullName') or job.get('name') or job.get('url', '')
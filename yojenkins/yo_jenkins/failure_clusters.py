@@ -0,0 +1,247 @@
+"""Failure Clusters class definition"""
+
+import logging
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+# Getting the logger reference
+logger = logging.getLogger()
+
+# Volatile parts of log lines, replaced in order before comparing lines. Short numbers (ie. status
+# and exit codes) tell failures apart and are kept, only long numbers (ie. IDs, sizes) are replaced
+LOG_LINE_NORMALIZE_PATTERNS = (
+    (re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?'), '<TIME>'),
+    (re.compile(r'\b\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\b'), '<TIME>'),
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<UUID>'),
+    (re.compile(r'\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{7,}\b'), '<HASH>'),
+    (re.compile(r'(?:/tmp|/var/tmp|/var/folders|/private/var/folders|[A-Za-z]:\\Users\\[^\\\s]+\\AppData\\Local\\Temp)'
+                r'[^\s:\'"]*'), '<TMP>'),
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b'), '<IP>'),
+    (re.compile(r'\b\d{4,}\b'), '<N>'),
+    (re.compile(r'\s+'), ' '),
+)
+
+# Log lines that likely describe an error
+ERROR_LINE_PATTERN = re.compile(
+    r'error|exception|fail|fatal|traceback|denied|refused|timed? ?out|not found|exit code|returned \d+|cannot|unable',
+    re.IGNORECASE)
+
+# Status, exit, and error codes of error lines. Builds are only grouped if their error tails have the same codes
+FAILURE_CODE_PATTERN = re.compile(r'(?:error|code|status|exit|returned|signal|HTTP)\W{0,3}(\d{1,3})\b', re.IGNORECASE)
+
+# Log lines that every failed build has, not part of the failure signature
+GENERIC_LINE_PATTERN = re.compile(r'^(?:\[Pipeline\]|Finished: |ERROR: script returned exit code)')
+
+# Largest prime below 2^61, for the MinHash hash functions
+MINHASH_PRIME = (1 << 61) - 1
+
+
+class FailureClusters:
+    """Grouping of failed builds that failed in the same way
+
+    Details: The error tail of each build log (its last error lines) is normalized, removing
+             volatile tokens like timestamps, hashes, temporary paths, long numbers, and the number
+             of the build itself. Short numbers like status and exit codes are kept. The normalized
+             tail is reduced to a MinHash signature of its token 3-grams. Builds are grouped by
+             locality sensitive hashing on the signature bands, joining builds whose estimated
+             similarity is at least the threshold and whose error tails have the same status,
+             exit, and error codes. No two logs are ever compared line by line.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.5,
+                 tail_lines: int = 10,
+                 hash_count: int = 64,
+                 band_count: int = 32,
+                 seed: int = 1) -> None:
+        """Object constructor method, called at object creation
+
+        Args:
+            threshold  : Estimated similarity (0 to 1) of error tails from which on builds are grouped
+            tail_lines : Number of last error lines of each log used as the failure signature
+            hash_count : Number of MinHash hash functions
+            band_count : Number of signature bands for locality sensitive hashing
+            seed       : Seed of the MinHash hash functions
+
+        Returns:
+            None
+        """
+        self.threshold = threshold
+        self.tail_lines = tail_lines
+        self.band_count = max(min(band_count, hash_count), 1)
+        self.band_rows = max(hash_count // self.band_count, 1)
+
+        randrange = random.Random(seed).randrange
+        hash_count = self.band_count * self.band_rows
+        self.hash_functions = [(randrange(1, MINHASH_PRIME), randrange(MINHASH_PRIME)) for _ in range(hash_count)]
+
+        self.builds = []
+        self.signatures = []
+        self.error_tails = []
+        self.failure_codes = []
+
+    def __len__(self) -> int:
+        return len(self.builds)
+
+    @staticmethod
+    def normalize_line(line: str, build_number: int = None) -> str:
+        """Replace the volatile tokens of a log line with placeholders
+
+        Details: The build number is only replaced where it names the build (ie. `#12`, `/12/`,
+                 `build 12`), so a matching status or exit code is kept
+
+        Args:
+            line         : Log line
+            build_number : (Optional) Number of the build the line is from
+
+        Returns:
+            Normalized log line
+        """
+        if build_number is not None:
+            line = re.sub(rf'(?:(?<=[#/])|(?<=build )|(?<=run )){build_number}(?![\w.])',
+                          '<BUILD>',
+                          line,
+                          flags=re.IGNORECASE)
+        for pattern, placeholder in LOG_LINE_NORMALIZE_PATTERNS:
+            line = pattern.sub(placeholder, line)
+        return line.strip()
+
+    def error_tail(self, log_lines: Iterable[str]) -> List[str]:
+        """Get the last error lines of a log
+
+        Details: If no line looks like an error, the last lines of the log are used
+
+        Args:
+            log_lines : Lines of the log, or of its end
+
+        Returns:
+            Up to `tail_lines` last error lines, in log order
+        """
+        log_lines = [line.strip() for line in log_lines]
+        log_lines = [line for line in log_lines if line and not GENERIC_LINE_PATTERN.match(line)]
+        error_lines = [line for line in log_lines if ERROR_LINE_PATTERN.search(line)]
+        return (error_lines or log_lines)[-self.tail_lines:]
+
+    @staticmethod
+    def failure_code_set(error_tail: List[str]) -> Tuple[str, ...]:
+        """Get the status, exit, and error codes of an error tail
+
+        Args:
+            error_tail : Error lines of a log
+
+        Returns:
+            Sorted distinct codes
+        """
+        return tuple(sorted({code for line in error_tail for code in FAILURE_CODE_PATTERN.findall(line)}))
+
+    def signature(self, error_tail: List[str], build_number: int = None) -> Tuple[int, ...]:
+        """Get the MinHash signature of the token 3-grams of a normalized error tail
+
+        Args:
+            error_tail   : Error lines of a log
+            build_number : (Optional) Number of the build of the log
+
+        Returns:
+            MinHash signature, one value per hash function
+        """
+        tokens = re.findall(r'<\w+>|\w+|[^\w\s]',
+                            ' '.join(self.normalize_line(line, build_number) for line in error_tail))
+        shingles = {
+            zlib.crc32(' '.join(tokens[index:index + 3]).encode('utf-8'))
+            for index in range(max(len(tokens) - 2, 1))
+        }
+        return tuple(min((a * shingle + b) % MINHASH_PRIME for shingle in shingles) for a, b in self.hash_functions)
+
+    def add(self, build: Dict, log_lines: Iterable[str]) -> None:
+        """Add the log of a failed build
+
+        Args:
+            build     : Build with at least `url`, and optionally `number` and `result`
+            log_lines : Lines of the build log, or of its end
+
+        Returns:
+            None
+        """
+        error_tail = self.error_tail(log_lines)
+        self.builds.append(build)
+        self.error_tails.append(error_tail)
+        self.signatures.append(self.signature(error_tail, build.get('number')))
+        self.failure_codes.append(self.failure_code_set(error_tail))
+
+    def similarity(self, index_1: int, index_2: int) -> float:
+        """Estimated similarity of the error tails of two added builds
+
+        Args:
+            index_1 : Index of the first build
+            index_2 : Index of the second build
+
+        Returns:
+            Estimated Jaccard similarity (0 to 1) of the error tail 3-grams
+        """
+        signature_1, signature_2 = self.signatures[index_1], self.signatures[index_2]
+        return sum(value_1 == value_2 for value_1, value_2 in zip(signature_1, signature_2)) / len(signature_1)
+
+    def clusters(self) -> List[Dict]:
+        """Group the added builds by failure signature
+
+        Args:
+            None
+
+        Returns:
+            Clusters, largest first, each with its builds and the error tail of its latest build
+        """
+        # Union-find of build indexes
+        parents = list(range(len(self.builds)))
+
+        def find(index: int) -> int:
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        # Only builds sharing a whole signature band and their failure codes are compared
+        comparisons = 0
+        for band in range(self.band_count):
+            band_buckets = defaultdict(list)
+            for index, signature in enumerate(self.signatures):
+                band_key = (self.failure_codes[index], signature[band * self.band_rows:(band + 1) * self.band_rows])
+                band_buckets[band_key].append(index)
+            for bucket in band_buckets.values():
+                for index in bucket[1:]:
+                    root_1, root_2 = find(bucket[0]), find(index)
+                    if root_1 == root_2:
+                        continue
+                    comparisons += 1
+                    if self.similarity(bucket[0], index) >= self.threshold:
+                        parents[root_2] = root_1
+        logger.debug(f'Grouped {len(self.builds)} builds with {comparisons} signature comparisons')
+
+        groups = defaultdict(list)
+        for index in range(len(self.builds)):
+            groups[find(index)].append(index)
+
+        clusters = []
+        for indexes in groups.values():
+            indexes.sort(key=lambda index: self.builds[index].get('number') or 0, reverse=True)
+            builds = [self.builds[index] for index in indexes]
+            build_numbers = [build.get('number') for build in builds if build.get('number') is not None]
+            clusters.append({
+                'cluster': None,
+                'buildCount': len(builds),
+                'firstBuildNumber': min(build_numbers) if build_numbers else None,
+                'lastBuildNumber': max(build_numbers) if build_numbers else None,
+                'buildNumbers': build_numbers,
+                'buildUrls': [build.get('url') for build in builds],
+                'signature': [
+                    self.normalize_line(line, builds[0].get('number')) for line in self.error_tails[indexes[0]]
+                ],
+                'errorTail': self.error_tails[indexes[0]],
+            })
+        clusters.sort(key=lambda cluster: (cluster['buildCount'], cluster['lastBuildNumber'] or 0), reverse=True)
+        for cluster_number, cluster in enumerate(clusters, start=1):
+            cluster['cluster'] = cluster_number
+
+        return clusters
@@ -4,14 +4,17 @@ import json
 import logging
 import re
 from time import perf_counter
-from typing import Dict, Tuple
+from typing import Dict, Generator, Tuple
 
 import xmltodict
 
+from yojenkins.monitor import FolderMonitor
 from yojenkins.utility import utility
 from yojenkins.utility.utility import fail_out
+from yojenkins.yo_jenkins.item_index import ItemIndex
 from yojenkins.yo_jenkins.jenkins_item_classes import JenkinsItemClasses
 from yojenkins.yo_jenkins.jenkins_item_config import JenkinsItemConfig
+from yojenkins.yo_jenkins.jenkins_item_tree import JenkinsItemTree
 
 # Getting the logger reference
 logger = logging.getLogger()
@@ -20,7 +23,7 @@ logger = logging.getLogger()
 class Folder():
     """TODO Folder"""
 
-    def __init__(self, rest, JenkinsSDK) -> None:
+    def __init__(self, rest, JenkinsSDK, auth) -> None:
         """Object constructor method, called at object creation
 
         Args:
@@ -31,60 +34,174 @@ class Folder():
         """
         self.rest = rest
         self.jenkins_sdk = JenkinsSDK
+        self.auth = auth
 
-        # Recursive search results
+        self.FM = FolderMonitor(rest, auth, self)
+
+        # Local item index, only used if enabled
+        self.item_index = None
+
+        # Search results
         self.search_results = []
         self.search_items_count = 0
 
-    def __recursive_search(self, search_pattern: str, search_list: list, level: int, fullname: bool = True) -> None:
-        """Recursive search method for folders
-
-        Details: Matched pattern findings are storred in the object: `self.search_results`
+    def item_index_enable(self, item_index: ItemIndex) -> None:
+        """Use a local item index to look up folder items before requesting them from the server
 
         Args:
-            search_pattern : REGEX pattern to match for each item
-            search_list    : List of items
-            level          : Current recursion level
-            fullname       : Search the entire path of the item, not just the item name
+            item_index : Item index of the current profile and server
 
         Returns:
             None
         """
-        # Current directory level
-        level += 1
+        logger.debug(f'Enabling item index for folder items (TTL: {item_index.ttl} seconds)')
+        self.item_index = item_index
+
+    def _items_info(self, folder_name: str = '', folder_url: str = '') -> Dict:
+        """Get the folder information with only its items (jobs, views)
+
+        Details: If the item index is enabled and holds a valid entry for this folder, the server
+                 is not contacted.
+
+        Args:
+            folder_name : Folder name to get the items of
+            folder_url  : Folder URL to get the items of
+
+        Returns:
+            Folder information with its items
+        """
+        if folder_name and not folder_url:
+            folder_url = utility.name_to_url(self.rest.get_server_url(), folder_name)
+
+        if self.item_index:
+            folder_info = self.item_index.folder_get(folder_url)
+            if folder_info:
+                logger.debug(f'Using item index for folder items: {folder_url}')
+                return folder_info
+
+        folder_info = self.info(folder_url=folder_url, tree=JenkinsItemTree.FOLDER_ITEMS.value)
+        if self.item_index:
+            self.item_index.folder_put(folder_url, folder_info)
 
-        # Loop through all sub-folders
-        for list_item in search_list:
-            # print(level, "   " * level, list_item['name'])
+        return folder_info
+
+    def crawl(self,
+              folder_name: str = '',
+              folder_url: str = '',
+              folder_depth: int = 4,
+              max_concurrent: int = 16) -> Generator[Dict, None, None]:
+        """Crawl the folder tree breadth-first and yield every item found
 
-            # Check if folder
-            if list_item['_class'] in JenkinsItemClasses.FOLDER.value['class_type']:
+        Details: All folders of one folder level are requested concurrently, each only returning
+                 the name, full name, URL, and class of its items. Items are yielded as soon as
+                 their folder request completes. Level 0 are the items directly in the starting folder.
+                 If the item index is enabled, only folders without a valid index entry are requested.
 
-                # Get fullname if specified and available, else get name
-                if fullname:
-                    dict_key = "fullname" if "fullname" in list_item else "name"
+        Args:
+            folder_name    : (Optional) Folder name to start from. Default is the server root
+            folder_url     : (Optional) Folder URL to start from. Default is the server root
+            folder_depth   : Number of sub-folder levels to look through
+            max_concurrent : Maximum number of folder requests in flight at once
+
+        Returns:
+            Generator of item information, each with an added `fullname` key
+        """
+        if folder_name and not folder_url:
+            folder_url = utility.name_to_url(self.rest.get_server_url(), folder_name)
+        if not folder_url:
+            folder_url = self.rest.get_server_url()
+
+        folder_urls = [folder_url.strip('/') + '/']
+        for level in range(folder_depth + 1):
+            logger.debug(f'Crawling folder level {level} ({len(folder_urls)} folders) ...')
+            subfolder_urls = []
+
+            # Folders still valid in the item index
+            folder_request_urls = {}
+            for level_folder_url in folder_urls:
+                folder_info = self.item_index.folder_get(level_folder_url) if self.item_index else {}
+                if folder_info:
+                    yield from self._crawl_folder_items(folder_info, subfolder_urls)
                 else:
-                    dict_key = 'name'
+                    folder_request_urls[f'{level_folder_url}api/json'] = level_folder_url
+            if self.item_index:
+                logger.debug(f'Folders found in item index: {len(folder_urls) - len(folder_request_urls)}')
+
+            # Folders requested from the server
+            responses = self.rest.request_many(folder_request_urls,
+                                               is_endpoint=False,
+                                               tree=JenkinsItemTree.FOLDER_ITEMS.value,
+                                               max_concurrent=max_concurrent)
+            for request_url, folder_info, _, success in responses:
+                if not success:
+                    if level == 0:
+                        fail_out(f'Failed to find folder info: {folder_url}')
+                    logger.debug(f'Failed to get items of folder, skipping it: {request_url}')
+                    continue
+                if self.item_index:
+                    self.item_index.folder_put(folder_request_urls[request_url], folder_info)
+                yield from self._crawl_folder_items(folder_info, subfolder_urls)
+
+            if not subfolder_urls:
+                break
+            folder_urls = subfolder_urls
+
+    @staticmethod
+    def _crawl_folder_items(folder_info: Dict, subfolder_urls: list) -> Generator[Dict, None, None]:
+        """Yield the job items of one crawled folder and collect its sub-folders
 
-                # Match the regex pattern
-                try:
-                    if re.search(search_pattern, list_item[dict_key], re.IGNORECASE):
-                        self.search_results.append(list_item)
-                except re.error as error:
-                    logger.debug(
-                        f'Error while applying REGEX pattern "{search_pattern}" to "{list_item[dict_key]}". Exception: {error}'
-                    )
-                    break
-
-            # Count items searched for record
-            self.search_items_count += 1
+        Args:
+            folder_info    : Folder information with its items
+            subfolder_urls : List to add the URLs of found sub-folders to
 
-            # Check if the item has subitems
-            if not 'jobs' in list_item:
-                continue
+        Returns:
+            Generator of item information, each with an added `fullname` key
+        """
+        for item in folder_info.get(JenkinsItemClasses.FOLDER.value['item_type'], []):
+            item['fullname'] = item.get('fullName', item.get('name', ''))
+            if item['_class'] in JenkinsItemClasses.FOLDER.value['class_type']:
+                subfolder_urls.append(item['url'].strip('/') + '/')
+            yield item
+
+    def search_iter(self,
+                    search_pattern: str,
+                    folder_name: str = '',
+                    folder_url: str = '',
+                    folder_depth: int = 4,
+                    fullname: bool = True) -> Generator[Dict, None, None]:
+        """Search the server for folders matching REGEX pattern, yielding each match as it is found
+
+        Args:
+            search_pattern : REGEX search pattern to match
+            folder_name    : (Optional) Only look within this folder for matching sub-folder using item name
+            folder_url     : (Optional) Only look within this folder for matching sub-folder using item URL
+            folder_depth   : Number of levels to look through
+            fullname       : Search the entire path of the item, not just the item name
+
+        Returns:
+            Generator of matching folder information
+        """
+        logger.debug(f'Folder search pattern: {search_pattern}')
+        try:
+            pattern = re.compile(search_pattern, re.IGNORECASE)
+        except re.error as error:
+            fail_out(f'Failed to use REGEX search pattern "{search_pattern}". Exception: {error}')
+
+        if folder_name or folder_url:
+            # Only search the specified folder
+            logger.debug(f'Searching folder in sub-folder "{folder_name if folder_name else folder_url}"')
+            logger.debug('Folder depth does not apply. Only looking in this specific folder for subfolders')
+            folder_depth = 0
+        else:
+            logger.debug(f'Searching folder in ALL Jenkins. Folder depth: "{folder_depth}"')
 
-            # Keep searching all sub-items for this item. Call itself for some recursion fun
-            self.__recursive_search(search_pattern, list_item['jobs'], level, fullname)
+        self.search_items_count = 0
+        for item in self.crawl(folder_name=folder_name, folder_url=folder_url, folder_depth=folder_depth):
+            self.search_items_count += 1
+            if item['_class'] not in JenkinsItemClasses.FOLDER.value['class_type']:
+                continue
+            if pattern.search(item['fullname'] if fullname else item['name']):
+                yield item
 
     def search(self,
                search_pattern: str,
@@ -106,32 +223,16 @@ class Folder():
         """
         # Start a timer to time the search
         start_time = perf_counter()
-        logger.debug(f'Folder search pattern: {search_pattern}')
-
-        # Get all the jobs
-        if folder_name or folder_url:
-            # Only recursively search the specified folder name
-            logger.debug(f'Searching folder in sub-folder "{folder_name if folder_name else folder_url}"')
-            logger.debug('Folder depth does not apply. Only looking in this specific folder for subfolders')
-            items = self.item_list(folder_name=folder_name, folder_url=folder_url)[0]
-        else:
-            # Search entire Jenkins
-            logger.debug(f'Searching folder in ALL Jenkins. Folder depth: "{folder_depth}"')
-            items = self.jenkins_sdk.get_all_jobs(folder_depth=folder_depth, folder_depth_per_request=20)
 
-        # Search for any matching folders ("jobs")
-        self.search_items_count = 0
-        self.search_results = []
-        self.__recursive_search(search_pattern=search_pattern, search_list=items, level=0, fullname=fullname)
-
-        # Remove duplicates from list (THANKS GeeksForGeeks.org)
-        logger.debug('Removing duplicates if needed ...')
-        self.search_results = [i for n, i in enumerate(self.search_results) if i not in self.search_results[n + 1:]]
+        self.search_results = list(
+            self.search_iter(search_pattern=search_pattern,
+                             folder_name=folder_name,
+                             folder_url=folder_url,
+                             folder_depth=folder_depth,
+                             fullname=fullname))
 
         # Collect URLs only
-        folder_search_results_list = []
-        for search_result in self.search_results:
-            folder_search_results_list.append(search_result['url'])
+        folder_search_results_list = [search_result['url'] for search_result in self.search_results]
 
         # Output search stats
         logger.debug(
@@ -139,12 +240,13 @@ class Folder():
 
         return self.search_results, folder_search_results_list
 
-    def info(self, folder_name: str = '', folder_url: str = '') -> Dict:
+    def info(self, folder_name: str = '', folder_url: str = '', tree: str = '') -> Dict:
         """Get the folder information
 
         Args:
             folder_name : Folder name to get folder information of
             folder_url  : Folder URL to get the folder information of
+            tree        : Folder fields to request from the server (`JenkinsItemTree`). Default all fields
 
         Returns:
             Folder information
@@ -157,7 +259,8 @@ class Folder():
 
         folder_info, _, success = self.rest.request(folder_url.strip('/') + '/api/json',
                                                     request_type='get',
-                                                    is_endpoint=False)
+                                                    is_endpoint=False,
+                                                    tree=tree)
         if not success:
             fail_out(f'Failed to find folder info: {folder_url}')
 
@@ -181,7 +284,7 @@ class Folder():
         logger.debug(f'Getting subfolders for folder name "{folder_name if folder_name else folder_url}" ...')
 
         # Get the folder information
-        folder_info = self.info(folder_name=folder_name, folder_url=folder_url)
+        folder_info = self._items_info(folder_name=folder_name, folder_url=folder_url)
 
         # Extract lists
         sub_folder_list, sub_folder_list_url = utility.item_subitem_list(
@@ -208,7 +311,7 @@ class Folder():
         logger.debug(f'Getting jobs for folder name "{folder_name if folder_name else folder_url}" ...')
 
         # Get the folder information
-        folder_info = self.info(folder_name=folder_name, folder_url=folder_url)
+        folder_info = self._items_info(folder_name=folder_name, folder_url=folder_url)
 
         # Extract lists
         job_list, job_list_url = utility.item_subitem_list(item_info=folder_info,
@@ -232,7 +335,7 @@ class Folder():
             List of views, information list and URL list
         """
         # Get the folder information
-        folder_info = self.info(folder_name=folder_name, folder_url=folder_url)
+        folder_info = self._items_info(folder_name=folder_name, folder_url=folder_url)
 
         logger.debug(f'Getting all view items for folder "{folder_name if folder_name else folder_url}" ...')
         view_list, view_list_url = utility.item_subitem_list(
@@ -261,7 +364,7 @@ class Folder():
         logger.debug(f'Getting items for folder "{folder_name if folder_name else folder_url}" ...')
 
         # Get the folder information
-        folder_info = self.info(folder_name=folder_name, folder_url=folder_url)
+        folder_info = self._items_info(folder_name=folder_name, folder_url=folder_url)
 
         # Getting all possible Jenkins items listed enum
         all_subitems = [subitem.value for subitem in JenkinsItemClasses]
@@ -313,6 +416,36 @@ class Folder():
 
         return success
 
+    def monitor(self, folder_name: str = '', folder_url: str = '', sound: bool = False) -> bool:
+        """Start the monitor UI of all jobs within the folder
+
+        Args:
+            folder_name : Folder name to monitor
+            folder_url  : Folder URL to monitor
+            sound       : Enable sound effects
+
+        Returns:
+            True if successfull, else False
+        """
+        if not folder_name and not folder_url:
+            fail_out('No folder name or folder URL provided')
+
+        if folder_url:
+            folder_url = folder_url.strip('/')
+        else:
+            folder_url = utility.name_to_url(self.rest.get_server_url(), folder_name)
+
+        if not self.rest.request(f'{folder_url.strip("/")}/api/json', 'head', is_endpoint=False)[2]:
+            fail_out(f'Failed to find folder. The folder may not exist: {folder_url}')
+
+        logger.debug(f'Starting monitor for: "{folder_url}" ...')
+        success = self.FM.monitor_start(folder_url=folder_url, sound=sound)
+        if not success:
+            fail_out('Failed to start folder monitor')
+        logger.debug('Successfully started folder monitor')
+
+        return success
+
     def config(self,
                filepath: str = '',
                folder_name: str = '',
@@ -0,0 +1,133 @@
+"""Item Index class definition"""
+
+import json
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from time import time
+from typing import Dict
+
+from yojenkins.utility.utility import CONFIG_DIR_NAME
+
+# Getting the logger reference
+logger = logging.getLogger()
+
+ITEM_INDEX_FILE_NAME = 'item_index.sqlite'
+
+
+class ItemIndex:
+    """Local on-disk index of the items (jobs, folders, views) within each server folder
+
+    Details: Each folder is stored with the time it was fetched, together with its direct items
+             (full name, URL, class, parent folder). A folder is only served from the index while
+             it is younger than the index TTL. Every profile and server has its own index entries.
+    """
+
+    def __init__(self, profile: str, server_url: str, ttl: int = 600, index_dir: str = '') -> None:
+        """Object constructor method, called at object creation
+
+        Args:
+            profile    : Name of the yojenkins profile used
+            server_url : Server URL of the profile
+            ttl        : Number of seconds a fetched folder is valid in the index
+            index_dir  : Directory of the index file. Default is the yojenkins configuration directory
+
+        Returns:
+            None
+        """
+        self.profile = profile
+        self.server_url = server_url.strip('/') + '/'
+        self.ttl = ttl
+
+        if not index_dir:
+            index_dir = os.path.join(Path.home(), CONFIG_DIR_NAME)
+        os.makedirs(index_dir, exist_ok=True)
+        self.index_file_path = os.path.join(index_dir, ITEM_INDEX_FILE_NAME)
+
+        logger.debug(f'Opening item index "{self.index_file_path}" (TTL: {self.ttl} seconds) ...')
+        self.connection = sqlite3.connect(self.index_file_path, timeout=10)
+        with self.connection:
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS folders (
+                    profile TEXT, server_url TEXT, url TEXT, class TEXT, fetched_at REAL,
+                    PRIMARY KEY (profile, server_url, url))''')
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS items (
+                    profile TEXT, server_url TEXT, parent_url TEXT, item_type TEXT,
+                    url TEXT, full_name TEXT, class TEXT, info TEXT,
+                    PRIMARY KEY (profile, server_url, parent_url, item_type, url))''')
+            self.connection.execute('''
+                CREATE INDEX IF NOT EXISTS items_full_name ON items (profile, server_url, full_name)''')
+
+    def folder_get(self, folder_url: str) -> Dict:
+        """Get the indexed folder information with its items, if it is still valid
+
+        Args:
+            folder_url : URL of the folder
+
+        Returns:
+            Folder information with `jobs` and `views` items, empty if not indexed or expired
+        """
+        folder_url = folder_url.strip('/') + '/'
+        folder_row = self.connection.execute(
+            'SELECT class, fetched_at FROM folders WHERE profile = ? AND server_url = ? AND url = ?',
+            (self.profile, self.server_url, folder_url)).fetchone()
+        if not folder_row:
+            return {}
+        folder_class, fetched_at = folder_row
+        if time() - fetched_at > self.ttl:
+            logger.debug(f'Item index entry expired ({time() - fetched_at:.0f} seconds old): {folder_url}')
+            return {}
+
+        folder_info = {'_class': folder_class, 'url': folder_url, 'jobs': [], 'views': []}
+        item_rows = self.connection.execute(
+            'SELECT item_type, info FROM items WHERE profile = ? AND server_url = ? AND parent_url = ?',
+            (self.profile, self.server_url, folder_url))
+        for item_type, item_info in item_rows:
+            folder_info.setdefault(item_type, []).append(json.loads(item_info))
+
+        return folder_info
+
+    def folder_put(self, folder_url: str, folder_info: Dict) -> None:
+        """Replace the indexed items of a folder with the freshly fetched folder information
+
+        Args:
+            folder_url  : URL of the folder
+            folder_info : Folder information with `jobs` and `views` items
+
+        Returns:
+            None
+        """
+        folder_url = folder_url.strip('/') + '/'
+        item_rows = []
+        for item_type in ['jobs', 'views']:
+            for item in folder_info.get(item_type, []):
+                if 'url' not in item:
+                    continue
+                full_name = item.get('fullName', '')
+                item_rows.append((self.profile, self.server_url, folder_url, item_type, item['url'], full_name,
+                                  item.get('_class', ''), json.dumps(item)))
+
+        with self.connection:
+            self.connection.execute('DELETE FROM items WHERE profile = ? AND server_url = ? AND parent_url = ?',
+                                    (self.profile, self.server_url, folder_url))
+            self.connection.executemany('INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?)', item_rows)
+            self.connection.execute('INSERT OR REPLACE INTO folders VALUES (?, ?, ?, ?, ?)',
+                                    (self.profile, self.server_url, folder_url, folder_info.get('_class', ''), time()))
+
+    def clear(self) -> None:
+        """Remove all indexed folders and items of this profile and server
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        logger.debug(f'Clearing item index for profile "{self.profile}" and server "{self.server_url}" ...')
+        with self.connection:
+            self.connection.execute('DELETE FROM items WHERE profile = ? AND server_url = ?',
+                                    (self.profile, self.server_url))
+            self.connection.execute('DELETE FROM folders WHERE profile = ? AND server_url = ?',
+                                    (self.profile, self.server_url))
@@ -0,0 +1,50 @@
+"""Jenkins REST API tree projection definition"""
+
+from enum import Enum
+
+
+class JenkinsItemTree(Enum):
+    """Enum of Jenkins REST API `tree` query projections, grouped by item
+
+    Each projection holds only the fields that the specific caller reads from the
+    returned JSON object. Passing it to the server (`api/json?tree=<projection>`) keeps the
+    server from serializing, and the client from decoding, the rest of the item.
+
+    Notes:
+        - `_class` and `url` are always included, item type checks and derived fields depend on them
+        - A nested field without `[...]` only returns its `_class`, list all sub-fields needed
+        - A range suffix `{M,N}` limits a nested list (ie. `builds[number]{0,10}`)
+
+    Usage Examples:
+        - `self.rest.request(url, 'get', tree=JenkinsItemTree.BUILD_URL.value)`
+    """
+
+    # Job
+    JOB_BUILDS = '_class,url,builds[_class,number,url]'
+    JOB_LAST_BUILD = '_class,url,fullName,lastBuild[_class,number,url]'
+    JOB_BUILD_RANGE = '_class,url,fullName,firstBuild[_class,number,url],lastBuild[_class,number,url]'
+    JOB_NEXT_BUILD_NUMBER = '_class,url,nextBuildNumber'
+    JOB_PARAMETERS = ('_class,url,actions[_class,parameterDefinitions[_class,name,type,description,choices,'
+                      'defaultParameterValue[_class,name,value]]]')
+    JOB_RUNNING_BUILDS = '_class,url,builds[_class,number,url,building]'
+    JOB_BUILD_HISTORY = '_class,url,allBuilds[_class,number,result,timestamp,duration,url]'
+    JOB_BUILD_NUMBERS = '_class,url,allBuilds[number,url]'
+    JOB_MONITOR = '_class,url,displayName,builds[_class,number,url]'
+
+    # Build
+    BUILD_URL = '_class,url'
+    BUILD_STATUS = '_class,url,building,result,timestamp,duration,estimatedDuration'
+    BUILD_PARAMETERS = '_class,url,actions[_class,parameters[_class,name,value]]'
+    BUILD_ARTIFACTS = '_class,url,artifacts[displayPath,fileName,relativePath]'
+    BUILD_MONITOR = '_class,url,displayName,number,building,result,timestamp,duration,estimatedDuration,builtOn'
+
+    # Folder
+    FOLDER_ITEMS = '_class,url,jobs[_class,name,fullName,url,color],views[_class,name,url]'
+    FOLDER_MONITOR = ('_class,url,fullName,jobs[_class,name,fullName,url,'
+                      'lastBuild[number,building,result,timestamp,duration]]')
+
+    # Server
+    NODE_LIST = 'computer[_class,displayName]'
+    PLUGIN_LIST = 'plugins[longName,shortName,version]'
+    PEOPLE_LIST = 'users[user[fullName]]'
+    QUEUE_MONITOR = 'items[id,inQueueSince,task[url]]'
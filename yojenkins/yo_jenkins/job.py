@@ -2,10 +2,13 @@
 
 import json
 import logging
+import queue
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import timedelta
 from time import perf_counter
-from typing import Dict, Tuple, Union
+from typing import Dict, Generator, Iterable, List, Tuple, Union
 from urllib.parse import urlencode
 
 import jenkins
@@ -15,8 +18,12 @@ import yaml
 from yojenkins.monitor import JobMonitor
 from yojenkins.utility import utility
 from yojenkins.utility.utility import diff_show, fail_out, failures_out
+from yojenkins.yo_jenkins.build_stats import BuildStats
+from yojenkins.yo_jenkins.config_drift import CONFIG_VOLATILE_ELEMENTS, ConfigDrift
+from yojenkins.yo_jenkins.failure_clusters import FailureClusters
 from yojenkins.yo_jenkins.jenkins_item_classes import JenkinsItemClasses
 from yojenkins.yo_jenkins.jenkins_item_config import JenkinsItemConfig
+from yojenkins.yo_jenkins.jenkins_item_tree import JenkinsItemTree
 
 # Getting the logger reference
 logger = logging.getLogger()
@@ -41,58 +48,49 @@ class Job():
         self.build = Build
         self.JM = JobMonitor(rest, auth, self, Build)
 
-        # Recursive search results
+        # Search results
         self.search_results = []
         self.search_items_count = 0
 
-    def _recursive_search(self, search_pattern: str, search_list: list, level: int, fullname: bool = True) -> None:
-        """Recursive search method for jobs
-
-        Details: Matched pattern findings are storred in the object: `self.search_results`
+    def search_iter(self,
+                    search_pattern: str,
+                    folder_name: str = '',
+                    folder_url: str = '',
+                    folder_depth: int = 4,
+                    fullname: bool = True) -> Generator[Dict, None, None]:
+        """Search the server for jobs matching REGEX pattern, yielding each match as it is found
 
         Args:
-            search_pattern : REGEX pattern to match for each item
-            search_list    : List of items
-            level          : Current recursion level
+            search_pattern : REGEX search pattern to match
+            folder_name    : (Optional) Only look within this folder for matching jobs using item name
+            folder_url     : (Optional) Only look within this folder for matching jobs using item URL
+            folder_depth   : Number of levels to look through
             fullname       : Search the entire path of the item, not just the item name
 
         Returns:
-            None
+            Generator of matching job information
         """
-        # Current directory level
-        level += 1
-
-        # Loop through all sub-folders
-        for list_item in search_list:
-
-            # Check if it is not a job
-            if list_item['_class'] in JenkinsItemClasses.JOB.value['class_type']:
+        logger.debug(f'Job search pattern: {search_pattern}')
+        try:
+            pattern = re.compile(search_pattern, re.IGNORECASE)
+        except re.error as error:
+            fail_out(f'Failed to use REGEX search pattern "{search_pattern}". Exception: {error}')
 
-                # Get fullname, else get name
-                if fullname:
-                    dict_key = "fullname" if "fullname" in list_item else "name"
-                else:
-                    dict_key = 'name'
+        if folder_name or folder_url:
+            # Only search the specified folder
+            logger.debug(f'Searching jobs in sub-folder "{folder_name if folder_name else folder_url}"')
+            logger.debug('Folder depth does not apply. Only looking in this specific folder for job')
+            folder_depth = 0
+        else:
+            logger.debug(f'Searching jobs in ALL Jenkins. Folder depth: "{folder_depth}"')
 
-                # Match the regex pattern
-                try:
-                    if re.search(search_pattern, list_item[dict_key], re.IGNORECASE):
-                        self.search_results.append(list_item)
-                except re.error as error:
-                    logger.debug(
-                        f'Error while applying REGEX pattern "{search_pattern}" to "{list_item[dict_key]}". Exception: {error}'
-                    )
-                    break
-
-            # Count items searched for record
+        self.search_items_count = 0
+        for item in self.folder.crawl(folder_name=folder_name, folder_url=folder_url, folder_depth=folder_depth):
             self.search_items_count += 1
-
-            # Check if it is a folder, if it is, keep looking
-            if 'jobs' not in list_item:
+            if item['_class'] not in JenkinsItemClasses.JOB.value['class_type']:
                 continue
-
-            # Keep searching all sub-items for this item. Call itself for some recursion fun
-            self._recursive_search(search_pattern, list_item['jobs'], level, fullname)
+            if pattern.search(item['fullname'] if fullname else item['name']):
+                yield item
 
     def search(self,
                search_pattern: str,
@@ -100,51 +98,29 @@ class Job():
                folder_url: str = '',
                folder_depth: int = 4,
                fullname: bool = True) -> Tuple[list, list]:
-        """TODO Docstring
+        """Search the server for jobs matching REGEX pattern
 
         Args:
-            arg 1 : DESCRIPTION
-            arg 2 : DESCRIPTION
+            search_pattern : REGEX search pattern to match
+            folder_name    : (Optional) Only look within this folder for matching jobs using item name
+            folder_url     : (Optional) Only look within this folder for matching jobs using item URL
+            folder_depth   : Number of levels to look through
+            fullname       : Search the entire path of the item, not just the item name
 
         Returns:
-            TODO
+            List of jobs found. Both, list of info and list of job URLs
         """
-        # Finding the job by REGEX pattern
-        # NOTE:
-        #   - Criteria of jobs is that jobs do not have any sub-folders, only views and jobs
-
         # Start a timer to time the search
         start_time = perf_counter()
 
-        logger.debug(f'Job search pattern: {search_pattern}')
-
-        # Get all the jobs
-        if folder_name or folder_url:
-            # Only recursively search the specified folder name
-            logger.debug(f'Searching jobs in sub-folder "{folder_name if folder_name else folder_url}"')
-            logger.debug('Folder depth does not apply. Only looking in this specific folder for job')
-            items = self.folder.item_list(folder_name=folder_name, folder_url=folder_url)[0]
-        else:
-            # Search entire Jenkins
-            logger.debug(f'Searching jobs in ALL Jenkins. Folder depth: "{folder_depth}"')
-            try:
-                items = self.jenkins_sdk.get_all_jobs(folder_depth=folder_depth)
-            except jenkins.JenkinsException as error:
-                error_no_html = error.args[0].split("\n")[0]
-                fail_out(f'Error while getting all items. Exception: {error_no_html}')
-            except Exception as error:
-                fail_out(error)
-
-        # Search for any matching folders ("jobs")
-        self.search_results = []
-        self.search_items_count = 0
-        self._recursive_search(search_pattern=search_pattern, search_list=items, level=0, fullname=fullname)
-
-        # Remove duplicates from list
-        logger.debug('Removing duplicates if needed ...')
-        self.search_results = [i for n, i in enumerate(self.search_results) if i not in self.search_results[n + 1:]]
+        self.search_results = list(
+            self.search_iter(search_pattern=search_pattern,
+                             folder_name=folder_name,
+                             folder_url=folder_url,
+                             folder_depth=folder_depth,
+                             fullname=fullname))
 
-        # Getting only the URLs of the stages
+        # Getting only the URLs of the jobs
         job_search_results_list = [result['url'] for result in self.search_results]
 
         # Output search stats
@@ -153,14 +129,16 @@ class Job():
 
         return self.search_results, job_search_results_list
 
-    def info(self, job_name: str = '', job_url: str = '') -> Dict:
-        """TODO Docstring
+    def info(self, job_name: str = '', job_url: str = '', tree: str = '') -> Dict:
+        """Get the job information
 
         Args:
-            TODO
+            job_name : Name of the job
+            job_url  : URL of the job
+            tree     : Job fields to request from the server (`JenkinsItemTree`). Default all fields
 
         Returns:
-            TODO
+            Job information
         """
         if not job_name and not job_url:
             fail_out('No job name or job URL provided')
@@ -169,7 +147,7 @@ class Job():
             job_url = utility.name_to_url(self.rest.get_server_url(), job_name)
 
         logger.debug(f'Job url passed: {job_url}')
-        job_info, _, success = self.rest.request(f'{job_url.strip("/")}/api/json', 'get', is_endpoint=False)
+        job_info, _, success = self.rest.request(f'{job_url.strip("/")}/api/json', 'get', is_endpoint=False, tree=tree)
         if not success:
             fail_out(f'Failed to find job info: {job_url}')
 
@@ -201,7 +179,7 @@ class Job():
             TODO
         """
         # Get the job information
-        job_info = self.info(job_name=job_name, job_url=job_url)
+        job_info = self.info(job_name=job_name, job_url=job_url, tree=JenkinsItemTree.JOB_BUILDS.value)
 
         # Get all the past builds
         build_list, build_url_list = utility.item_subitem_list(
@@ -212,6 +190,296 @@ class Job():
 
         return build_list, build_url_list
 
+    def build_running_list(self, job_name: str = '', job_url: str = '') -> List[str]:
+        """Get the URLs of all builds of the job that are currently running
+
+        Args:
+            job_name : Name of the job
+            job_url  : URL of the job
+
+        Returns:
+            List of running build URLs, oldest first
+        """
+        job_info = self.info(job_name=job_name, job_url=job_url, tree=JenkinsItemTree.JOB_RUNNING_BUILDS.value)
+        running_builds = [build for build in job_info.get('builds', []) if build.get('building')]
+        logger.debug(f'Found {len(running_builds)} running builds for job: {job_info["url"]}')
+        return [build['url'] for build in reversed(running_builds)]
+
+    def build_history(self,
+                      job_name: str = '',
+                      job_url: str = '',
+                      max_builds: int = 0,
+                      page_size: int = 100) -> Generator[Dict, None, None]:
+        """Get the past builds of the job, newest first
+
+        Details: Each build only has its number, result, timestamp, duration, and URL. Builds are
+                 requested one page at a time with an `allBuilds{start,end}` range query, and the next
+                 page is only requested once the previous page is used up.
+
+        Args:
+            job_name   : Name of the job
+            job_url    : URL of the job
+            max_builds : Maximum number of builds to get. Default all builds
+            page_size  : Number of builds requested at once
+
+        Returns:
+            Generator of past builds
+        """
+        if not job_name and not job_url:
+            fail_out('No job name or job URL provided')
+        if job_name and not job_url:
+            job_url = utility.name_to_url(self.rest.get_server_url(), job_name)
+
+        page_start = 0
+        page_size = max(page_size, 1)
+        while not max_builds or page_start < max_builds:
+            page_end = min(page_start + page_size, max_builds) if max_builds else page_start + page_size
+            logger.debug(f'Getting build history page {page_start} to {page_end} for job: {job_url}')
+            job_info = self.info(job_url=job_url,
+                                 tree=f'{JenkinsItemTree.JOB_BUILD_HISTORY.value}{{{page_start},{page_end}}}')
+            history_page = job_info.get('allBuilds', [])
+            yield from history_page
+            if len(history_page) < page_end - page_start:
+                break
+            page_start = page_end
+
+    def build_stats(self, job_name: str = '', job_url: str = '', max_builds: int = 0) -> BuildStats:
+        """Get the build duration and result statistics of the job
+
+        Args:
+            job_name   : Name of the job
+            job_url    : URL of the job
+            max_builds : Maximum number of most recent builds used. Default all builds
+
+        Returns:
+            BuildStats object of the build history
+        """
+        if not job_name and not job_url:
+            fail_out('No job name or job URL provided')
+        if job_name and not job_url:
+            job_url = utility.name_to_url(self.rest.get_server_url(), job_name)
+        return BuildStats.from_history(self.build_history(job_url=job_url, max_builds=max_builds), job_url=job_url)
+
+    def build_stats_many(self,
+                         job_urls: Iterable[str],
+                         max_builds: int = 0,
+                         max_workers: int = 8) -> Generator[BuildStats, None, None]:
+        """Get the build statistics of many jobs, fetching their build histories concurrently
+
+        Args:
+            job_urls    : Iterable of job URLs
+            max_builds  : Maximum number of most recent builds used per job. Default all builds
+            max_workers : Maximum number of jobs fetched at once
+
+        Returns:
+            Generator of BuildStats objects, in order of completion. Jobs that failed are skipped
+        """
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            futures = {
+                executor.submit(self.build_stats, job_url=job_url, max_builds=max_builds): job_url
+                for job_url in job_urls
+            }
+            for future in as_completed(futures):
+                try:
+                    job_stats = future.result()
+                except (Exception, SystemExit) as error:
+                    logger.debug(f'Failed to get build statistics of job "{futures[future]}". Skipping. '
+                                 f'Exception: {error}')
+                    continue
+                yield job_stats
+
+    def logs_search(self,
+                    search_patterns: List[str],
+                    job_name: str = '',
+                    job_url: str = '',
+                    max_builds: int = 0,
+                    first_number: int = 0,
+                    last_number: int = 0,
+                    context_lines: int = 0,
+                    ignore_case: bool = False,
+                    max_workers: int = 8) -> Generator[Dict, None, None]:
+        """Search the console logs of the job's builds for REGEX patterns
+
+        Details: The logs of many builds are streamed and searched at once, with no more than
+                 `max_workers` logs at a time. Matches are yielded as soon as they are found, through
+                 a bounded queue, so searching waits for the consumer instead of holding matches.
+
+        Args:
+            search_patterns : REGEX patterns to search for
+            job_name        : Name of the job
+            job_url         : URL of the job
+            max_builds      : Number of most recent builds to search. Default all builds
+            first_number    : (Optional) First build number of a range of builds to search
+            last_number     : (Optional) Last build number of a range of builds to search
+            context_lines   : Number of lines before and after a match to include
+            ignore_case     : If True, match patterns regardless of case
+            max_workers     : Maximum number of build logs searched at once
+
+        Returns:
+            Generator of matches with build, line number, line, pattern, and context lines
+        """
+        patterns = []
+        for search_pattern in search_patterns:
+            try:
+                patterns.append(re.compile(search_pattern, re.IGNORECASE if ignore_case else 0))
+            except re.error as error:
+                fail_out(f'Failed to use REGEX search pattern "{search_pattern}". Exception: {error}')
+
+        if first_number or last_number:
+            build_urls = self.build.range_urls(job_name=job_name,
+                                               job_url=job_url,
+                                               first_number=first_number,
+                                               last_number=last_number)
+        else:
+            builds = self.build_history(job_name=job_name, job_url=job_url, max_builds=max_builds)
+            build_urls = [build['url'] for build in builds]
+        logger.debug(f'Searching console logs of {len(build_urls)} builds with {max_workers} workers ...')
+
+        # Matches of all builds, and None once the search of a build is done
+        matches_queue = queue.Queue(maxsize=max(max_workers, 1) * 100)
+        search_stopped = threading.Event()
+
+        def matches_queue_put(match: Union[Dict, None]) -> None:
+            while not search_stopped.is_set():
+                try:
+                    matches_queue.put(match, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+
+        def search_build_logs(build_url: str) -> None:
+            try:
+                for match in self.build.logs_search(build_url, patterns, context_lines=context_lines):
+                    matches_queue_put(match)
+                    if search_stopped.is_set():
+                        return
+            except (Exception, SystemExit) as error:
+                logger.debug(f'Failed to search console logs of build "{build_url}". Skipping. Exception: {error}')
+            finally:
+                matches_queue_put(None)
+
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            futures = [executor.submit(search_build_logs, build_url) for build_url in build_urls]
+            builds_searching = len(futures)
+            try:
+                while builds_searching:
+                    match = matches_queue.get()
+                    if match is None:
+                        builds_searching -= 1
+                        continue
+                    yield match
+            finally:
+                search_stopped.set()
+                for future in futures:
+                    future.cancel()
+
+    def failure_clusters(self,
+                         job_name: str = '',
+                         job_url: str = '',
+                         max_builds: int = 0,
+                         first_number: int = 0,
+                         last_number: int = 0,
+                         results: Iterable[str] = ('FAILURE', ),
+                         tail_lines: int = 10,
+                         log_lines: int = 200,
+                         threshold: float = 0.5,
+                         max_workers: int = 8) -> List[Dict]:
+        """Group the failed builds of the job by the signature of their console log errors
+
+        Details: Only the last `log_lines` lines of each log are requested, for many builds at once.
+
+        Args:
+            job_name     : Name of the job
+            job_url      : URL of the job
+            max_builds   : Number of most recent builds to check. Default all builds
+            first_number : (Optional) First build number of a range of builds to check
+            last_number  : (Optional) Last build number of a range of builds to check
+            results      : Build results counted as failed
+            tail_lines   : Number of last error lines of each log used as the failure signature
+            log_lines    : Number of last log lines of each build requested
+            threshold    : Estimated similarity (0 to 1) of error tails from which on builds are grouped
+            max_workers  : Maximum number of build logs requested at once
+
+        Returns:
+            Clusters of failed builds, largest first
+        """
+        results = {result.upper() for result in results}
+        failed_builds = []
+        for build in self.build_history(job_name=job_name, job_url=job_url, max_builds=max_builds):
+            number = build.get('number', 0)
+            if first_number and number < first_number:
+                break
+            if last_number and number > last_number:
+                continue
+            if build.get('result') in results:
+                failed_builds.append(build)
+        logger.debug(f'Getting console log tails of {len(failed_builds)} failed builds with {max_workers} workers ...')
+
+        failure_clusters = FailureClusters(threshold=threshold, tail_lines=tail_lines)
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            futures = {
+                executor.submit(self.build.logs_tail, build['url'], log_lines): build
+                for build in failed_builds
+            }
+            for future in as_completed(futures):
+                build = futures[future]
+                try:
+                    log_tail = future.result()
+                except (Exception, SystemExit) as error:
+                    logger.debug(f'Failed to get console log tail of build "{build["url"]}". Skipping. '
+                                 f'Exception: {error}')
+                    continue
+                failure_clusters.add(build, log_tail.splitlines())
+
+        return failure_clusters.clusters()
+
+    def config_drift(self,
+                     folder_name: str = '',
+                     folder_url: str = '',
+                     folder_depth: int = 4,
+                     min_group_size: int = 2,
+                     threshold: float = 0.8,
+                     ignore_elements: Iterable[str] = CONFIG_VOLATILE_ELEMENTS,
+                     max_workers: int = 16) -> List[Dict]:
+        """Group all jobs within a folder by their normalized configuration, diffing the outliers
+
+        Details: The config.xml of all jobs found are requested concurrently, and each is only
+                 compared against the few template configs shared by many jobs.
+
+        Args:
+            folder_name     : (Optional) Folder name to look for jobs in. Default is the server root
+            folder_url      : (Optional) Folder URL to look for jobs in. Default is the server root
+            folder_depth    : Number of sub-folder levels to look through
+            min_group_size  : Least number of jobs sharing a config for it to be a template
+            threshold       : Similarity (0 to 1) to a template from which on a config is an outlier of it
+            ignore_elements : Tags of config elements left out of the comparison
+            max_workers     : Maximum number of job configs requested at once
+
+        Returns:
+            Template groups, largest first, each with its jobs and its outliers with their diff
+        """
+        config_jobs = {
+            f'{item["url"].strip("/")}/config.xml': item
+            for item in self.folder.crawl(folder_name=folder_name, folder_url=folder_url, folder_depth=folder_depth)
+            if item['_class'] in JenkinsItemClasses.JOB.value['class_type']
+        }
+        logger.debug(f'Getting configs of {len(config_jobs)} jobs with {max_workers} workers ...')
+
+        config_drift = ConfigDrift(min_group_size=min_group_size, threshold=threshold, ignore_elements=ignore_elements)
+        responses = self.rest.request_many(config_jobs,
+                                           is_endpoint=False,
+                                           json_content=False,
+                                           max_concurrent=max_workers)
+        for config_url, config_xml, _, success in responses:
+            if not success:
+                logger.debug(f'Failed to get job configuration, skipping it: {config_url}')
+                continue
+            config_drift.add(config_jobs[config_url], config_xml)
+        if config_drift.failed_jobs:
+            logger.debug(f'Failed to parse configs of {len(config_drift.failed_jobs)} jobs')
+
+        return config_drift.groups()
+
     def build_next_number(self, job_name: str = '', job_url: str = '') -> Union[int, None]:
         """TODO Docstring
 
@@ -222,7 +490,7 @@ class Job():
             TODO
         """
         # Get the job information
-        job_info = self.info(job_name=job_name, job_url=job_url)
+        job_info = self.info(job_name=job_name, job_url=job_url, tree=JenkinsItemTree.JOB_NEXT_BUILD_NUMBER.value)
 
         if not job_info.get('nextBuildNumber'):
             fail_out('Failed to get next build number from job. "builds" key missing in job information')
@@ -243,7 +511,7 @@ class Job():
         # Get the job information
         if not job_info:
             # If the job info is not passed, request it from server
-            job_info = self.info(job_name=job_name, job_url=job_url)
+            job_info = self.info(job_name=job_name, job_url=job_url, tree=JenkinsItemTree.JOB_LAST_BUILD.value)
 
         if not job_info.get('lastBuild'):
             return 0
@@ -298,7 +566,7 @@ class Job():
         """
         if not job_info:
             # Getting job information
-            job_info = self.info(job_name=job_name, job_url=job_url)
+            job_info = self.info(job_name=job_name, job_url=job_url, tree=JenkinsItemTree.JOB_BUILDS.value)
 
         if 'builds' not in job_info:
             fail_out('Failed to get build list from job. "builds" key missing in job information')
@@ -665,14 +933,23 @@ class Job():
 
         return success
 
-    def monitor(self, job_name: str = '', job_url: str = '', sound: bool = False) -> bool:
-        """TODO Docstring
+    def monitor(self,
+                job_name: str = '',
+                job_url: str = '',
+                sound: bool = False,
+                headless: bool = False,
+                output_file: str = '') -> bool:
+        """Start the job monitor UI, or the headless job monitor
 
         Args:
-            TODO
+            job_name    : Name of the job
+            job_url     : URL of the job
+            sound       : Enable sound effects
+            headless    : If True, write build change events as JSON lines instead of showing the UI
+            output_file : Path to the file to append the headless events to. Default standard out
 
         Returns:
-            TODO
+            True if successful, else False
         """
         if not job_name and not job_url:
             fail_out('No job name or job URL provided')
@@ -686,7 +963,10 @@ class Job():
             fail_out(f'Failed to find job. The job may not exist: {job_url}')
 
         logger.debug(f'Starting monitor for: "{job_url}" ...')
-        success = self.JM.monitor_start(job_url=job_url, sound=sound)
+        if headless:
+            success = self.JM.monitor_headless(job_url=job_url, output_file=output_file)
+        else:
+            success = self.JM.monitor_start(job_url=job_url, sound=sound)
         if not success:
             fail_out('Failed to start job monitor')
         logger.debug('Successfully started job monitor')
@@ -773,7 +1053,7 @@ class Job():
             TODO
         """
         # Get the job information
-        job_info = self.info(job_name=job_name, job_url=job_url)
+        job_info = self.info(job_name=job_name, job_url=job_url, tree=JenkinsItemTree.JOB_PARAMETERS.value)
 
         logger.debug(f'Getting build parameters for job: "{job_name}" ...')
 
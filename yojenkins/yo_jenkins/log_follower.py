@@ -0,0 +1,322 @@
+"""Log Follower class definition"""
+
+import codecs
+import heapq
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from time import monotonic, sleep
+from typing import Callable, Dict, Tuple
+
+import requests
+
+from yojenkins.yo_jenkins.jenkins_item_tree import JenkinsItemTree
+from yojenkins.yo_jenkins.rest import Rest
+
+# Getting the logger reference
+logger = logging.getLogger()
+
+
+class LogFollower:
+    """Following of a growing build console log
+
+    Details: Only the byte offset of the log read so far is kept. Each poll requests the log from
+             that offset on, with `progressiveText` or with a `Range` request for `consoleText`.
+             The poll interval drops to its minimum while output is flowing, and backs off
+             towards its maximum while the log is idle. Following stops once the log can not be
+             requested a number of times in a row, or at once if the server refuses the request.
+    """
+
+    def __init__(self,
+                 rest: Rest,
+                 build_url: str,
+                 offset: int = 0,
+                 progressive: bool = True,
+                 interval_min: float = 0.25,
+                 interval_max: float = 8.0,
+                 backoff: float = 1.5,
+                 failures_max: int = 5) -> None:
+        """Object constructor method, called at object creation
+
+        Args:
+            rest         : Rest object
+            build_url    : Direct URL of the build
+            offset       : Byte offset of the log to start following from
+            progressive  : If True, the server supports `progressiveText`, else use `Range` requests
+            interval_min : Shortest time between polls in seconds, used while output is flowing
+            interval_max : Longest time between polls in seconds, reached while the log is idle
+            backoff      : Factor the poll interval grows by after each poll without output
+            failures_max : Number of failed polls in a row after which following stops
+
+        Returns:
+            None
+        """
+        self.rest = rest
+        self.build_url = build_url.strip('/')
+        self.offset = offset
+        self.progressive = progressive
+        self.interval_min = interval_min
+        self.interval_max = interval_max
+        self.backoff = backoff
+        self.failures_max = max(failures_max, 1)
+
+        self.interval = interval_min
+        self.running = True
+        self.polls_count = 0
+        self.bytes_count = 0
+        self.failures_count = 0
+        self.error = ''
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def poll(self) -> str:
+        """Request the log output added since the last poll
+
+        Args:
+            None
+
+        Returns:
+            New log text, empty if there is none
+        """
+        log_bytes, running = self._poll_progressive() if self.progressive else self._poll_range()
+        self.polls_count += 1
+        self.bytes_count += len(log_bytes)
+        self.running = running
+
+        # Adapt the poll interval to the log activity
+        if log_bytes:
+            self.interval = self.interval_min
+        else:
+            self.interval = min(self.interval * self.backoff, self.interval_max)
+        logger.debug(f'Log poll {self.polls_count}: {len(log_bytes)} bytes, offset {self.offset}, '
+                     f'next poll in {self.interval:.2f}s')
+
+        return self.decoder.decode(log_bytes, final=not self.running)
+
+    def follow(self, output: Callable[[str], None]) -> None:
+        """Poll the log until the build is finished, passing all new output along
+
+        Args:
+            output : Function called with each new piece of log text
+
+        Returns:
+            None
+        """
+        while True:
+            log_text = self.poll()
+            if log_text:
+                output(log_text)
+            if not self.running:
+                break
+            sleep(self.interval)
+        if self.error:
+            logger.debug(f'Stopped following log: {self.error}')
+            return
+        logger.debug(f'Build finished. Followed {self.bytes_count} log bytes in {self.polls_count} polls')
+
+    def _poll_progressive(self) -> Tuple[bytes, bool]:
+        """Request the log from the offset with the `progressiveText` endpoint
+
+        Details: The server returns the new log bytes, the new log size (`X-Text-Size`), and
+                 whether the build is still writing to the log (`X-More-Data`)
+
+        Args:
+            None
+
+        Returns:
+            Tuple of new log bytes and True if the build is still running
+        """
+        response = self.rest.request_stream(f'{self.build_url}/logText/progressiveText',
+                                            is_endpoint=False,
+                                            params={'start': self.offset},
+                                            ok_only=False)
+        if not self._poll_response_ok(response):
+            return b'', not self.error
+
+        try:
+            with response:
+                log_bytes = response.content
+                text_size = int(response.headers.get('X-Text-Size', self.offset + len(log_bytes)))
+                running = 'X-More-Data' in response.headers
+        except requests.exceptions.RequestException as error:
+            self._poll_failed(f'Failed to read log. Exception: {error}')
+            return b'', not self.error
+        self.offset = max(text_size, self.offset)
+        self.failures_count = 0
+
+        return log_bytes, running
+
+    def _poll_range(self) -> Tuple[bytes, bool]:
+        """Request the log from the offset with a `Range` request for `consoleText`
+
+        Details: Servers without `progressiveText` do not tell if the build is still running,
+                 so the build status is checked after each poll without new output
+
+        Args:
+            None
+
+        Returns:
+            Tuple of new log bytes and True if the build is still running
+        """
+        log_bytes = b''
+        response = self.rest.request_stream(f'{self.build_url}/consoleText',
+                                            is_endpoint=False,
+                                            headers={'Range': f'bytes={self.offset}-'},
+                                            ok_only=False)
+        if response is not None and response.status_code == 416:
+            # Range starts at the end of the log, nothing new yet
+            response.close()
+        elif not self._poll_response_ok(response):
+            return b'', not self.error
+        else:
+            try:
+                with response:
+                    if response.status_code == 206:
+                        log_bytes = response.content
+                    else:
+                        # Range ignored, skip what has already been read
+                        skip_bytes = self.offset
+                        for chunk in response.iter_content(chunk_size=64 * 1024):
+                            skipped_bytes = min(skip_bytes, len(chunk))
+                            skip_bytes -= skipped_bytes
+                            log_bytes += chunk[skipped_bytes:]
+            except requests.exceptions.RequestException as error:
+                self._poll_failed(f'Failed to read log. Exception: {error}')
+                return b'', not self.error
+        self.offset += len(log_bytes)
+
+        if log_bytes:
+            self.failures_count = 0
+            return log_bytes, True
+
+        build_info, _, success = self.rest.request(f'{self.build_url}/api/json',
+                                                   'get',
+                                                   is_endpoint=False,
+                                                   tree=JenkinsItemTree.BUILD_STATUS.value)
+        if not success:
+            self._poll_failed('Failed to request build status')
+            return log_bytes, not self.error
+        self.failures_count = 0
+        return log_bytes, build_info.get('building', False)
+
+    def _poll_response_ok(self, response) -> bool:
+        """Check the response of a log poll, counting it as a failure if it did not succeed
+
+        Details: A client error status (ie. deleted build, no permission) stops following at once,
+                 any other failure only once it happened `failures_max` times in a row
+
+        Args:
+            response : Open response of the log poll, None if no response was received
+
+        Returns:
+            True if the log can be read from the response, else False
+        """
+        if response is None:
+            self._poll_failed('Failed to request log')
+            return False
+        if not response.ok:
+            response.close()
+            if 400 <= response.status_code < 500:
+                self.error = f'Failed to request log. Server code: {response.status_code}'
+            else:
+                self._poll_failed(f'Failed to request log. Server code: {response.status_code}')
+            return False
+        return True
+
+    def _poll_failed(self, message: str) -> None:
+        """Count a failed log poll, and stop following once too many polls failed in a row
+
+        Args:
+            message : Reason the poll failed
+
+        Returns:
+            None
+        """
+        self.failures_count += 1
+        logger.debug(f'{message} ({self.failures_count}/{self.failures_max} failed polls in a row)')
+        if self.failures_count >= self.failures_max:
+            self.error = f'{message}. Failed {self.failures_count} times in a row'
+
+
+class LogFollowerGroup:
+    """Following of many growing build console logs at once
+
+    Details: All logs are polled from one worker pool, each with its own `LogFollower` byte offset
+             and adaptive poll interval. A log is only polled again once its interval is up, so idle
+             builds are rarely requested. Output is split into complete lines, and each line is
+             passed along whole with the prefix of its build, so lines of different builds never mix.
+    """
+
+    def __init__(self, followers: Dict[str, LogFollower], max_workers: int = 8) -> None:
+        """Object constructor method, called at object creation
+
+        Args:
+            followers   : Log followers, keyed by the output line prefix of their build
+            max_workers : Maximum number of logs polled at once
+
+        Returns:
+            None
+        """
+        self.followers = followers
+        self.max_workers = max(max_workers, 1)
+
+        # Incomplete last line of each log, waiting for the rest of the line
+        self.partial_lines = {prefix: '' for prefix in followers}
+
+    def follow(self, output: Callable[[str], None]) -> None:
+        """Poll all logs until all builds are finished, passing along each new complete line
+
+        Args:
+            output : Function called with each new line of log text, with build prefix
+
+        Returns:
+            None
+        """
+        # Schedule of (next poll time, build prefix)
+        poll_schedule = [(0.0, prefix) for prefix in self.followers]
+        heapq.heapify(poll_schedule)
+        pending = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while poll_schedule or pending:
+                # Start polling all logs that are due, as long as there are workers
+                while poll_schedule and poll_schedule[0][0] <= monotonic() and len(pending) < self.max_workers:
+                    _, prefix = heapq.heappop(poll_schedule)
+                    pending[executor.submit(self.followers[prefix].poll)] = prefix
+
+                # Wait for a poll to finish or for the next poll to be due
+                wait_time = None
+                if poll_schedule and len(pending) < self.max_workers:
+                    wait_time = max(poll_schedule[0][0] - monotonic(), 0)
+                if not pending:
+                    sleep(wait_time)
+                    continue
+                done, _ = wait(pending, timeout=wait_time, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    prefix = pending.pop(future)
+                    log_follower = self.followers[prefix]
+                    self._output_lines(prefix, future.result(), not log_follower.running, output)
+                    if log_follower.running:
+                        heapq.heappush(poll_schedule, (monotonic() + log_follower.interval, prefix))
+                    elif log_follower.error:
+                        logger.debug(f'Stopped following log: {log_follower.build_url}: {log_follower.error}')
+                    else:
+                        logger.debug(f'Build finished: {log_follower.build_url}')
+
+    def _output_lines(self, prefix: str, log_text: str, final: bool, output: Callable[[str], None]) -> None:
+        """Pass along the complete lines of new log text, keeping an incomplete last line for later
+
+        Args:
+            prefix   : Output line prefix of the build
+            log_text : New log text of the build
+            final    : If True, the log is complete and an incomplete last line is passed along too
+            output   : Function called with each line of log text, with build prefix
+
+        Returns:
+            None
+        """
+        log_lines = (self.partial_lines[prefix] + log_text).split('\n')
+        self.partial_lines[prefix] = log_lines.pop()
+        if final and self.partial_lines[prefix]:
+            log_lines.append(self.partial_lines[prefix])
+            self.partial_lines[prefix] = ''
+        for log_line in log_lines:
+            output(f'{prefix} {log_line.rstrip()}')
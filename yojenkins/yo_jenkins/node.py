@@ -10,6 +10,7 @@ import xmltodict
 from yojenkins.utility import utility
 from yojenkins.utility.utility import fail_out, print2
 from yojenkins.yo_jenkins.jenkins_item_classes import JenkinsItemClasses
+from yojenkins.yo_jenkins.jenkins_item_tree import JenkinsItemTree
 from yojenkins.yo_jenkins.rest import Rest
 
 # Getting the logger reference
@@ -53,22 +54,24 @@ class Node():
 
         return node_info
 
-    def list(self, depth: int = 0) -> Tuple[list, list]:
-        """TODO Docstring
+    def list(self, depth: int = 0, list_only: bool = False) -> Tuple[list, list]:
+        """Get the list of all nodes on the server
 
-        Details: TODO
+        Details: If only the node names are needed, only the names are requested from the server
 
         Args:
-            name: TODO
+            depth     : Depth of node information returned
+            list_only : If True, only request the node names
 
         Returns:
-            TODO
+            List of nodes information and list of node names
         """
         logger.debug('Getting a list of all nodes ...')
         nodes_info, _, success = self.rest.request(target=f"computer/api/json?depth={depth}",
                                                    request_type='get',
                                                    is_endpoint=True,
-                                                   json_content=True)
+                                                   json_content=True,
+                                                   tree=JenkinsItemTree.NODE_LIST.value if list_only else '')
         if not success:
             fail_out('Failed to get any nodes')
 
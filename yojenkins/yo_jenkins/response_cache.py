@@ -0,0 +1,159 @@
+"""Response Cache class definition"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+from requests.structures import CaseInsensitiveDict
+
+# Getting the logger reference
+logger = logging.getLogger()
+
+RESPONSE_CACHE_FILE_NAME = 'response_cache.json'
+
+
+class ResponseCache:
+    """Least recently used cache of REST GET responses, stored with their HTTP validators
+
+    Details: Only responses carrying an `ETag` or `Last-Modified` header are stored. The stored
+             validators are sent back with the next request for the same URL, and a
+             `304 Not Modified` answer is served from the stored response.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, cache_file: str = '') -> None:
+        """Object constructor method, called at object creation
+
+        Args:
+            max_bytes  : Maximum combined size of all stored response bodies
+            cache_file : (Optional) File to load the cache from and save it to
+
+        Returns:
+            None
+        """
+        self.max_bytes = max_bytes
+        self.cache_file = cache_file
+
+        self.entries: OrderedDict = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.cache_file:
+            self.load()
+
+    def get(self, key: str) -> Dict:
+        """Get a stored response and mark it as most recently used
+
+        Args:
+            key : Cache key of the request
+
+        Returns:
+            Stored response with `text`, `headers`, and `size` keys. Empty if not stored
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return {}
+            self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, text: str, headers: Dict) -> bool:
+        """Store a response, evicting the least recently used responses when over the size cap
+
+        Args:
+            key     : Cache key of the request
+            text    : Response body text
+            headers : Response headers
+
+        Returns:
+            True if stored, else False (No validators or too large)
+        """
+        headers = CaseInsensitiveDict(headers)
+        if 'ETag' not in headers and 'Last-Modified' not in headers:
+            return False
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            logger.debug(f'Response too large to cache ({size} bytes): {key}')
+            return False
+
+        with self._lock:
+            if key in self.entries:
+                self.size_bytes -= self.entries.pop(key)['size']
+            self.entries[key] = {'text': text, 'headers': dict(headers), 'size': size}
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, evicted_entry = self.entries.popitem(last=False)
+                self.size_bytes -= evicted_entry['size']
+        return True
+
+    @staticmethod
+    def validators(entry: Dict) -> Dict:
+        """Get the conditional request headers for a stored response
+
+        Args:
+            entry : Stored response
+
+        Returns:
+            Request headers `If-None-Match` and/or `If-Modified-Since`
+        """
+        entry_headers = CaseInsensitiveDict(entry['headers'])
+        headers = {}
+        if 'ETag' in entry_headers:
+            headers['If-None-Match'] = entry_headers['ETag']
+        if 'Last-Modified' in entry_headers:
+            headers['If-Modified-Since'] = entry_headers['Last-Modified']
+        return headers
+
+    def load(self) -> None:
+        """Load stored responses from the cache file
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if not os.path.isfile(self.cache_file):
+            logger.debug(f'Response cache file not found. Starting empty: {self.cache_file}')
+            return
+        try:
+            with open(self.cache_file, 'r') as open_file:
+                entries = json.load(open_file)
+        except (OSError, ValueError) as error:
+            logger.debug(f'Failed to load response cache file "{self.cache_file}". Exception: {error}')
+            return
+
+        for key, entry in entries:
+            self.put(key, entry['text'], entry['headers'])
+        logger.debug(f'Loaded {len(self.entries)} responses ({self.size_bytes} bytes) from "{self.cache_file}"')
+
+    def save(self) -> None:
+        """Save all stored responses to the cache file
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if not self.cache_file:
+            return
+        with self._lock:
+            entries = [[key, entry] for key, entry in self.entries.items()]
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            # Response bodies are only readable by the owner of the file
+            cache_file_tmp = f'{self.cache_file}.tmp'
+            with os.fdopen(os.open(cache_file_tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as open_file:
+                json.dump(entries, open_file)
+            os.chmod(cache_file_tmp, 0o600)
+            os.replace(cache_file_tmp, self.cache_file)
+        except OSError as error:
+            logger.debug(f'Failed to save response cache file "{self.cache_file}". Exception: {error}')
+            return
+        logger.debug(
+            f'Saved {len(entries)} responses to "{self.cache_file}" (Hits: {self.hits}, Misses: {self.misses})')
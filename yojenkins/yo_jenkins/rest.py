@@ -1,13 +1,23 @@
 """Rest class definition"""
 
+import atexit
+import json
 import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from pathlib import Path
 from time import perf_counter
-from typing import Dict, Literal, Tuple, Union
+from typing import Dict, Generator, Iterable, Literal, Tuple, Union
 
 import requests
 from requests.auth import HTTPBasicAuth
+from requests.structures import CaseInsensitiveDict
 from requests_futures.sessions import FuturesSession
 
+from yojenkins.utility.utility import CONFIG_DIR_NAME
+from yojenkins.yo_jenkins.response_cache import RESPONSE_CACHE_FILE_NAME, ResponseCache
+from yojenkins.yo_jenkins.rest_async import AsyncRest
+
 # Getting the logger reference
 logger = logging.getLogger()
 
@@ -44,6 +54,12 @@ class Rest:
         # Flag signaling if this object has authentication credentials to server
         self.has_credentials = False
 
+        # Cache of GET responses for conditional requests - Enabled with cache_enable()
+        self.response_cache = None
+
+        # Asyncio engine for bulk requests - Enabled with async_enable()
+        self.async_rest = None
+
     def set_credentials(self, username: str, api_token: str, server_url: str) -> None:
         """TODO Docstring
 
@@ -80,6 +96,49 @@ class Rest:
         """
         return self.session
 
+    def cache_enable(self, max_bytes: int = 32 * 1024 * 1024, persist: bool = False) -> None:
+        """Enable the response cache for GET requests
+
+        Details: Responses with an `ETag` or `Last-Modified` header are cached. Repeated requests
+                 for them are conditional, and a `304 Not Modified` answer is served from the cache.
+                 If persisted, the cache is loaded from the configuration directory and saved back at exit.
+
+        Args:
+            max_bytes : Maximum combined size of all cached response bodies
+            persist   : If True, keep the cache on disk across program runs
+
+        Returns:
+            None
+        """
+        if self.response_cache:
+            return
+        cache_file = os.path.join(Path.home(), CONFIG_DIR_NAME, RESPONSE_CACHE_FILE_NAME) if persist else ''
+        logger.debug(f'Enabling response cache (Max: {max_bytes} bytes, File: {cache_file if cache_file else "N/A"})')
+        self.response_cache = ResponseCache(max_bytes=max_bytes, cache_file=cache_file)
+        if persist:
+            atexit.register(self.response_cache.save)
+
+    def async_enable(self, max_connections: int = 32) -> None:
+        """Use the asyncio engine (`AsyncRest`) for bulk requests made with `request_many()`
+
+        Details: Requires the optional `aiohttp` package. If it is not installed, the
+                 default `FuturesSession` engine is kept.
+
+        Args:
+            max_connections : Maximum number of pooled connections to the server
+
+        Returns:
+            None
+        """
+        if self.async_rest:
+            return
+        try:
+            self.async_rest = AsyncRest.from_rest(self, max_connections=max_connections)
+        except ImportError as error:
+            logger.debug(f'Failed to enable async requests. Using default engine. Exception: {error}')
+            return
+        logger.debug(f'Enabled async engine for bulk requests (Max connections: {max_connections})')
+
     def is_reachable(self, server_url: str = '', timeout: int = 5) -> bool:
         """Check if the server is reachable
 
@@ -123,13 +182,12 @@ class Rest:
                 json_data: dict = {},
                 headers: dict = {},
                 timeout: int = 10,
-                allow_redirect: bool = True) -> Tuple[Union[Dict, str], Dict, bool]:
+                allow_redirect: bool = True,
+                tree: str = '') -> Tuple[Union[Dict, str], Dict, bool]:
         """Utility method for a single REST requests
 
         Details: Currently supported GET, POST, HEAD
 
-        **TODO**: Refactor/Rework this method. Too bloated. Take appart into multiple methods!
-
         Args:
             target         : Request URL target. Does not include server_url
             is_endpoint    : If True, add the object-stored server URL address, else do not
@@ -144,10 +202,183 @@ class Rest:
             headers        : Headers passed with the request
             timeout        : Number of seconds to wait for request
             allow_redirect : If True, allow request redirection to other URLs
+            tree           : Jenkins `tree` projection of JSON fields returned by the server (`JenkinsItemTree`)
 
         Returns:
             Tuple of return content, return header, return success
         """
+        start_time = perf_counter()
+        response, request_url, cache_info = self._request_send(target=target,
+                                                               request_type=request_type,
+                                                               is_endpoint=is_endpoint,
+                                                               auth=auth,
+                                                               auth_needed=auth_needed,
+                                                               new_session=new_session,
+                                                               params=params,
+                                                               data=data,
+                                                               json_data=json_data,
+                                                               headers=headers,
+                                                               timeout=timeout,
+                                                               allow_redirect=allow_redirect,
+                                                               tree=tree)
+        if response is None:
+            return {}, {}, False
+
+        return self._request_result(response=response,
+                                    request_url=request_url,
+                                    request_type=request_type,
+                                    json_content=json_content,
+                                    allow_redirect=allow_redirect,
+                                    start_time=start_time,
+                                    cache_info=cache_info)
+
+    def request_many(self,
+                     targets: Iterable[str],
+                     request_type: Literal['get', 'post', 'head'] = 'get',
+                     is_endpoint: bool = True,
+                     json_content: bool = True,
+                     timeout: int = 10,
+                     tree: str = '',
+                     max_concurrent: int = 16) -> Generator[Tuple[str, Union[Dict, str], Dict, bool], None, None]:
+        """Utility method for many concurrent REST requests
+
+        Details: No more than `max_concurrent` requests are in flight at any time. Targets are
+                 only read from the iterable when there is room for another request. Results are
+                 yielded as soon as each request completes, not in the order of the targets.
+
+        Args:
+            targets        : Iterable of request URL targets
+            request_type   : Type of request. Currently `get`, `post`, `head` only
+            is_endpoint    : If True, add the object-stored server URL address, else do not
+            json_content   : If True, parse as json/dict, else return raw content text
+            timeout        : Number of seconds to wait for each request
+            tree           : Jenkins `tree` projection of JSON fields returned by the server (`JenkinsItemTree`)
+            max_concurrent : Maximum number of requests in flight at once
+
+        Returns:
+            Generator of tuples of request target, return content, return header, return success
+        """
+        if self.async_rest:
+            self.async_rest.username, self.async_rest.api_token = self.username, self.api_token
+            self.async_rest.server_url = self.server_url
+            yield from self.async_rest.request_many(targets,
+                                                    request_type=request_type,
+                                                    is_endpoint=is_endpoint,
+                                                    json_content=json_content,
+                                                    timeout=timeout,
+                                                    tree=tree,
+                                                    max_concurrent=max_concurrent)
+            return
+
+        targets = iter(targets)
+        pending = {}
+        targets_remaining = True
+        while targets_remaining or pending:
+            # Top up the window of in-flight requests
+            while targets_remaining and len(pending) < max(max_concurrent, 1):
+                target = next(targets, None)
+                if target is None:
+                    targets_remaining = False
+                    break
+                start_time = perf_counter()
+                response, request_url, cache_info = self._request_send(target=target,
+                                                                       request_type=request_type,
+                                                                       is_endpoint=is_endpoint,
+                                                                       timeout=timeout,
+                                                                       tree=tree)
+                if response is None:
+                    yield target, {}, {}, False
+                    continue
+                pending[response] = (target, request_url, start_time, cache_info)
+
+            if not pending:
+                continue
+
+            # Hand back whichever requests finished first
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for response in done:
+                target, request_url, start_time, cache_info = pending.pop(response)
+                yield (target, *self._request_result(response=response,
+                                                     request_url=request_url,
+                                                     request_type=request_type,
+                                                     json_content=json_content,
+                                                     allow_redirect=True,
+                                                     start_time=start_time,
+                                                     cache_info=cache_info))
+
+    def request_stream(self,
+                       target: str,
+                       is_endpoint: bool = True,
+                       params: dict = {},
+                       headers: dict = {},
+                       timeout: int = 10,
+                       ok_only: bool = True) -> Union[requests.Response, None]:
+        """Utility method for a GET request with a response body that is read in chunks
+
+        Details: The request uses the same authenticated session as all other requests. The returned
+                 response must be closed (ie. `with response:`), otherwise its connection is not released.
+
+        Args:
+            target      : Request URL target. Does not include server_url
+            is_endpoint : If True, add the object-stored server URL address, else do not
+            params      : Parameters passed with the request
+            headers     : Headers passed with the request
+            timeout     : Number of seconds to wait for the server to respond
+            ok_only     : If True, return None for a response with a failed status code
+
+        Returns:
+            Open response with the body not yet read, None if the request failed
+        """
+        start_time = perf_counter()
+        response, request_url, _ = self._request_send(target=target,
+                                                      request_type='get',
+                                                      is_endpoint=is_endpoint,
+                                                      params=params,
+                                                      headers=headers,
+                                                      timeout=timeout,
+                                                      stream=True)
+        if response is None:
+            return None
+        try:
+            response = response.result()
+        except (requests.exceptions.RequestException, Exception) as error:
+            logger.debug(f'Failed to make request. Exception: {error}')
+            return None
+
+        logger.debug(f'Request: GET (stream) - {request_url} - Status: {response.status_code} '
+                     f'({perf_counter() - start_time:.3f} seconds)')
+        if not response.ok:
+            logger.debug(f'Failed to make GET request "{request_url}". Server code: {response.status_code}')
+            if ok_only:
+                response.close()
+                return None
+
+        return response
+
+    def _request_send(self,
+                      target: str,
+                      request_type: Literal['get', 'post', 'head'],
+                      is_endpoint: bool = True,
+                      auth: Tuple = None,
+                      auth_needed: bool = True,
+                      new_session: bool = False,
+                      params: dict = {},
+                      data: dict = {},
+                      json_data: dict = {},
+                      headers: dict = {},
+                      timeout: int = 10,
+                      allow_redirect: bool = True,
+                      tree: str = '',
+                      stream: bool = False) -> Tuple[Union[Future, None], str, Dict]:
+        """Send a REST request without waiting for its response
+
+        Details: See `Rest.request()` for arguments. If the response cache is enabled, GET requests
+                 for responses already in the cache are sent with their validators (conditional request).
+                 If `stream` is True, the response body is not read until it is iterated (no caching).
+
+        Returns:
+            Tuple of pending response (None if request could not be sent), request URL, and response cache info
+        """
         # Constructing the request URL
         if is_endpoint:
             request_url = self.server_url.strip('/') + '/' + target.strip('/')
@@ -156,6 +387,19 @@ class Rest:
 
         logger.debug(f'Request URL: {request_url}')
 
+        # Only have the server serialize the requested fields
+        if tree:
+            logger.debug(f'Request tree projection: {tree}')
+            params = {**params, 'tree': tree}
+
+        # Conditional request for cached responses
+        cache_info = {}
+        if self.response_cache and request_type.lower() == 'get' and not stream:
+            cache_key = f"{self.username}@{requests.Request('GET', request_url, params=params).prepare().url}"
+            cache_info = {'key': cache_key, 'entry': self.response_cache.get(cache_key)}
+            if cache_info['entry']:
+                headers = {**headers, **self.response_cache.validators(cache_info['entry'])}
+
         # Get credentials if needed
         if auth_needed:
             if not auth:
@@ -167,52 +411,49 @@ class Rest:
             self.session = FuturesSession(max_workers=16)
 
         # Making the request
-        start_time = perf_counter()
+        if request_type.lower() not in ['get', 'post', 'head', 'delete']:
+            logger.debug(f'Request type "{request_type}" not recognized')
+            return None, request_url, cache_info
         try:
-            if request_type.lower() == 'get':
-                response = self.session.get(request_url,
+            response = self.session.request(request_type.upper(),
+                                            request_url,
                                             params=params,
                                             data=data,
                                             json=json_data,
                                             headers=headers,
                                             auth=auth,
                                             timeout=timeout,
-                                            allow_redirects=allow_redirect)
-            elif request_type.lower() == 'post':
-                response = self.session.post(request_url,
-                                             params=params,
-                                             data=data,
-                                             json=json_data,
-                                             headers=headers,
-                                             auth=auth,
-                                             timeout=timeout,
-                                             allow_redirects=allow_redirect)
-            elif request_type.lower() == 'head':
-                response = self.session.head(request_url,
-                                             params=params,
-                                             data=data,
-                                             json=json_data,
-                                             headers=headers,
-                                             auth=auth,
-                                             timeout=timeout,
-                                             allow_redirects=allow_redirect)
-            elif request_type.lower() == 'delete':
-                response = self.session.delete(request_url,
-                                               params=params,
-                                               data=data,
-                                               json=json_data,
-                                               headers=headers,
-                                               auth=auth,
-                                               timeout=timeout,
-                                               allow_redirects=allow_redirect)
-            else:
-                logger.debug(f'Request type "{request_type}" not recognized')
-                return {}, {}, False
+                                            allow_redirects=allow_redirect,
+                                            stream=stream)
         except (requests.exceptions.ConnectionError, requests.exceptions.InvalidSchema,
                 requests.exceptions.RequestException) as error:
             logger.debug(f'Failed to make request. Exception: {error}')
-            return {}, {}, False
+            return None, request_url, cache_info
+
+        return response, request_url, cache_info
+
+    def _request_result(self,
+                        response: Union[Future, requests.Response],
+                        request_url: str,
+                        request_type: str,
+                        json_content: bool,
+                        allow_redirect: bool,
+                        start_time: float,
+                        cache_info: Dict = {}) -> Tuple[Union[Dict, str], Dict, bool]:
+        """Wait for a sent REST request to complete and process its response
 
+        Args:
+            response       : Pending response returned by `Rest._request_send()`
+            request_url    : Request URL
+            request_type   : Type of request. Currently `get`, `post`, `head` only
+            json_content   : If True, parse as json/dict, else return raw content text
+            allow_redirect : If True, request redirection to other URLs was allowed
+            start_time     : Time the request was sent, used for request summary
+            cache_info     : Response cache key and cached response of the request, if any
+
+        Returns:
+            Tuple of return content, return header, return success
+        """
         # Wait on the response to complete and get result
         try:
             if hasattr(response, 'result'):
@@ -259,6 +500,13 @@ class Rest:
         if request_type.lower() == 'head':
             return {}, response.headers, response.ok
 
+        # Not modified since cached, use the cached response
+        if response.status_code == 304 and cache_info.get('entry'):
+            logger.debug('NOT MODIFIED - Using cached response')
+            self.response_cache.hits += 1
+            cached_content = self._response_content(cache_info['entry']['text'], json_content)
+            return cached_content, CaseInsensitiveDict(cache_info['entry']['headers']), True
+
         # Check the return status code
         if not response.ok:
             logger.debug(
@@ -267,19 +515,37 @@ class Rest:
                 logger.debug(f'Response headers: {response.headers}')
             return {}, {}, False
 
+        # Store responses that can be validated later
+        if cache_info:
+            self.response_cache.misses += 1
+            response_text = response.content.decode(response.encoding or 'utf-8', errors='replace')
+            self.response_cache.put(cache_info['key'], response_text, response.headers)
+
         # Get the return content and format it
         return_content = {}
         if response.content:
-            if json_content:
-                # Check for json parsing errors
-                try:
-                    return_content = response.json()
-                except Exception as error:
-                    # TODO: Specify json parse error
-                    logger.debug(f"Failed to parse request return as JSON. Possible HTML content. Exception: {error})")
-            else:
-                return_content = response.text
+            return_content = self._response_content(response.content if json_content else response.text, json_content)
         else:
             logger.debug(f'No content received from {request_type.upper()} request: {request_url}')
 
         return return_content, response.headers, True
+
+    @staticmethod
+    def _response_content(content: Union[bytes, str], json_content: bool) -> Union[Dict, str]:
+        """Format the response body
+
+        Args:
+            content      : Response body
+            json_content : If True, parse as json/dict, else return raw content text
+
+        Returns:
+            Formatted response content
+        """
+        if not json_content:
+            return content
+        # Check for json parsing errors
+        try:
+            return json.loads(content)
+        except ValueError as error:
+            logger.debug(f"Failed to parse request return as JSON. Possible HTML content. Exception: {error})")
+        return {}
@@ -0,0 +1,335 @@
+"""Async Rest class definition"""
+
+import asyncio
+import json
+import logging
+import queue
+import threading
+from time import perf_counter
+from typing import Dict, Generator, Iterable, List, Literal, Tuple, Union
+
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Getting the logger reference
+logger = logging.getLogger()
+
+
+class AsyncRest:
+    """Handeling of REST requests with asyncio
+
+    Details: Requests are coroutines sharing one pooled `aiohttp` client session, so many requests
+             can be in flight without one thread per request. Requires the optional `aiohttp`
+             package (`pip install yojenkins[async]`).
+    """
+
+    def __init__(self,
+                 username: str = '',
+                 api_token: str = '',
+                 server_url: str = '',
+                 max_connections: int = 32,
+                 max_concurrent: int = 256) -> None:
+        """Object constructor method, called at object creation
+
+        Args:
+            username        : Username for authentication
+            api_token       : API token for authentication
+            server_url      : Server URL
+            max_connections : Maximum number of pooled connections to the server
+            max_concurrent  : Maximum number of requests in flight at once for bulk requests
+
+        Returns:
+            None
+        """
+        if not aiohttp:
+            raise ImportError('The "aiohttp" package is needed for async requests. '
+                              'Install it with: pip install yojenkins[async]')
+        self.username = username
+        self.api_token = api_token
+        self.server_url = server_url.strip('/') + '/' if server_url else ''
+        self.max_connections = max_connections
+        self.max_concurrent = max_concurrent
+
+        # Client session - Created within the running event loop
+        self.session = None
+
+    @classmethod
+    def from_rest(cls, rest: object, **kwargs) -> 'AsyncRest':
+        """Create an async REST object using the credentials of a `Rest` object
+
+        Args:
+            rest   : Rest object with credentials set
+            kwargs : Any other `AsyncRest` arguments
+
+        Returns:
+            AsyncRest object
+        """
+        return cls(username=rest.username, api_token=rest.api_token, server_url=rest.server_url, **kwargs)
+
+    async def __aenter__(self) -> 'AsyncRest':
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """Open the pooled client session in the running event loop
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self.session and not self.session.closed:
+            return
+        logger.debug(f'Starting new async requests session (Max connections: {self.max_connections}) ...')
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.max_connections),
+                                             raise_for_status=False)
+
+    async def close(self) -> None:
+        """Close the pooled client session
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def request(self,
+                      target: str,
+                      request_type: Literal['get', 'post', 'head', 'delete'],
+                      is_endpoint: bool = True,
+                      json_content: bool = True,
+                      auth: Tuple = None,
+                      auth_needed: bool = True,
+                      params: dict = {},
+                      data: dict = {},
+                      json_data: dict = {},
+                      headers: dict = {},
+                      timeout: int = 10,
+                      allow_redirect: bool = True,
+                      tree: str = '') -> Tuple[Union[Dict, str], Dict, bool]:
+        """Utility coroutine for a single REST requests
+
+        Details: Same arguments and return values as `Rest.request()`
+
+        Args:
+            target         : Request URL target. Does not include server_url
+            request_type   : Type of request. Currently `get`, `post`, `head`, `delete` only
+            is_endpoint    : If True, add the object-stored server URL address, else do not
+            json_content   : If True, parse as json/dict, else return raw content text
+            auth           : Credentials in (username, password) format
+            auth_needed    : If True, use credentials, else do not
+            params         : Parameters passed with the request
+            data           : Data passed with the request
+            json_data      : JSON data passed with the request
+            headers        : Headers passed with the request
+            timeout        : Number of seconds to wait for request
+            allow_redirect : If True, allow request redirection to other URLs
+            tree           : Jenkins `tree` projection of JSON fields returned by the server (`JenkinsItemTree`)
+
+        Returns:
+            Tuple of return content, return header, return success
+        """
+        # Constructing the request URL
+        if is_endpoint:
+            request_url = self.server_url.strip('/') + '/' + target.strip('/')
+        else:
+            request_url = target
+
+        if tree:
+            params = {**params, 'tree': tree}
+        params = {key: str(value) for key, value in params.items()}
+
+        if request_type.lower() not in ['get', 'post', 'head', 'delete']:
+            logger.debug(f'Request type "{request_type}" not recognized')
+            return {}, {}, False
+
+        # Get credentials if needed
+        request_auth = None
+        if auth_needed:
+            request_auth = aiohttp.BasicAuth(*auth) if auth else aiohttp.BasicAuth(self.username, self.api_token)
+
+        await self.open()
+
+        start_time = perf_counter()
+        try:
+            async with self.session.request(request_type.upper(),
+                                            request_url,
+                                            params=params,
+                                            data=data if data else None,
+                                            json=json_data if json_data else None,
+                                            headers=headers,
+                                            auth=request_auth,
+                                            timeout=aiohttp.ClientTimeout(total=timeout),
+                                            allow_redirects=allow_redirect) as response:
+                response_headers = CaseInsensitiveDict(response.headers)
+                response_body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            logger.debug(f'Failed to make request "{request_url}". Exception: {error}')
+            return {}, {}, False
+
+        logger.debug(f'Request: {request_type.upper()} - {request_url} - Status: {response.status} '
+                     f'({perf_counter() - start_time:.3f} seconds)')
+
+        # Check for permission denied or conflict
+        if response.status in [401, 403, 405, 409]:
+            logger.debug(f'Request denied or conflicted. Server code: {response.status}')
+            return {}, {}, False
+
+        # If a head request, only return headers
+        if request_type.lower() == 'head':
+            return {}, response_headers, response.ok
+
+        if not response.ok:
+            logger.debug(f'Failed to make {request_type.upper()} request "{request_url}". '
+                         f'Server code: {response.status}')
+            return {}, {}, False
+
+        # Get the return content and format it
+        return_content = {}
+        if response_body:
+            if json_content:
+                try:
+                    return_content = json.loads(response_body)
+                except ValueError as error:
+                    logger.debug(f'Failed to parse request return as JSON. Possible HTML content. Exception: {error}')
+            else:
+                return_content = response_body.decode(response.get_encoding(), errors='replace')
+        else:
+            logger.debug(f'No content received from {request_type.upper()} request: {request_url}')
+
+        return return_content, response_headers, True
+
+    async def as_completed(self,
+                           targets: Iterable[str],
+                           request_type: Literal['get', 'post', 'head', 'delete'] = 'get',
+                           is_endpoint: bool = True,
+                           json_content: bool = True,
+                           timeout: int = 10,
+                           tree: str = '',
+                           max_concurrent: int = 0):
+        """Utility async generator for many concurrent REST requests, in order of completion
+
+        Details: No more than `max_concurrent` requests are in flight at any time. Targets are
+                 only read from the iterable when there is room for another request.
+
+        Args:
+            targets        : Iterable of request URL targets
+            request_type   : Type of request. Currently `get`, `post`, `head`, `delete` only
+            is_endpoint    : If True, add the object-stored server URL address, else do not
+            json_content   : If True, parse as json/dict, else return raw content text
+            timeout        : Number of seconds to wait for each request
+            tree           : Jenkins `tree` projection of JSON fields returned by the server (`JenkinsItemTree`)
+            max_concurrent : Maximum number of requests in flight at once. Default object setting
+
+        Returns:
+            Async generator of tuples of request target, return content, return header, return success
+        """
+        max_concurrent = max(max_concurrent or self.max_concurrent, 1)
+
+        async def request_target(target: str) -> Tuple[str, Union[Dict, str], Dict, bool]:
+            result = await self.request(target,
+                                        request_type,
+                                        is_endpoint=is_endpoint,
+                                        json_content=json_content,
+                                        timeout=timeout,
+                                        tree=tree)
+            return (target, *result)
+
+        targets = iter(targets)
+        pending = set()
+        targets_remaining = True
+        while targets_remaining or pending:
+            # Top up the window of in-flight requests
+            while targets_remaining and len(pending) < max_concurrent:
+                target = next(targets, None)
+                if target is None:
+                    targets_remaining = False
+                    break
+                pending.add(asyncio.ensure_future(request_target(target)))
+            if not pending:
+                continue
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+    async def gather(self,
+                     targets: Iterable[str],
+                     request_type: Literal['get', 'post', 'head', 'delete'] = 'get',
+                     is_endpoint: bool = True,
+                     json_content: bool = True,
+                     timeout: int = 10,
+                     tree: str = '',
+                     max_concurrent: int = 0) -> List[Tuple[str, Union[Dict, str], Dict, bool]]:
+        """Utility coroutine for many concurrent REST requests, in order of the targets
+
+        Details: See `AsyncRest.as_completed()` for arguments
+
+        Returns:
+            List of tuples of request target, return content, return header, return success
+        """
+        targets = list(targets)
+        results = {}
+        async for result in self.as_completed(targets,
+                                              request_type=request_type,
+                                              is_endpoint=is_endpoint,
+                                              json_content=json_content,
+                                              timeout=timeout,
+                                              tree=tree,
+                                              max_concurrent=max_concurrent):
+            results[result[0]] = result
+        return [results[target] for target in targets]
+
+    def request_many(self,
+                     targets: Iterable[str],
+                     request_type: Literal['get', 'post', 'head', 'delete'] = 'get',
+                     is_endpoint: bool = True,
+                     json_content: bool = True,
+                     timeout: int = 10,
+                     tree: str = '',
+                     max_concurrent: int = 0) -> Generator[Tuple[str, Union[Dict, str], Dict, bool], None, None]:
+        """Utility method for many concurrent REST requests from synchronous code
+
+        Details: Same arguments and return values as `Rest.request_many()`. The requests run in an
+                 event loop on a separate thread, and results are yielded as each request completes.
+
+        Returns:
+            Generator of tuples of request target, return content, return header, return success
+        """
+        results = queue.Queue()
+        done = object()
+
+        async def run_requests() -> None:
+            try:
+                async with self:
+                    async for result in self.as_completed(targets,
+                                                          request_type=request_type,
+                                                          is_endpoint=is_endpoint,
+                                                          json_content=json_content,
+                                                          timeout=timeout,
+                                                          tree=tree,
+                                                          max_concurrent=max_concurrent):
+                        results.put(result)
+            finally:
+                results.put(done)
+
+        loop_thread = threading.Thread(target=asyncio.run, args=(run_requests(), ), daemon=True)
+        loop_thread.start()
+        while True:
+            result = results.get()
+            if result is done:
+                break
+            yield result
+        loop_thread.join()
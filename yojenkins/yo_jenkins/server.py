@@ -5,6 +5,7 @@ from typing import Dict, List, Tuple
 
 from yojenkins.utility import utility
 from yojenkins.utility.utility import fail_out
+from yojenkins.yo_jenkins.jenkins_item_tree import JenkinsItemTree
 
 # Getting the logger reference
 logger = logging.getLogger()
@@ -43,18 +44,21 @@ class Server():
 
         return server_info
 
-    def people(self) -> Tuple[list, list]:
+    def people(self, list_only: bool = False) -> Tuple[list, list]:
         """Get the list of people/accounts on the server
 
         Args:
-            None
+            list_only : If True, only request the names of the users/accounts
 
         Returns:
             List of users/accounts, list of usernames
         """
         logger.debug(f'Getting all people/users for "{self.server_base_url}" ...')
 
-        people_info, _, success = self.rest.request('asynchPeople/api/json?depth=1', 'get', is_endpoint=True)
+        people_info, _, success = self.rest.request('asynchPeople/api/json?depth=1',
+                                                    'get',
+                                                    is_endpoint=True,
+                                                    tree=JenkinsItemTree.PEOPLE_LIST.value if list_only else '')
         if not success:
             fail_out('Failed to fetch server people/users information')
 
@@ -110,18 +114,21 @@ class Server():
 
         return queue_list
 
-    def plugin_list(self) -> Tuple[list, list]:
+    def plugin_list(self, list_only: bool = False) -> Tuple[list, list]:
         """Get the list of plugins installed on the server
 
         Args:
-            None
+            list_only : If True, only request the plugin names and versions
 
         Returns:
             List of plugins, information list and URL list
         """
         logger.debug(f'Getting all installed server plugins for "{self.server_base_url}" ...')
 
-        plugins_info, _, success = self.rest.request('pluginManager/api/json?depth=2', 'get', is_endpoint=True)
+        plugins_info, _, success = self.rest.request('pluginManager/api/json?depth=2',
+                                                     'get',
+                                                     is_endpoint=True,
+                                                     tree=JenkinsItemTree.PLUGIN_LIST.value if list_only else '')
         if not success:
             fail_out('Failed to fetch server plugin information')
 
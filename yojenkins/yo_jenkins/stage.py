@@ -1,13 +1,19 @@
 """Stage class definition"""
 
+import io
 import logging
 import os
-import threading
+import re
+import tarfile
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Dict, Tuple, Union
+from typing import Dict, List, Tuple, Union
 
 from yojenkins.utility import utility
 from yojenkins.utility.utility import fail_out, print2
+from yojenkins.yo_jenkins.jenkins_item_tree import JenkinsItemTree
 from yojenkins.yo_jenkins.status import StageStatus
 
 # Getting the logger reference
@@ -32,9 +38,6 @@ class Stage():
 
         self.build_logs_extension = '.log'
 
-        self._stage_log_list_thread_lock = threading.Lock()
-        self.stage_log_dict = {}
-
     def info(self,
              stage_name: str,
              build_url: str = '',
@@ -214,49 +217,68 @@ class Stage():
 
         return step_list, step_name_list
 
-    def _thread_step_info(self, step_index: int, total_steps: int, step: dict) -> None:
-        """TODO
-
-        Details: TODO
+    def _step_logs(self, step_index: int, total_steps: int, step: dict, node_logs: Dict = None) -> List[str]:
+        """Get the log lines of one stage step, each labeled with the step position
 
         Args:
-            TODO
+            step_index  : Index of the step in the stage
+            total_steps : Total number of steps in the stage
+            step        : Step information, as listed by `step_list()`
+            node_logs   : Console log lines by flow node ID, from `Build.logs_by_node()`.
+                          If not given, the step log is requested on its own
 
-        Returns: None
+        Returns:
+            Log lines of the step, starting with the step command
         """
-        logger.debug(f'Thread starting - Step Info - (ID: {threading.get_ident()} - INDEX: {step_index}) ...')
-
-        # Getting step information
-        return_content = self.step.info(step_url=step['url_log'])
-
         logger.debug(f"---> {step_index+1}/{total_steps} - {step['name']}")
-        if 'parameterDescription' in step:
-            parameter = step['parameterDescription']
+        if node_logs is None:
+            return_content = self.step.info(step_url=step['url_log'])
+            # Clean up all HTML tags from return, keep only raw text
+            step_lines = utility.html_clean(return_content.get('text') or '').splitlines()
         else:
-            parameter = 'None'
+            step_lines = node_logs.get(step['id'], [])
 
-        # Check if there is any log text to this stage step
-        if 'text' in return_content or not return_content['length'] == 0:
-            # Clean up all HTML tags from return, keep only raw text
-            log_text = utility.html_clean(return_content['text'])
+        parameter = step.get('parameterDescription', 'None')
+        step_label = f"[STEP: {step_index+1}/{total_steps}]"
+        log_list = [f"{step_label} [STEP] : {step['name']} - PARAMETER: {parameter}"]
 
-            # Also convert to list
-            log_list = [y for y in (x.strip() for x in log_text.splitlines()) if y]
+        # Add extra step info to each line of log
+        log_list.extend(f"{step_label} {line}" for line in (x.strip() for x in step_lines) if line)
 
-            # Add extra step info to each line of log
-            log_list = [f"[STEP: {step_index+1}/{total_steps}] " + s for s in log_list]
+        return log_list
 
-            # Add intro to the logs of this step
-            log_list.insert(0,
-                            f"[STEP: {step_index+1}/{total_steps}] [STEP] : {step['name']} - PARAMETER: {parameter}")
-        else:
-            # If no logs in step, still add step command
-            log_list = [f"[STEP: {step_index+1}/{total_steps}] [STEP] : {step['name']} - PARAMETER: {parameter}"]
+    def _steps_logs(self, stage_step_list: List[dict], max_workers: int = 8, node_logs: Dict = None):
+        """Get the log lines of all stage steps, in step order, as soon as each is received
 
-        with self._stage_log_list_thread_lock:
-            self.stage_log_dict[step_index] = log_list
+        Details: The step logs are requested from a worker pool. At most twice as many steps as
+                 workers are requested ahead of the next step in order, so that one slow step does
+                 not hold many received logs in memory.
 
-        logger.debug(f'Thread stopped - Step Info - (ID: {threading.get_ident()} - INDEX: {step_index}) ...')
+        Args:
+            stage_step_list : Steps of the stage, as listed by `step_list()`
+            max_workers     : Maximum number of step logs requested at once
+            node_logs       : Console log lines by flow node ID, used instead of requesting each step log
+
+        Returns:
+            Generator of log lines of each step, in step order
+        """
+        max_workers = max(max_workers, 1)
+        total_steps = len(stage_step_list)
+        logger.debug(f'Downloading logs for {total_steps} steps in the stage using {max_workers} workers ...')
+
+        steps = iter(enumerate(stage_step_list))
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for step_index, stage_step in steps:
+                pending.append(executor.submit(self._step_logs, step_index, total_steps, stage_step, node_logs))
+                if len(pending) >= max_workers * 2:
+                    break
+            while pending:
+                log_list = pending.popleft().result()
+                step_index, stage_step = next(steps, (None, None))
+                if stage_step:
+                    pending.append(executor.submit(self._step_logs, step_index, total_steps, stage_step, node_logs))
+                yield log_list
 
     def logs(self,
              stage_name: str,
@@ -265,10 +287,15 @@ class Stage():
              job_url: str = '',
              build_number: Union[int, None] = None,
              latest: bool = False,
-             download_dir: bool = False) -> bool:
+             download_dir: bool = False,
+             max_workers: int = 8,
+             from_console: bool = False) -> bool:
         """Prints out the console log for this specified stage
 
-        Details: Ways of specifying the build:
+        Details: The logs of each step are output in step order, as soon as that step and all
+                 steps before it are received.
+
+                 Ways of specifying the build:
             - Build URL only
             - Job URL only
             - Job name with build number or latest flag
@@ -281,12 +308,18 @@ class Stage():
             build_number : Build number for the Job
             latest       : Latest build
             download_dir : When specified, will download logs to file in this direcotry
+            max_workers  : Maximum number of step logs requested at once
+            from_console : If True, take the step logs from one download of the build console log,
+                           instead of requesting each step log
 
         Returns:
             True if success, else False
         """
         if build_url:
             build_url = utility.build_url_complete(build_url)
+        elif from_console:
+            build_url = self.build.info(build_url, job_name, job_url, build_number, latest,
+                                        JenkinsItemTree.BUILD_URL.value)['url']
 
         # Getting all stage step information
         stage_step_list = self.step_list(stage_name=stage_name,
@@ -295,46 +328,155 @@ class Stage():
                                          job_url=job_url,
                                          build_number=build_number,
                                          latest=latest)[0]
+        node_logs = None
+        if from_console:
+            node_logs = self.build.logs_by_node(build_url, node_ids=[step['id'] for step in stage_step_list])
 
-        logger.debug(
-            f'Downloading logs for {len(stage_step_list)} step in the stage using {len(stage_step_list)} threads ...')
-        self.stage_log_dict = {}
-        threads = []
-        for i, stage_step in enumerate(stage_step_list):
-            thread = threading.Thread(target=self._thread_step_info,
-                                      args=(
-                                          i,
-                                          len(stage_step_list),
-                                          stage_step,
-                                      ),
-                                      daemon=False)
-            thread.start()
-            threads.append(thread)
-        for thread in threads:
-            thread.join()
-
-        # Convert dict to index sorted list
-        stage_log_list = []
-        for _, stage_logs in sorted(self.stage_log_dict.items()):
-            stage_log_list.extend(stage_logs)
-
-        # Make the list to continuos step, with newline in between them
-        stage_log_text = os.linesep.join(stage_log_list)
-
+        # Output to file or console, one step at a time
         if download_dir:
-            # Save logs to local file
             filename = f'build-logs_{datetime.now().strftime("%m-%d-%Y_%I-%M-%S")}{self.build_logs_extension}'
             logger.debug(f'Saving console text logs to local file "{filename}" ...')
             try:
                 with open(os.path.join(download_dir, filename), 'w+') as file:
-                    file.write(stage_log_text)
+                    for log_list in self._steps_logs(stage_step_list, max_workers, node_logs):
+                        file.write(''.join(f'{log_line}{os.linesep}' for log_line in log_list))
                 logger.debug('Successfully write build logs to file')
             except (IOError, PermissionError) as error:
                 fail_out(f'Failed to write logs to file. Exception: {error}')
         else:
-            # Output to console
             logger.debug('Printing out console text logs ...')
-            print2(stage_log_text)
-        stage_log_text = None
+            for log_list in self._steps_logs(stage_step_list, max_workers, node_logs):
+                print2(os.linesep.join(log_list))
 
         return True
+
+    def _stage_steps(self, stage_url: str) -> List[dict]:
+        """Get the steps of one stage, from the stage URL listed by `Build.stage_list()`
+
+        Args:
+            stage_url : URL endpoint of the stage
+
+        Returns:
+            List of steps with their log URL
+        """
+        return_content = self.rest.request(stage_url, 'get', is_endpoint=True)[0]
+        if not return_content:
+            fail_out(f'Failed to fetch stage information for: {stage_url}')
+        step_list = return_content.get('stageFlowNodes', [])
+        for step_info in step_list:
+            step_info['url_log'] = step_info['_links']['log']['href']
+        return step_list
+
+    def logs_export(self,
+                    download_dir: str,
+                    build_url: str = '',
+                    job_name: str = '',
+                    job_url: str = '',
+                    build_number: Union[int, None] = None,
+                    latest: bool = False,
+                    archive: bool = False,
+                    max_workers: int = 8,
+                    from_console: bool = False) -> List[str]:
+        """Save the console logs of all stages of a build, one log file per stage
+
+        Details: The stages are listed once for the build. Then the steps of all stages and all
+                 step logs are requested through one shared worker pool. Each stage is written as
+                 soon as all of its step logs are received. With `from_console`, the step logs are
+                 instead split out of one download of the build console log.
+
+                 Ways of specifying the build:
+            - Build URL only
+            - Job URL only
+            - Job name with build number or latest flag
+
+        Args:
+            download_dir : Directory to save the logs in
+            build_url    : Direct URL of the build
+            job_name     : Name of the Job
+            job_url      : URL of the Job
+            build_number : Build number for the Job
+            latest       : Latest build
+            archive      : If True, save all stage logs into one `.tar.gz` file instead
+            max_workers  : Maximum number of stages and step logs requested at once
+            from_console : If True, take the step logs from one download of the build console log,
+                           instead of requesting each step log
+
+        Returns:
+            List of saved file paths
+        """
+        if build_url:
+            build_url = utility.build_url_complete(build_url)
+        elif from_console:
+            build_url = self.build.info(build_url, job_name, job_url, build_number, latest,
+                                        JenkinsItemTree.BUILD_URL.value)['url']
+
+        build_stage_list = self.build.stage_list(build_url, job_name, job_url, build_number, latest)[0]
+        logger.debug(f'Exporting logs of {len(build_stage_list)} stages using {max(max_workers, 1)} workers ...')
+
+        # Log file name of each stage, in stage order
+        stage_filenames = []
+        for stage_index, stage_info in enumerate(build_stage_list):
+            stage_name = re.sub(r'[^\w.-]+', '_', stage_info['name']).strip('_') or 'stage'
+            stage_filenames.append(f'{stage_index + 1:02d}_{stage_name}{self.build_logs_extension}')
+
+        timestamp = datetime.now().strftime("%m-%d-%Y_%I-%M-%S")
+        saved_paths = []
+        archive_file = None
+        try:
+            if archive:
+                archive_path = os.path.join(download_dir, f'build-stage-logs_{timestamp}.tar.gz')
+                archive_file = tarfile.open(archive_path, 'w:gz')
+                saved_paths.append(archive_path)
+
+            with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+                # Console log split by flow node, received while the stage steps are listed
+                node_logs_future = executor.submit(self.build.logs_by_node, build_url) if from_console else None
+
+                # Pending futures, mapped to (stage index, step index), step index is None for the stage itself
+                pending = {
+                    executor.submit(self._stage_steps, stage_info['url']): (stage_index, None)
+                    for stage_index, stage_info in enumerate(build_stage_list)
+                }
+                stage_step_logs = {}
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stage_index, step_index = pending.pop(future)
+                        if step_index is None:
+                            step_list = future.result()
+                            node_logs = node_logs_future.result() if node_logs_future else None
+                            stage_step_logs[stage_index] = [None] * len(step_list)
+                            for index, step_info in enumerate(step_list):
+                                step_future = executor.submit(self._step_logs, index, len(step_list), step_info,
+                                                              node_logs)
+                                pending[step_future] = (stage_index, index)
+                        else:
+                            stage_step_logs[stage_index][step_index] = future.result()
+
+                        # Write the stage once all of its step logs are received
+                        if any(log_list is None for log_list in stage_step_logs[stage_index]):
+                            continue
+                        stage_logs = stage_step_logs.pop(stage_index)
+                        stage_text = ''.join(f'{line}{os.linesep}' for log_list in stage_logs for line in log_list)
+                        filename = stage_filenames[stage_index]
+                        logger.debug(f'Saving logs of stage "{build_stage_list[stage_index]["name"]}" '
+                                     f'({len(stage_logs)} steps) to "{filename}" ...')
+                        if archive_file:
+                            stage_bytes = stage_text.encode('utf-8')
+                            tar_info = tarfile.TarInfo(name=filename)
+                            tar_info.size = len(stage_bytes)
+                            tar_info.mtime = int(time.time())
+                            archive_file.addfile(tar_info, io.BytesIO(stage_bytes))
+                        else:
+                            stage_path = os.path.join(download_dir, filename)
+                            with open(stage_path, 'w', encoding='utf-8') as file:
+                                file.write(stage_text)
+                            saved_paths.append(stage_path)
+        except (IOError, PermissionError, tarfile.TarError) as error:
+            fail_out(f'Failed to write stage logs to file. Exception: {error}')
+        finally:
+            if archive_file:
+                archive_file.close()
+
+        logger.debug(f'Successfully exported logs of {len(build_stage_list)} stages')
+        return sorted(saved_paths)
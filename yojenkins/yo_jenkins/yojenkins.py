@@ -6,6 +6,7 @@ from yojenkins.yo_jenkins.account import Account
 from yojenkins.yo_jenkins.build import Build
 from yojenkins.yo_jenkins.credential import Credential
 from yojenkins.yo_jenkins.folder import Folder
+from yojenkins.yo_jenkins.item_index import ItemIndex
 from yojenkins.yo_jenkins.job import Job
 from yojenkins.yo_jenkins.node import Node
 from yojenkins.yo_jenkins.server import Server
@@ -38,8 +39,22 @@ class YoJenkins:
         self.node = Node(self.rest)
         self.account = Account(self.rest)
         self.credential = Credential(self.rest)
-        self.folder = Folder(self.rest, self.jenkins_sdk)
+        self.folder = Folder(self.rest, self.jenkins_sdk, self.auth)
         self.build = Build(self.rest, self.auth)
         self.job = Job(self.rest, self.folder, self.jenkins_sdk, self.auth, self.build)
         self.step = Step(self.rest)
         self.stage = Stage(self.rest, self.build, self.step)
+
+    def item_index_enable(self, ttl: int) -> None:
+        """Use the local item index of the current profile and server for folder items
+
+        Args:
+            ttl : Number of seconds an indexed folder is valid before it is requested again
+
+        Returns:
+            None
+        """
+        item_index = ItemIndex(profile=self.auth.jenkins_profile.get('profile', ''),
+                               server_url=self.rest.get_server_url(),
+                               ttl=ttl)
+        self.folder.item_index_enable(item_index)